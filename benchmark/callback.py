@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    benchmark/callback.py: Sorting with a comparison callback, one callback per comparison
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+typedef int16_t {{ SUFFIX }} (*compare_func_type)(int16_t a, int16_t b);
+
+{{ PREFIX }} void {{ SUFFIX }} sort_by_callback(
+    int16_t *a,
+    int16_t n,
+    compare_func_type compare
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} void {{ SUFFIX }} sort_by_callback(
+    int16_t *a,
+    int16_t n,
+    compare_func_type compare
+    )
+{
+    int16_t i, j, tmp;
+    for (i = 1; i < n; ++i)
+    {
+        tmp = a[i];
+        for (j = i; j > 0 && compare(a[j - 1], tmp) > 0; --j)
+        {
+            a[j] = a[j - 1];
+        }
+        a[j] = tmp;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from typing import List
+
+from tests.lib.benchmark import benchmark
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# BENCHMARK(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def init(ctypes, dll_handle, conv):
+
+    if conv == "cdll":
+        func_type = ctypes.CFUNCTYPE
+    elif conv == "windll":
+        func_type = ctypes.WINFUNCTYPE
+    else:
+        raise ValueError("unknown calling convention", conv)
+
+    compare_func_type = func_type(ctypes.c_int16, ctypes.c_int16, ctypes.c_int16)
+
+    sort_by_callback_dll = dll_handle.sort_by_callback
+    sort_by_callback_dll.argtypes = (ctypes.POINTER(ctypes.c_int16), ctypes.c_int16, compare_func_type)
+    sort_by_callback_dll.memsync = [  # Regular ctypes on Windows should ignore this statement
+        dict(
+            pointer = [0],  # "path" to argument containing the pointer
+            length = [1],  # "path" to argument containing the length
+            type = ctypes.c_int16,  # type of argument (optional, default char/byte): sizeof(type) * length == bytes
+        )
+    ]
+
+    @compare_func_type
+    def compare(a, b):
+        return (a > b) - (a < b)
+
+    def sort_by_callback(values: List[int]):
+        """
+        User-facing wrapper around DLL function
+        """
+
+        ct_values = ((ctypes.c_int16) * len(values))(*values)
+        ct_ptr = ctypes.cast(ctypes.pointer(ct_values), ctypes.POINTER(ctypes.c_int16))
+        sort_by_callback_dll(ct_ptr, len(values), compare)
+        values[:] = ct_values[:]
+
+    return sort_by_callback
+
+
+@benchmark(fn = __file__, initializer = init)
+def callback(ctypes, func):
+    """
+    The "callback" benchmark sorts an array of 20 ``c_int16`` numbers in reverse
+    order via an insertion sort in the DLL. Every comparison is a call of a callback
+    function, 190 in total, which takes two ``c_int16`` parameters and returns a
+    ``c_int16``. The array is synchronized via a ``memsync`` directive.
+    """
+
+    data = list(range(20, 0, -1))
+
+    func(data)
+
+    assert data == list(range(1, 21))
+
+
+@benchmark(fn = __file__, initializer = init, compile_plans = False)
+def callback_generic(ctypes, func):
+    """
+    The "callback_generic" benchmark is identical to the "callback" benchmark
+    but with ``compile_plans`` set to ``False``, i.e. arguments and return values
+    of both the routine and the callback function are handled by *zugbruecke*'s
+    generic code paths instead of compiled marshalling plans.
+    """
+
+    data = list(range(20, 0, -1))
+
+    func(data)
+
+    assert data == list(range(1, 21))
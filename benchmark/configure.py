@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    benchmark/configure.py: Configuring many routines sharing large structs
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int {{ SUFFIX }} add_int(
+    int a,
+    int b
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int {{ SUFFIX }} add_int(
+    int a,
+    int b
+    )
+{
+    return a + b;
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from tests.lib.benchmark import benchmark
+from tests.lib.const import PLATFORM
+
+if PLATFORM == "unix":
+    from zugbruecke.core.cache import Cache
+    from zugbruecke.core.definitions import Definition
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# BENCHMARK(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+ROUTINES = 500
+
+
+def init(ctypes, dll_handle, conv):
+
+    class Point(ctypes.Structure):
+        _fields_ = [(f"c{index:d}", ctypes.c_double) for index in range(3)]
+
+    class Segment(ctypes.Structure):
+        _fields_ = [
+            ("start", Point),
+            ("stop", Point),
+            ("flags", ctypes.c_uint32 * 4),
+        ]
+
+    class Mesh(ctypes.Structure):
+        _fields_ = [(f"segment{index:d}", Segment) for index in range(32)] + [
+            ("points", ctypes.POINTER(Point)),
+            ("length", ctypes.c_int),
+        ]
+
+    return [
+        ([ctypes.POINTER(Mesh), ctypes.c_int, ctypes.POINTER(Segment)], ctypes.c_int),
+        ([ctypes.POINTER(Mesh), ctypes.POINTER(Mesh)], ctypes.c_void_p),
+        ([Segment, Point, ctypes.c_double], Point),
+    ]
+
+
+@benchmark(fn = __file__, initializer = init)
+def configure(ctypes, func):
+    """
+    The "configure" benchmark parses argument and return types of 500 routines,
+    like *zugbruecke* does when configuring them on their first call. The routines
+    share a few large and nested structs, as large APIs usually do. Runtime is
+    measured for a fresh cache of types and definitions, i.e. a fresh session.
+    Only relevant on the Unix side.
+    """
+
+    if PLATFORM != "unix":
+        return None
+
+    cache = Cache()
+
+    for index in range(ROUTINES):
+        argtypes, restype = func[index % len(func)]
+        _ = Definition.from_data_types(cache = cache, data_types = argtypes)
+        _ = Definition.from_data_type(cache = cache, data_type = restype)
@@ -306,3 +306,26 @@ def maximal(ctypes, func):
         [-249, -27, -282],
         [-510, -312, -179],
     ] == result
+
+
+@benchmark(fn = __file__, initializer = init, compile_plans = False)
+def maximal_generic(ctypes, func):
+    """
+    The "maximal_generic" benchmark is identical to the "maximal" benchmark
+    but with ``compile_plans`` set to ``False``, i.e. arguments, return values and memory
+    are handled by *zugbruecke*'s generic code paths instead of compiled marshalling plans.
+    """
+
+    result = func(
+        [
+            [253, 252, 254],
+            [252, 254, 239],
+            [252, 246, 166],
+        ]
+    )
+
+    assert [
+        [-508, -247, -525],
+        [-249, -27, -282],
+        [-510, -312, -179],
+    ] == result
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    benchmark/memsync_large.py: Large buffer with sparse modifications, memsync with and without delta
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} void {{ SUFFIX }} increment_sparse(
+    uint8_t *data,
+    int32_t n,
+    int32_t step
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} increment_sparse_delta(
+    uint8_t *data,
+    int32_t n,
+    int32_t step
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} void {{ SUFFIX }} increment_sparse(
+    uint8_t *data,
+    int32_t n,
+    int32_t step
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i += step)
+    {
+        data[i]++;
+    }
+}
+
+{{ PREFIX }} void {{ SUFFIX }} increment_sparse_delta(
+    uint8_t *data,
+    int32_t n,
+    int32_t step
+    )
+{
+    increment_sparse(data, n, step);
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from tests.lib.benchmark import benchmark
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+LENGTH = 10 * 2 ** 20  # 10 MB
+STEP = 2 ** 18  # 40 modified bytes
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# BENCHMARK(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _init(ctypes, dll_handle, name, delta):
+
+    increment_sparse = getattr(dll_handle, name)
+    increment_sparse.argtypes = (ctypes.POINTER(ctypes.c_uint8), ctypes.c_int32, ctypes.c_int32)
+    increment_sparse.memsync = [  # Regular ctypes on Windows should ignore this statement
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_uint8,
+            delta = delta,
+        )
+    ]
+
+    data = (ctypes.c_uint8 * LENGTH)()
+
+    def increment():
+        increment_sparse(data, LENGTH, STEP)
+        return data
+
+    return increment
+
+
+def init(ctypes, dll_handle, conv):
+
+    return _init(ctypes, dll_handle, "increment_sparse", False)
+
+
+def init_delta(ctypes, dll_handle, conv):
+
+    return _init(ctypes, dll_handle, "increment_sparse_delta", True)
+
+
+@benchmark(fn = __file__, initializer = init)
+def memsync_large(ctypes, func):
+    """
+    The "memsync_large" benchmark synchronizes a large block of memory,
+    a 10 MB array of bytes, via a ``memsync`` directive.
+    The DLL function increments every 262144th byte in-place, i.e. it modifies 40 bytes.
+    The entire block is copied to the DLL and back.
+    """
+
+    data = func()
+    assert data[0] == data[STEP]
+
+
+@benchmark(fn = __file__, initializer = init_delta)
+def memsync_large_delta(ctypes, func):
+    """
+    The "memsync_large_delta" benchmark is identical to the "memsync_large" benchmark
+    but with ``delta`` set to ``True`` in the ``memsync`` directive,
+    i.e. only the changed 4 kB chunks are copied back from the DLL.
+    """
+
+    data = func()
+    assert data[0] == data[STEP]
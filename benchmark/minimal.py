@@ -51,6 +51,8 @@ SOURCE = """
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from logging import DEBUG, WARNING
+
 from tests.lib.benchmark import benchmark
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -78,3 +80,48 @@ def minimal(ctypes, func):
     x, y = 3, 4
     z = func(x, y)
     assert z == 7
+
+
+@benchmark(fn = __file__, initializer = init, compile_plans = False)
+def minimal_generic(ctypes, func):
+    """
+    The "minimal_generic" benchmark is identical to the "minimal" benchmark
+    but with ``compile_plans`` set to ``False``, i.e. arguments and return values
+    are handled by *zugbruecke*'s generic code paths instead of compiled marshalling plans.
+    """
+
+    x, y = 3, 4
+    z = func(x, y)
+    assert z == 7
+
+
+@benchmark(fn = __file__, initializer = init, log_level = WARNING)
+def minimal_log_filtered(ctypes, func):
+    """
+    The "minimal_log_filtered" benchmark is identical to the "minimal" benchmark
+    but with ``log_level`` set to ``WARNING``. Logging is enabled, though none of
+    the per-call messages (``INFO`` and ``DEBUG``) pass the filter. Compared to the
+    "minimal" benchmark, where logging is disabled, it shows what the level checks
+    on the hot path of a call cost.
+    """
+
+    x, y = 3, 4
+    z = func(x, y)
+    assert z == 7
+
+
+@benchmark(fn = __file__, initializer = init, log_level = DEBUG, log_output = False)
+def minimal_log_silent(ctypes, func):
+    """
+    The "minimal_log_silent" benchmark is identical to the "minimal" benchmark
+    but with ``log_level`` set to ``DEBUG`` while ``stdout`` and ``stderr`` are
+    set to ``False`` (and ``log_write`` is left at its default, ``False``).
+    All per-call messages are generated and shipped, though none of them is
+    displayed or written. Compared to the "minimal_log_filtered" benchmark,
+    it shows what generating and discarding messages costs, including the
+    configuration lookups for every message.
+    """
+
+    x, y = 3, 4
+    z = func(x, y)
+    assert z == 7
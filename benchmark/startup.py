@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    benchmark/startup.py: Session startup, loading a DLL and a single call
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int {{ SUFFIX }} add_int(
+    int a,
+    int b
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int {{ SUFFIX }} add_int(
+    int a,
+    int b
+    )
+{
+    return a + b;
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from tests.lib.benchmark import benchmark
+from tests.lib.const import PLATFORM
+
+if PLATFORM == "unix":
+    from zugbruecke import CtypesSession
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# BENCHMARK(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def init(ctypes, dll_handle, conv):
+
+    return conv, dll_handle._name
+
+
+@benchmark(fn = __file__, initializer = init)
+def startup(ctypes, func):
+    """
+    The "startup" benchmark starts a new session, loads a DLL,
+    calls a simple routine once and terminates the session.
+    On Wine, i.e. without *zugbruecke*, it only loads the DLL and calls the routine.
+    The startup report of the fastest session, see ``zb_startup_report``,
+    is kept with the results for tracking where startup time goes.
+    """
+
+    conv, path = func
+
+    if PLATFORM != "unix":
+        add_int = getattr(ctypes, conv).LoadLibrary(path).add_int
+        add_int.argtypes = (ctypes.c_int, ctypes.c_int)
+        add_int.restype = ctypes.c_int
+        assert add_int(3, 4) == 7
+        return None
+
+    session = CtypesSession(
+        arch = ctypes.zb_get_parameter("arch"),
+        pythonversion = ctypes.zb_get_parameter("pythonversion"),
+        transport = ctypes.zb_get_parameter("transport"),
+    )
+
+    try:
+        add_int = getattr(session, conv).LoadLibrary(path).add_int
+        add_int.argtypes = (session.c_int, session.c_int)
+        add_int.restype = session.c_int
+        assert add_int(3, 4) == 7
+        return session.zb_startup_report()
+    finally:
+        session.zb_terminate()
@@ -39,6 +39,7 @@ __version__ = "0.2.1"
 import sys as _sys
 
 if not _sys.platform.startswith("win"):
+    from .core.pool import SessionPool
     from .core.session import CtypesSession
 del _sys
 
@@ -32,17 +32,55 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from .core.startup import StartupTimer
+
+_startup = StartupTimer()  # first, so it covers the remaining imports
+_startup.begin("startup")
+_startup.begin("import")
+
 import argparse
+from threading import Event
+from typing import Any, Dict, Optional
 
 from .core.config import Config
+from .core.rpc import RpcServer
 from .core.session_server import SessionServer
 
+_startup.end("import")
+
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+def _standby(port: int) -> Optional[Dict[str, Any]]:
+    """
+    Pre-booted server, waits for a daemon to hand it to a session
+
+    Returns:
+        Parameters of session or ``None`` if told to terminate
+    """
+
+    parameter = {}
+    done = Event()
+
+    def attach(session_parameter: Dict[str, Any]) -> bool:
+        parameter.update(session_parameter)
+        done.set()
+        return True
+
+    server = RpcServer(("localhost", port), "zugbruecke_wine")
+    server.register_function(attach, "attach")
+    server.register_function(done.set, "cancel")
+    server.server_forever_in_thread(daemon=True)
+
+    done.wait()
+    server.terminate()
+
+    return parameter if len(parameter) > 0 else None
+
+
 def run():
 
     # Parse arguments comming from unix side
@@ -52,24 +90,40 @@ def run():
     parser.add_argument("--port_socket_wine", type=int, nargs=1)
     parser.add_argument("--log_level", type=int, nargs=1)
     parser.add_argument("--log_write", type=int, nargs=1)
+    parser.add_argument("--log_rotate", type=int, nargs=1)
     parser.add_argument("--timeout_start", type=float, nargs=1)
+    parser.add_argument("--compile_plans", type=int, nargs=1)
+    parser.add_argument("--standby", action="store_true")
     args = parser.parse_args()
 
+    if args.standby:
+        # Wait for session, which passes all other parameters
+        with _startup.phase("standby"):
+            session_parameter = _standby(args.port_socket_wine[0])
+        if session_parameter is None:
+            return
+    else:
+        session_parameter = {
+            "id": args.id[0],
+            "log_write": bool(args.log_write[0]),
+            "log_rotate": args.log_rotate[0],
+            "log_level": args.log_level[0],
+            "port_socket_wine": args.port_socket_wine[0],
+            "port_socket_unix": args.port_socket_unix[0],
+            "timeout_start": args.timeout_start[0],
+            "compile_plans": bool(args.compile_plans[0]),
+        }
+
     # Generate parameter dict
     parameter = {
-        "id": args.id[0],
         "platform": "WINE",
         "stdout": False,
         "stderr": False,
-        "log_write": bool(args.log_write[0]),
-        "log_level": args.log_level[0],
-        "port_socket_wine": args.port_socket_wine[0],
-        "port_socket_unix": args.port_socket_unix[0],
-        "timeout_start": args.timeout_start[0],
+        **session_parameter,
     }
 
     # Fire up wine server session with parsed parameters
-    _ = SessionServer(Config(**parameter))
+    _ = SessionServer(Config(**parameter), startup=_startup)
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -44,6 +44,10 @@ class CallbackClientABC(ABC):
     pass
 
 
+class CallbackRegistryABC(ABC):
+    pass
+
+
 class CallbackServerABC(ABC):
     pass
 
@@ -52,10 +56,18 @@ class ConfigABC(ABC):
     pass
 
 
+class ConfigSnapshotABC(ABC):
+    __slots__ = ()  # subclass must not get a __dict__
+
+
 class CtypesSessionABC(ABC):
     pass
 
 
+class DaemonABC(ABC):
+    pass
+
+
 class DataABC(ABC):
     pass
 
@@ -84,6 +96,14 @@ class LogABC(ABC):
     pass
 
 
+class LogShipperABC(ABC):
+    pass
+
+
+class LogWriterABC(ABC):
+    pass
+
+
 class MempkgABC(ABC):
     pass
 
@@ -92,6 +112,10 @@ class MessageABC(ABC):
     pass
 
 
+class PlanABC(ABC):
+    pass
+
+
 class RoutineClientABC(ABC):
     pass
 
@@ -112,5 +136,29 @@ class SessionClientABC(ABC):
     pass
 
 
+class SessionPoolABC(ABC):
+    pass
+
+
 class SessionServerABC(ABC):
     pass
+
+
+class SharedArenaABC(ABC):
+    pass
+
+
+class ShmConnectionABC(ABC):
+    pass
+
+
+class ShmTransportABC(ABC):
+    pass
+
+
+class SignatureCacheABC(ABC):
+    pass
+
+
+class StartupTimerABC(ABC):
+    pass
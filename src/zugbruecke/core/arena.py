@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/arena.py: Memory shared between Unix and Wine side for zero-copy memsync
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes
+import mmap
+import os
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from .abc import SharedArenaABC
+from .typeguard import typechecked
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class _Segment:
+    """
+    One memory-mapped file
+    """
+
+    def __init__(self, path: str, size: Optional[int] = None):
+
+        if size is not None:
+            with open(path, "w+b") as f:
+                f.truncate(size)
+                self.mmap = mmap.mmap(f.fileno(), size)
+        else:
+            with open(path, "r+b") as f:
+                self.mmap = mmap.mmap(f.fileno(), 0)
+
+        self.size = len(self.mmap)
+        self._view = (ctypes.c_ubyte * self.size).from_buffer(self.mmap)
+        self.address = ctypes.addressof(self._view)
+
+    def close(self):
+
+        self._view = None
+        try:
+            self.mmap.close()
+        except BufferError:
+            pass  # still exported by a buffer somewhere, memory is freed once it is gone
+
+
+@typechecked
+class SharedArena(SharedArenaABC):
+    """
+    Memory segments shared between Unix and Wine side, one registry per session and side
+
+    Every segment is a memory-mapped file which is mapped exactly once on either side.
+    The Unix side creates segments and announces them to the Wine side. If memsync
+    encounters a pointer into a segment, it ships the segment's name and an offset
+    instead of a copy of the memory. The DLL operates on the shared pages directly.
+    """
+
+    def __init__(self):
+
+        self._segments = {}  # name: segment
+        self._released = []  # names of segments no longer referenced on the Unix side
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+
+        return f'<SharedArena segments={len(self._segments):d}>'
+
+    def __len__(self) -> int:
+
+        return len(self._segments)
+
+    def create(self, fld: str, name: str, size: int) -> mmap.mmap:
+        """
+        Unix side. Creates and maps a new segment. The file can be removed once the Wine side has attached to it.
+
+        Args:
+            - fld: folder for memory-mapped file
+            - name: name of segment and file
+            - size: size in bytes
+        Returns:
+            Memory map
+        """
+
+        segment = _Segment(os.path.join(fld, name), size)
+
+        with self._lock:
+            self._segments[name] = segment
+
+        return segment.mmap
+
+    def attach(self, fld: str, name: str):
+        """
+        Wine side. Maps an existing segment.
+
+        Args:
+            - fld: folder for memory-mapped file
+            - name: name of segment and file
+        """
+
+        segment = _Segment(os.path.join(fld, name))
+
+        with self._lock:
+            self._segments[name] = segment
+
+    def detach(self, names: List[str]):
+        """
+        Both sides. Unmaps segments.
+
+        Args:
+            - names: names of segments
+        """
+
+        with self._lock:
+            segments = [self._segments.pop(name, None) for name in names]
+
+        for segment in segments:
+            if segment is not None:
+                segment.close()
+
+    def release(self, name: str):
+        """
+        Unix side. Unmaps a segment and marks it for removal on the Wine side, called when its buffer is garbage collected.
+        Can not call into the Wine side directly and does not take the lock - garbage collection may happen anywhere.
+
+        Args:
+            - name: name of segment
+        """
+
+        segment = self._segments.pop(name, None)  # atomic
+        if segment is not None:
+            segment.close()
+
+        self._released.append(name)  # atomic
+
+    def pop_released(self) -> List[str]:
+        """
+        Unix side. Names of segments marked for removal since the last call, still mapped on the Wine side.
+        """
+
+        names = []
+        while len(self._released) > 0:
+            names.append(self._released.pop())
+
+        return names
+
+    def locate(self, address: int, length: int) -> Optional[Tuple[str, int]]:
+        """
+        Both sides. Finds the segment containing a block of memory.
+
+        Args:
+            - address: start of block
+            - length: length of block in bytes
+        Returns:
+            Name of segment and offset or ``None`` if block is not (entirely) within one segment
+        """
+
+        if len(self._segments) == 0:
+            return None
+
+        for name, segment in list(self._segments.items()):
+            offset = address - segment.address
+            if 0 <= offset and offset + length <= segment.size:
+                return name, offset
+
+        return None
+
+    def resolve(self, name: str, offset: int) -> int:
+        """
+        Both sides. Translates the location of a block of memory into a local address.
+
+        Args:
+            - name: name of segment
+            - offset: offset within segment
+        Returns:
+            Address
+        """
+
+        return self._segments[name].address + offset
+
+    def close(self):
+        """
+        Both sides. Unmaps all segments.
+        """
+
+        self.detach(list(self._segments.keys()))
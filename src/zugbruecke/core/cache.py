@@ -30,6 +30,7 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from collections import OrderedDict
 from ctypes import _FUNCFLAG_CDECL
 from typing import Dict
 
@@ -44,7 +45,7 @@ from .typeguard import typechecked
 @typechecked
 class Cache(CacheABC):
     """
-    Holding struct types, function types and function handles
+    Holding struct types, function types, function handles and definitions
     """
 
     def __init__(self):
@@ -53,6 +54,7 @@ class Cache(CacheABC):
         self._stdcall = {}
         self._struct = {}
         self._handle = {}
+        self._definition = OrderedDict()
 
     @property
     def cdecl(self) -> Dict:
@@ -74,6 +76,14 @@ class Cache(CacheABC):
 
         return self._handle
 
+    @property
+    def definition(self) -> Dict:
+        """
+        Definitions by ctypes data type and field name, least recently used first, shared - must not be changed
+        """
+
+        return self._definition
+
     def by_conv(self, flag: int) -> Dict:
         """
         By calling convention flag
@@ -31,8 +31,11 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from logging import INFO
+import pickle
+import struct
 import traceback
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from .abc import (
     CallbackClientABC,
@@ -40,8 +43,10 @@ from .abc import (
     LogABC,
     RpcServerABC,
 )
+from .const import CALLBACK_FAST, CALLBACK_PICKLED
 from .definitions import Definition, DefinitionMemsync
 from .mempkg import Mempkg
+from .plan import Plan
 from .typeguard import typechecked
 
 
@@ -54,12 +59,16 @@ from .typeguard import typechecked
 class CallbackClient(CallbackClientABC):
     """
     Representing a callback function
+
+    Called with the payload shipped by its callback server on the Wine side, either
+    arguments encoded for the fast path or pickled packed arguments and memory.
+    Answers in kind, falling back to a pickled return package if the call fails.
     """
 
     def __init__(
         self,
         name: str,
-        handler: Callable,
+        handler: Callable[[], Optional[Callable]],
         rpc_server: RpcServerABC,
         data: DataABC,
         log: LogABC,
@@ -69,65 +78,122 @@ class CallbackClient(CallbackClientABC):
     ):
 
         self._name = name
-        self._handler = handler
+        self._handler = handler  # returns the callable or None once it has been garbage collected
         self._data = data
         self._log = log
 
-        self._argtypes = argtypes
-        self._restype = restype
-        self._memsyncs = memsyncs
+        self._plan = Plan(data, argtypes, restype, memsyncs, None)
+        self._plan_generic = Plan(data, argtypes, restype, memsyncs, None, compile = False)
 
         rpc_server.register_function(self, public_name=name)
 
-    def __call__(self, packed_args: List[Any], packed_mempkgs: List[Dict]) -> Dict:
+    def __call__(self, payload: bytes) -> bytes:
+
+        verbose = self._log.is_enabled_for(INFO)  # skip building log messages if they are discarded anyway
+
+        if verbose:
+            self._log.info(f'[callback-client] Trying to call callback routine "{self._name:s}" ...')
+
+        if payload[:1] == CALLBACK_FAST:
+            return self._call_fast(payload[1:], verbose)
+
+        return self._call(payload[1:], verbose)
+
+    def _call(self, payload: bytes, verbose: bool) -> bytes:
 
-        self._log.info(f'[callback-client] Trying to call callback routine "{self._name:s}" ...')
+        plan = self._plan if self._data.compile_plans else self._plan_generic
 
         try:
-            args = self._data.unpack_args(packed_args, self._argtypes)
+            packed_args, packed_mempkgs = pickle.loads(payload)
+            args = plan.unpack_args(packed_args)
             retval = None
-            mempkgs = [Mempkg.from_packed(packed_mempkg) for packed_mempkg in packed_mempkgs]
-            DefinitionMemsync.unpkg_memories(
-                args = args,
-                retval = retval,
-                mempkgs = mempkgs,
-                memsyncs = self._memsyncs,
-                is_server = True,
-            )
+            if plan.memsyncs is None:
+                mempkgs = []
+            else:
+                mempkgs = [Mempkg.from_packed(packed_mempkg, arena = self._data.arena) for packed_mempkg in packed_mempkgs]
+                DefinitionMemsync.unpkg_memories(
+                    args = args,
+                    retval = retval,
+                    mempkgs = mempkgs,
+                    memsyncs = plan.memsyncs,
+                    is_server = True,
+                )
         except Exception as e:
             self._log.error("[callback-client] ... call preparation failed!")
             self._log.error(traceback.format_exc())
             raise e
 
         try:
-            retval = self._handler(*args)
+            retval = self._get_handler()(*args)
         except Exception as e:
-            self._log.error("[callback-client] ... call failed!")
-            self._log.error(traceback.format_exc())
-            return {
-                "args": packed_args,  # unchanged
-                "retval": retval,  # unchanged, still None
-                "mempkgs": packed_mempkgs,  # unchanged
-                "success": False,
-                "exception": e,
-            }
+            return self._fail(packed_args, packed_mempkgs, e)
 
         try:
-            DefinitionMemsync.update_memories(
-                args = args,
-                retval = retval,
-                mempkgs = mempkgs,
-                memsyncs = self._memsyncs,
-            )
-            self._log.info("[callback-client] ... done.")
-            return {
-                "args": self._data.pack_args(args, self._argtypes),
-                "retval": self._data.pack_retval(retval, self._restype),
+            if plan.memsyncs is not None:
+                DefinitionMemsync.update_memories(
+                    args = args,
+                    retval = retval,
+                    mempkgs = mempkgs,
+                    memsyncs = plan.memsyncs,
+                    arena = self._data.arena,
+                )
+            if verbose:
+                self._log.info("[callback-client] ... done.")
+            return CALLBACK_PICKLED + pickle.dumps({
+                "args": plan.pack_args(args),
+                "retval": plan.pack_retval(retval),
                 "mempkgs": [mempkg.as_packed() for mempkg in mempkgs],
                 "success": True,
                 "exception": None,
-            }
+            })
         except Exception as e:
             self._log.error("[callback-client] ... call post-processing failed!")
             self._log.error(traceback.format_exc())
             raise e
+
+    def _call_fast(self, packed_args: bytes, verbose: bool) -> bytes:
+        """
+        Fundamental data types by value only
+        """
+
+        args = self._plan.unpack_fast_args(packed_args)
+
+        try:
+            retval = self._get_handler()(*args)
+        except Exception as e:
+            return self._fail(args, [], e)  # plain values, packed as they are
+
+        if verbose:
+            self._log.info("[callback-client] ... done (fast path).")
+
+        try:
+            return CALLBACK_FAST + self._plan.pack_fast_retval(retval)
+        except (struct.error, OverflowError):  # let ctypes on the Wine side handle it
+            return CALLBACK_PICKLED + pickle.dumps({
+                "args": args,
+                "retval": self._plan.pack_retval(retval),
+                "mempkgs": [],
+                "success": True,
+                "exception": None,
+            })
+
+    def _fail(self, packed_args: List[Any], packed_mempkgs: List[Dict], exception: Exception) -> bytes:
+
+        self._log.error("[callback-client] ... call failed!")
+        self._log.error(traceback.format_exc())
+
+        return CALLBACK_PICKLED + pickle.dumps({
+            "args": packed_args,  # unchanged
+            "retval": None,
+            "mempkgs": packed_mempkgs,  # unchanged
+            "success": False,
+            "exception": exception,
+        })
+
+    def _get_handler(self) -> Callable:
+
+        handler = self._handler()  # referenced weakly
+        if handler is None:
+            raise ReferenceError(f'callback routine "{self._name:s}" has been garbage collected')
+
+        return handler
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/callback_registry.py: Callback functions handed to the Wine side
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from collections import OrderedDict
+import ctypes
+from functools import partial
+from itertools import count
+from threading import Lock
+from types import MethodType
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import weakref
+
+from .abc import CallbackRegistryABC, RpcServerABC
+from .typeguard import typechecked
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class CallbackRegistry(CallbackRegistryABC):
+    """
+    Unix side. Callback functions handed to the Wine side, one registry per session
+
+    Every callable gets a unique name once, which is shipped instead of the callable.
+    Callables are referenced weakly. Once one is garbage collected, its name is released
+    and unregistered on both sides. Callables which can not be referenced weakly, e.g.
+    objects of classes with ``__slots__`` or function pointers read from arrays, are anonymous:
+    They are kept in a cache of limited size, evicting the least recently used ones.
+
+    Releasing is deferred until the next callback is added - garbage collection may happen anywhere.
+
+    Args:
+        rpc_server : Server for calls from the Wine side, callbacks are registered here
+        maxsize : Maximum number of anonymous callables
+        release : Called with names of released callbacks, drops them on the Wine side
+    """
+
+    def __init__(
+        self,
+        rpc_server: Optional[RpcServerABC],
+        maxsize: int = 256,
+        release: Optional[Callable[[List[str]], None]] = None,
+    ):
+
+        self._rpc_server = rpc_server
+        self._maxsize = maxsize
+        self._release = release
+
+        self._weak = {}  # key: (reference, name)
+        self._anonymous = OrderedDict()  # key: (callable, name), least recently used first
+        self._released = []  # names of callbacks no longer referenced, not yet unregistered
+
+        self._names = count()
+        self._registered = 0
+        self._unregistered = 0
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+
+        return f'<CallbackRegistry weak={len(self._weak):d} anonymous={len(self._anonymous):d}>'
+
+    def __len__(self) -> int:
+
+        return len(self._weak) + len(self._anonymous)
+
+    def get(self, func: Callable) -> Optional[str]:
+        """
+        Args:
+            - func: callable
+        Returns:
+            Name of callback or ``None`` if it has not been added (or has been released)
+        """
+
+        with self._lock:
+            return self._lookup(func)
+
+    def add(self, func: Callable, factory: Callable) -> str:
+        """
+        Adds a callable unless it has already been added. Releases callbacks which are no longer referenced.
+
+        Args:
+            - func: callable
+            - factory: called with ``name`` and ``handler`` (which returns the callable or ``None``), registers the callback
+        Returns:
+            Name of callback
+        """
+
+        self.flush()
+
+        with self._lock:
+
+            name = self._lookup(func)
+            if name is not None:
+                return name
+
+            name = f"func_{next(self._names):x}"
+            key = self._get_key(func)
+
+            reference = self._get_reference(func, partial(self._collected, name))
+            if reference is not None:
+                factory(name = name, handler = reference)
+                self._weak[key] = (reference, name)
+            else:
+                factory(name = name, handler = lambda: func)
+                self._anonymous[key] = (func, name)
+                if len(self._anonymous) > self._maxsize:
+                    _, (_, evicted) = self._anonymous.popitem(last = False)
+                    self._released.append(evicted)
+
+            self._registered += 1
+
+        return name
+
+    def flush(self):
+        """
+        Unregisters callbacks which are no longer referenced on both sides
+        """
+
+        if len(self._released) == 0:
+            return
+
+        with self._lock:
+            names = []
+            while len(self._released) > 0:
+                names.append(self._released.pop())
+            released = set(names)
+            for key in [key for key, (_, name) in self._weak.items() if name in released]:
+                del self._weak[key]
+            self._unregistered += len(names)
+
+        for name in names:
+            self._rpc_server.unregister_function(name)
+
+        if self._release is not None:
+            self._release(names)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Size of registry: Number of callbacks referenced weakly and anonymous callbacks,
+        callbacks waiting to be released, total numbers of registered and unregistered callbacks
+        """
+
+        return {
+            "weak": len(self._weak),
+            "anonymous": len(self._anonymous),
+            "pending": len(self._released),
+            "registered": self._registered,
+            "unregistered": self._unregistered,
+        }
+
+    def _collected(self, name: str, reference: Any):
+        """
+        Called by garbage collection. Can not call into the Wine side directly.
+        """
+
+        self._released.append(name)  # atomic
+
+    def _lookup(self, func: Callable) -> Optional[str]:
+
+        key = self._get_key(func)
+
+        entry = self._weak.get(key)
+        if entry is not None:
+            reference, name = entry
+            if self._is_alive(reference, func):
+                return name
+            return None  # id has been reused, the callable it belonged to is gone
+
+        entry = self._anonymous.get(key)
+        if entry is not None:
+            self._anonymous.move_to_end(key)
+            return entry[1]
+
+        return None
+
+    @staticmethod
+    def _get_key(func: Callable) -> Hashable:
+
+        if isinstance(func, MethodType):  # new object on every attribute access
+            return id(func.__self__), id(func.__func__)
+
+        if getattr(func, "_b_base_", None) is not None:  # ctypes function pointer within an array or struct
+            return type(func), ctypes.cast(func, ctypes.c_void_p).value
+
+        return id(func)
+
+    @staticmethod
+    def _get_reference(func: Callable, callback: Callable) -> Optional[Callable]:
+
+        if isinstance(func, MethodType):
+            return weakref.WeakMethod(func, callback)
+
+        if getattr(func, "_b_base_", None) is not None:
+            return None  # new object on every item access, dies right away
+
+        try:
+            return weakref.ref(func, callback)
+        except TypeError:
+            return None  # can not be referenced weakly
+
+    @staticmethod
+    def _is_alive(reference: Callable, func: Callable) -> bool:
+
+        target = reference()
+
+        if target is None:
+            return False
+
+        if isinstance(func, MethodType):
+            return target == func  # bound methods compare their instance by identity
+
+        return target is func
@@ -31,18 +31,23 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from pprint import pformat as pf
+from logging import DEBUG, INFO
+import pickle
 import traceback
-from typing import Any, List
+from typing import Any, List, Optional
 
 from .abc import (
     CallbackServerABC,
     DataABC,
     LogABC,
+    PlanABC,
     RpcClientABC,
+    RpcServerABC,
 )
+from .const import CALLBACK_FAST, CALLBACK_PICKLED
 from .definitions import Definition, DefinitionMemsync
 from .mempkg import Mempkg
+from .plan import Plan
 from .typeguard import typechecked
 
 
@@ -55,12 +60,20 @@ from .typeguard import typechecked
 class CallbackServer(CallbackServerABC):
     """
     Representing a callback function
+
+    Calls are pushed back to the Unix side on the connection of the call of the routine
+    which invoked the callback function, see ``RpcServer.call_back``. Callback functions
+    invoked from other threads, e.g. threads started by the DLL, go through the RPC client.
+    Like routines, callback functions have compiled marshalling plans. If all arguments and
+    the return value are fundamental data types passed by value, calls are encoded in
+    fixed-layout byte strings.
     """
 
     def __init__(
         self,
         name: str,
         rpc_client: RpcClientABC,
+        rpc_server: Optional[RpcServerABC],
         data: DataABC,
         log: LogABC,
         argtypes: List[Definition],
@@ -70,55 +83,86 @@ class CallbackServer(CallbackServerABC):
 
         self._name = name
         self._handler = getattr(rpc_client, name)
+        self._rpc_server = rpc_server
         self._data = data
         self._log = log
 
-        self._argtypes = argtypes
-        self._restype = restype
-        self._memsyncs = memsyncs
+        self._plan = Plan(data, argtypes, restype, memsyncs, None)
+        self._plan_generic = Plan(data, argtypes, restype, memsyncs, None, compile = False)
 
     def __call__(self, *args: Any) -> Any:
 
         args = list(args)
 
-        self._log.info(f'[callback-server] Trying to call callback routine "{self._name:s}" ...')
-        self._log.info('[callback-server] ... packing and pushing to client ...')
-        self._log.debug(args)
+        verbose = self._log.is_enabled_for(INFO)  # skip building log messages if they are discarded anyway
+
+        if verbose:
+            self._log.info(f'[callback-server] Trying to call callback routine "{self._name:s}" ...')
+        if self._log.is_enabled_for(DEBUG):
+            self._log.debug(args)
+
+        plan = self._plan if self._data.compile_plans else self._plan_generic
+
+        if plan.fast:
+            packed_args = plan.pack_fast_args(args)
+            if packed_args is not None:
+                if verbose:
+                    self._log.info('[callback-server] ... pushing to client (fast path) ...')
+                return self._receive(plan, args, self._push(CALLBACK_FAST + packed_args), verbose)
+
+        if verbose:
+            self._log.info('[callback-server] ... packing and pushing to client ...')
 
         try:
-            packed_args = self._data.pack_args(args, self._argtypes)
-            packed_mempkgs = [mempkg.as_packed() for mempkg in DefinitionMemsync.pkg_memories(
-                args = args,
-                memsyncs = self._memsyncs,
-            )]
+            if plan.memsyncs is None:
+                packed_mempkgs = []
+            else:
+                packed_mempkgs = [mempkg.as_packed() for mempkg in DefinitionMemsync.pkg_memories(
+                    args = args,
+                    memsyncs = plan.memsyncs,
+                    arena = self._data.arena,
+                )]
+            payload = CALLBACK_PICKLED + pickle.dumps((plan.pack_args(args), packed_mempkgs))
         except Exception as e:
             self._log.error("[callback-server] ... memory packing failed!")
             self._log.error(traceback.format_exc())
             raise e
 
+        return self._receive(plan, args, self._push(payload), verbose)
+
+    def _push(self, payload: bytes) -> bytes:
+
         try:
-            return_package = self._handler(packed_args, packed_mempkgs)
+            if self._rpc_server is not None:
+                reply = self._rpc_server.call_back(self._name, payload)
+                if reply is not None:
+                    return reply
+            return self._handler(payload)  # not invoked from within the call of a routine
         except Exception as e:
             self._log.error("[callback-server] ... call failed!")
             self._log.error(traceback.format_exc())
             raise e
 
+    def _receive(self, plan: PlanABC, args: List[Any], reply: bytes, verbose: bool) -> Any:
+
+        if reply[:1] == CALLBACK_FAST:
+            if verbose:
+                self._log.info("[callback-server] ... received feedback from client (fast path), return.")
+            return plan.unpack_fast_retval(reply[1:])
+
         try:
-            self._log.info("[callback-server] ... received feedback from client, unpacking ...")
-            self._data.sync_args(
-                args,
-                self._data.unpack_args(return_package["args"], self._argtypes),
-                self._argtypes,
-            )
-            retval = self._data.unpack_retval(
-                return_package["retval"], self._restype
-            )
-            DefinitionMemsync.unpkg_memories(
-                args = args,
-                retval = retval,
-                mempkgs = [Mempkg.from_packed(mempkg) for mempkg in return_package["mempkgs"]],
-                memsyncs = self._memsyncs,
-            )
+            if verbose:
+                self._log.info("[callback-server] ... received feedback from client, unpacking ...")
+            return_package = pickle.loads(reply[1:])
+            plan.sync_args(args, return_package["args"])
+            retval = plan.unpack_retval(return_package["retval"])
+            if plan.memsyncs is not None:
+                DefinitionMemsync.unpkg_memories(
+                    args = args,
+                    retval = retval,
+                    mempkgs = [Mempkg.from_packed(mempkg, arena = self._data.arena) for mempkg in return_package["mempkgs"]],
+                    memsyncs = plan.memsyncs,
+                )
         except Exception as e:
             self._log.error("[callback-server] ... unpacking failed!")
             self._log.error(traceback.format_exc())
@@ -128,6 +172,7 @@ class CallbackServer(CallbackServerABC):
             self._log.error("[callback-server] ... call raised an error.")
             raise return_package["exception"]
 
-        self._log.info("[callback-server] ... unpacked, return.")
+        if verbose:
+            self._log.info("[callback-server] ... unpacked, return.")
 
         return retval
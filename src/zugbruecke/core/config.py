@@ -39,7 +39,7 @@ from typing import Any, Dict, Optional
 
 from wenv import PythonVersion
 
-from .abc import ConfigABC
+from .abc import ConfigABC, ConfigSnapshotABC
 from .const import CONFIG_FLD, CONFIG_FN
 from .errors import ConfigParserError
 from .lib import generate_session_id
@@ -50,6 +50,55 @@ from .typeguard import typechecked
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+@typechecked
+class ConfigSnapshot(ConfigSnapshotABC):
+    """
+    Resolved configuration values as read-only attributes, for hot paths.
+    Created by ``Config.snapshot``, must not be kept beyond changes of the configuration.
+
+    Args:
+        values : Resolved configuration values, one per slot.
+    """
+
+    __slots__ = (
+        "platform",
+        "id",
+        "stdout",
+        "stderr",
+        "log_write",
+        "log_rotate",
+        "log_level",
+        "arch",
+        "pythonversion",
+        "timeout_start",
+        "timeout_stop",
+        "copy_modules",
+        "transport",
+        "compile_plans",
+        "daemon",
+        "validate_env",
+        "callback_cache",
+        "signature_cache",
+    )
+
+    def __init__(self, **values: Any):
+
+        for key in self.__slots__:
+            object.__setattr__(self, key, values[key])
+
+    def __repr__(self) -> str:
+
+        return f"<ConfigSnapshot {' '.join(f'{key:s}={getattr(self, key)!r}' for key in self.__slots__):s}>"
+
+    def __setattr__(self, key: str, value: Any):
+
+        raise AttributeError("configuration snapshot is read-only", key)
+
+    def __delattr__(self, key: str):
+
+        raise AttributeError("configuration snapshot is read-only", key)
+
+
 @typechecked
 class Config(dict, ConfigABC):
     """
@@ -77,6 +126,9 @@ class Config(dict, ConfigABC):
         # Call parent constructur, just in case
         super().__init__()
 
+        # Resolved values, invalidated on change
+        self._snapshot = None
+
         # Get config from files - only on Unix side
         if not sys.platform.startswith("win"):
             self.update(self._get_config_from_files())
@@ -100,6 +152,21 @@ class Config(dict, ConfigABC):
 
         return f"<Config {super().__repr__():s}>"
 
+    def __setitem__(self, key: str, value: Any):
+
+        self._snapshot = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str):
+
+        self._snapshot = None
+        super().__delitem__(key)
+
+    def update(self, *args: Any, **kwargs: Any):
+
+        self._snapshot = None
+        super().update(*args, **kwargs)
+
     def __getitem__(self, key: str) -> Any:
         """
         Returns values from the following sources in the following order:
@@ -139,6 +206,8 @@ class Config(dict, ConfigABC):
             return True  # Display messages from stderr
         if key == "log_write":
             return False  # Write log messages into file
+        if key == "log_rotate":
+            return 0  # Size of log file in bytes which triggers rotation, 0 for no rotation
         if key == "log_level":
             return NOTSET  # Overall log level: No logs are generated by default (0)
         if key == "arch":
@@ -151,9 +220,37 @@ class Config(dict, ConfigABC):
             return 30  # Timeout for waiting on Wine-Python stop
         if key == "copy_modules":
             return False  # Do not symlink zugbruecke and wenv into wenv env but copy them instead
+        if key == "transport":
+            return "socket"  # RPC transport between Unix and Wine side, "socket" or "shm"
+        if key == "compile_plans":
+            return True  # Use per-routine marshalling plans compiled at configure time
+        if key == "daemon":
+            return False  # Attach to a pre-booted Wine Python server of a running daemon if there is one
+        if key == "validate_env":
+            return False  # Validate Wine Python environment on every start, ignoring its stamp file
+        if key == "callback_cache":
+            return 256  # Maximum number of callback routines kept which can not be referenced weakly
+        if key == "signature_cache":
+            return False  # Keep packed definitions of routines on disk, configure them at load time of their DLL
 
         raise KeyError("not a valid configuration key", key)
 
+    def snapshot(self) -> ConfigSnapshotABC:
+        """
+        Resolves all configuration values at once, i.e. environment variables are read once.
+        The snapshot is cached until the configuration is changed.
+
+        Returns:
+            Read-only snapshot of resolved configuration values.
+        """
+
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = ConfigSnapshot(**{key: self[key] for key in ConfigSnapshot.__slots__})
+            self._snapshot = snapshot
+
+        return snapshot
+
     def export_dict(self) -> Dict[str, Any]:
         """
         Exports a dictionary.
@@ -45,6 +45,66 @@ CUSTOM_GROUP = "Custom"
 
 PLATFORMS = ("UNIX", "WINE")
 CONVENTIONS = ("cdll", "windll", "oledll")
+TRANSPORTS = ("socket", "shm")
+MEMSYNC_DIRECTIONS = ("in", "out", "inout")
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TRANSPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+SHM_ATTACH = "_shm_attach"  # Reserved RPC name, switches a connection to shared memory
+SHM_CAPACITY = 2 ** 20  # Bytes per direction and connection
+RPC_ASYNC = "_async"  # Reserved RPC name, switches a connection to tagged requests with out-of-order responses
+RPC_ASYNC_WORKERS = 8  # Maximum number of requests served in parallel per connection with out-of-order responses
+RPC_BACKLOG = 64  # Pending connections per RPC server, threads of the other side may connect at the same time
+RPC_CALLBACK = b"\x01"  # Frame tag, call of callback routine nested into the call of a routine, sent back on its connection
+RPC_CALLBACK_RETURN = b"\x02"  # Frame tag, result of nested call of callback routine
+RPC_CALLBACK_RAISE = b"\x03"  # Frame tag, exception raised by nested call of callback routine
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CALLS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+MAP_CHUNK_SIZE = 1024  # Default number of calls per round trip in batched calls
+DEFINITION_CACHE_SIZE = 4096  # Number of cached definitions per session, least recently used ones are dropped
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CALLBACK
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+CALLBACK_FAST = b"f"  # Payload tag, arguments or return value of callback routine encoded for the fast path
+CALLBACK_PICKLED = b"p"  # Payload tag, packed arguments or return package of callback routine, pickled
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MEMSYNC
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+MEMSYNC_DELTA_CHUNK = 4096  # Bytes per chunk when comparing memory for changes, memsync with delta
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# LOG
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+LOG_QUEUE_SIZE = 10_000  # Maximum number of log messages waiting to be shipped from Wine side, oldest are dropped
+LOG_BATCH_SIZE = 256  # Number of waiting log messages which triggers shipping before the flush interval is over
+LOG_FLUSH_INTERVAL = 0.05  # Seconds between shipping waiting log messages from Wine side
+LOG_WRITE_INTERVAL = 1.0  # Maximum seconds log messages are buffered before they are written to the log file
+LOG_WRITE_BUFFER = 2 ** 16  # Bytes buffered before they are written to the log file
+INTERPRETER_STREAM_CHUNK = 2 ** 16  # Maximum bytes read at once from stdout and stderr of Wine Python
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# POOL / DAEMON
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+SCHEDULES = ("least_loaded", "round_robin")  # Strategies for spreading calls across the sessions of a pool
+POOL_AFFINITY_SIZE = 4096  # Default number of affinity keys remembered by a pool, least recently used ones are forgotten
+DAEMON_SIZE = 2  # Default number of pre-booted Wine Python servers kept by a daemon
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -61,3 +121,5 @@ _FUNCFLAG_STDCALL = 0  # EXPORT
 
 CONFIG_FLD = ".zugbruecke"
 CONFIG_FN = ".zugbruecke.json"
+ENV_STAMP_FN = ".zugbruecke_stamp.json"  # in Wine Python prefix, marks a validated environment
+SIGNATURE_FLD = "signatures"  # in CONFIG_FLD, packed definitions of routines per DLL file
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/daemon.py: Pool of pre-booted Wine Python servers shared across Unix processes
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from multiprocessing.connection import Client
+import os
+from queue import Empty, Queue
+import signal
+import tempfile
+from threading import Condition, Event, Thread
+import traceback
+from types import FrameType
+from typing import Any, Dict, Optional
+
+from .abc import ConfigABC, DaemonABC, InterpreterABC, LogABC, RpcClientABC
+from .config import Config
+from .const import DAEMON_SIZE
+from .interpreter import Interpreter
+from .lib import get_free_port
+from .log import Log
+from .rpc import RpcClient, RpcServer
+from .typeguard import typechecked
+from .wenv import Env
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+def get_daemon_path(parameter: ConfigABC) -> str:
+    """
+    Socket of the daemon serving the Wine Python environment of a configuration, one per user.
+    Architecture, version, prefix and module setup of the environment are part of the name
+    via its fingerprint - sessions never attach to servers running in another environment.
+    """
+
+    fingerprint = Env(**parameter.export_dict()).get_fingerprint()
+
+    return os.path.join(
+        tempfile.gettempdir(),
+        f'zugbruecke_{os.getuid():d}_{parameter["arch"]:s}_{str(parameter["pythonversion"]):s}_{fingerprint[:16]:s}.sock',
+    )
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Daemon(DaemonABC):
+    """
+    Keeps a pool of idle, pre-booted Wine Python servers for sessions of other Unix processes
+
+    Servers are started in standby mode: Wine and Python are up, ``zugbruecke`` is imported,
+    but there is no session yet. A session asks the daemon for a server through a Unix domain
+    socket, see ``get_daemon_path``. The daemon hands over one of its idle servers, passing
+    the session's parameters, and boots a replacement in the background. From there on, session
+    and server talk directly. The daemon only collects the server's output and its exit status.
+
+    Args:
+        config : Configuration, ``arch`` and ``pythonversion`` determine the servers
+        size : Number of idle servers to keep
+    """
+
+    def __init__(self, config: Optional[Config] = None, size: int = DAEMON_SIZE):
+
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self._p = Config() if config is None else config
+        self._id = self._p["id"]
+        self._size = size
+        self._path = get_daemon_path(self._p)
+
+        self._up = True
+        self._terminated = Event()
+        self._condition = Condition()  # guards idle, booting and attached
+        self._idle = Queue()  # servers ready for sessions: interpreter, rpc client
+        self._booting = 0
+        self._attached = 0
+
+        self._log = Log(self._id, self._p)
+        self._log.info("[daemon] STARTING ...")
+
+        if os.path.exists(self._path):
+            if self._is_running(self._path):
+                raise RuntimeError(f'daemon already running: "{self._path:s}"')
+            os.unlink(self._path)  # left behind by a daemon which did not terminate cleanly
+
+        # Ensure a working Wine-Python environment
+        Env(**self._p.export_dict()).ensure_zugbruecke(validate=self._p["validate_env"])
+
+        self._rpc_server = RpcServer(
+            self._path,
+            "zugbruecke_daemon",
+            log=self._log,
+            terminate_function=self._terminate,
+        )
+        for name in ("acquire", "status"):
+            self._rpc_server.register_function(getattr(self, name), name)
+        self._rpc_server.register_function(self._rpc_server.terminate, "terminate")
+        self._rpc_server.server_forever_in_thread()
+
+        self._refill()
+
+        self._log.info(f'[daemon] Listening on "{self._path:s}".')
+        self._log.info("[daemon] STARTED.")
+
+    def __repr__(self) -> str:
+
+        return f'<Daemon path="{self._path:s}" size={self._size:d} up={self._up}>'
+
+    @property
+    def path(self) -> str:
+
+        return self._path
+
+    def acquire(self, parameter: Dict[str, Any]) -> int:
+        """
+        Called by session client. Hands an idle server to a session.
+
+        Args:
+            - parameter: session parameters, passed on to the server
+        Returns:
+            PID of server process
+        """
+
+        self._log.info(f'[daemon] Session "{parameter["id"]:s}" asks for a server ...')
+
+        while True:
+
+            try:
+                interpreter, client = self._idle.get(timeout=self._p["timeout_start"])
+            except Empty:
+                self._log.error("[daemon] ... no server available!")
+                raise TimeoutError("no pre-booted server available")
+
+            self._refill()
+
+            try:
+                client.attach(parameter)
+            except Exception:
+                self._log.warning("[daemon] ... server is gone, trying next one ...")
+                interpreter.terminate()
+                continue
+
+            break
+
+        with self._condition:
+            self._attached += 1
+        Thread(target=self._join, args=(interpreter,), daemon=True).start()
+
+        self._log.info(f"[daemon] ... server with PID {interpreter.pid:d} handed over.")
+
+        return interpreter.pid
+
+    def status(self) -> Dict[str, int]:
+        """
+        Called by clients. Numbers of idle, booting and attached servers.
+        """
+
+        with self._condition:
+            return dict(
+                idle=self._idle.qsize(),
+                booting=self._booting,
+                attached=self._attached,
+            )
+
+    def serve_forever(self):
+        """
+        Blocks until the daemon is terminated, via RPC or signal
+        """
+
+        signal.signal(signal.SIGINT, self.terminate)
+        signal.signal(signal.SIGTERM, self.terminate)
+
+        while not self._terminated.wait(timeout=1.0):  # allows signal handlers to run
+            pass
+
+    def terminate(
+        self,
+        signum: Optional[int] = None,  # Only required for for signal handling.
+        frame: Optional[FrameType] = None,  # Only required for for signal handling.
+    ):
+
+        self._rpc_server.terminate()
+
+    def _boot(self):
+
+        config = Config(**self._p.export_dict())  # own ID and port per server
+
+        interpreter = None
+        client = None
+        try:
+            interpreter = Interpreter(config["id"], config, self._log, standby=True)
+            client = RpcClient.from_safe_connect(
+                socket_path=("localhost", config["port_socket_wine"]),
+                authkey="zugbruecke_wine",
+                timeout_after_seconds=config["timeout_start"],
+            )
+        except Exception:
+            self._log.error("[daemon] Server failed to boot!")
+            self._log.error(traceback.format_exc())
+
+        with self._condition:
+            self._booting -= 1
+            up = self._up
+            if up and client is not None:
+                self._idle.put((interpreter, client))
+            self._condition.notify_all()
+
+        if not up or client is None:
+            self._cancel(interpreter, client)
+
+    def _cancel(self, interpreter: Optional[InterpreterABC], client: Optional[RpcClientABC]):
+
+        if client is not None:
+            try:
+                client.cancel()
+            except Exception:
+                pass
+
+        if interpreter is not None:
+            interpreter.terminate()
+
+    def _join(self, interpreter: InterpreterABC):
+
+        interpreter.join()
+
+        with self._condition:
+            self._attached -= 1
+
+        self._log.info(f"[daemon] Server with PID {interpreter.pid:d} has terminated.")
+
+    def _refill(self):
+
+        with self._condition:
+            missing = self._size - self._idle.qsize() - self._booting
+            if not self._up or missing <= 0:
+                return
+            self._booting += missing
+
+        self._log.info(f"[daemon] Booting {missing:d} server(s) ...")
+
+        for _ in range(missing):
+            Thread(target=self._boot, daemon=True).start()
+
+    def _terminate(self):
+        """
+        Called by RPC server termination
+        """
+
+        self._log.info("[daemon] TERMINATING ...")
+
+        with self._condition:
+            self._up = False
+            while self._booting > 0:  # booting servers cancel themselves
+                self._condition.wait()
+            attached = self._attached
+
+        while True:
+            try:
+                self._cancel(*self._idle.get_nowait())
+            except Empty:
+                break
+
+        if attached > 0:
+            self._log.info(f"[daemon] {attached:d} server(s) remain attached to their sessions.")
+
+        self._log.info("[daemon] TERMINATED.")
+        self._log.terminate()
+
+        self._terminated.set()
+
+    @staticmethod
+    def _is_running(path: str) -> bool:
+
+        try:
+            Client(path, authkey=b"zugbruecke_daemon").close()
+        except OSError:
+            return False
+
+        return True
+
+
+@typechecked
+class AttachedInterpreter(InterpreterABC):
+    """
+    Pre-booted Python interpreter on Wine, provided and owned by a daemon.
+    The interpreter's output ends up in the daemon's log.
+
+    Raises if there is no daemon or if it has no server to offer.
+    """
+
+    def __init__(self, session_id: str, parameter: ConfigABC, session_log: LogABC):
+
+        self._id = session_id
+        self._p = parameter
+        self._log = session_log
+
+        path = get_daemon_path(self._p)
+
+        self._log.info(f'[interpreter] Attaching to daemon at "{path:s}" ...')
+
+        daemon = RpcClient(path, "zugbruecke_daemon")
+
+        self._p["port_socket_wine"] = get_free_port()
+        self._pid = daemon.acquire(dict(
+            id=self._id,
+            port_socket_wine=self._p["port_socket_wine"],
+            port_socket_unix=self._p["port_socket_unix"],
+            log_level=self._p["log_level"],
+            log_write=self._p["log_write"],
+            log_rotate=self._p["log_rotate"],
+            timeout_start=float(self._p["timeout_start"]),
+            compile_plans=self._p["compile_plans"],
+        ))
+
+        self._log.info(f"[interpreter] ... attached to server with PID {self._pid:d}.")
+
+    @property
+    def pid(self) -> int:
+
+        return self._pid
+
+    def terminate(self):
+
+        self._log.info("[interpreter] Server is owned by daemon, nothing to clean up.")
@@ -32,9 +32,11 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import ctypes
+from functools import partial
 from typing import Any, Callable, List, Optional, Tuple, Union
 
-from .abc import CacheABC, DataABC, LogABC, RpcClientABC, RpcServerABC
+from .abc import CacheABC, CallbackRegistryABC, DataABC, LogABC, RpcClientABC, RpcServerABC, SharedArenaABC
+from .arena import SharedArena
 from .cache import Cache
 from .const import (
     FLAG_POINTER,
@@ -43,6 +45,7 @@ from .const import (
     FUNC_GROUP,
 )
 from .callback_client import CallbackClient
+from .callback_registry import CallbackRegistry
 from .callback_server import CallbackServer
 from .definitions import Definition
 from .errors import DataFlagError, DataGroupError
@@ -67,21 +70,71 @@ class Data(DataABC):
         is_server: bool,
         callback_client: Optional[RpcClientABC] = None,
         callback_server: Optional[RpcServerABC] = None,
+        callback_release: Optional[Callable[[List[str]], None]] = None,
+        callback_cache: int = 256,
+        compile_plans: bool = True,
     ):
 
         self._log = log
         self._is_server = is_server
+        self._compile_plans = compile_plans
 
         self._callback_client = callback_client
         self._callback_server = callback_server
 
         self._cache = Cache()
+        self._arena = SharedArena()
+        self._callbacks = CallbackRegistry(
+            rpc_server = callback_server,
+            maxsize = callback_cache,
+            release = callback_release,
+        )
+
+    @property
+    def arena(self) -> SharedArenaABC:
+        """
+        Memory shared between Unix and Wine side
+        """
+
+        return self._arena
 
     @property
     def cache(self) -> CacheABC:
 
         return self._cache
 
+    @property
+    def callbacks(self) -> CallbackRegistryABC:
+        """
+        Callback functions handed to the Wine side, Unix side only
+        """
+
+        return self._callbacks
+
+    @property
+    def compile_plans(self) -> bool:
+        """
+        Routines use their compiled marshalling plans if ``True``, the generic code paths otherwise
+        """
+
+        return self._compile_plans
+
+    @compile_plans.setter
+    def compile_plans(self, value: bool):
+
+        self._compile_plans = value
+
+    def release_callbacks(self, names: List[str]):
+        """
+        Wine side. Drops callback translators which have been released on the Unix side.
+
+        Args:
+            - names: (Generated) names of funcs
+        """
+
+        for name in names:
+            self._cache.handle.pop(name, None)
+
     def pack_args(self, args: List[Any], argtypes: List[Definition], conv: Optional[str] = None) -> List[Any]:
         """
         Args:
@@ -315,25 +368,20 @@ class Data(DataABC):
         if self._is_server:
             return None
 
-        # Use memory address of function pointer as unique name/ID
-        name = f"func_{id(func):x}"
-
-        # Has callback translator not been built yet?
-        if name not in self._cache.handle.keys():
-            # Generate and store callback in cache
-            self._cache.handle[name] = CallbackClient(
-                name = name,
-                handler = func,
-                rpc_server = self._callback_server,
-                data = self,
-                log = self._log,
-                argtypes = functype.argtypes,
-                restype = functype.restype,
-                memsyncs = functype.memsyncs,
-            )
-
-        # Return name of callback entry
-        return name
+        name = self._callbacks.get(func)
+        if name is not None:
+            return name
+
+        # Generate callback translator, registers itself at RPC server
+        return self._callbacks.add(func, partial(
+            CallbackClient,
+            rpc_server = self._callback_server,
+            data = self,
+            log = self._log,
+            argtypes = functype.argtypes,
+            restype = functype.restype,
+            memsyncs = functype.memsyncs,
+        ))
 
     def _pack_struct(self, struct: Any, structtype: Definition) -> List[Tuple[str, Any]]:
         """
@@ -629,6 +677,7 @@ class Data(DataABC):
                 CallbackServer(
                     name = name,
                     rpc_client = self._callback_client,
+                    rpc_server = self._callback_server,
                     data = self,
                     log = self._log,
                     argtypes = functype.argtypes,
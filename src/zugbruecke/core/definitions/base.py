@@ -34,7 +34,7 @@ import ctypes
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..abc import CacheABC, DefinitionABC
-from ..const import FLAG_POINTER
+from ..const import DEFINITION_CACHE_SIZE, FLAG_POINTER
 from ..errors import DataFlagError
 from ..typeguard import typechecked
 
@@ -138,6 +138,14 @@ class Definition(DefinitionABC):
 
         return self._data_type == ctypes.c_void_p and not self.is_pointer and self.is_scalar
 
+    @property
+    def is_stale(self) -> bool:
+        """
+        Cached definition does not reflect its data type anymore
+        """
+
+        return False
+
     @staticmethod
     def _apply_flags(data_type: Any, flags: List[int]) -> Any:
         """
@@ -250,8 +258,35 @@ class Definition(DefinitionABC):
         type_name: Name of datatype, such as c_int, if there is one, else None
         group: 'PyCSimpleType', 'PyCStructType', 'PyCArrayType' or 'PyCPointerType'
         flags: Pointer flag or length of array (one entry per dimension)
+
+        Definitions are cached and shared, they must not be changed.
         """
 
+        key = (data_type, field_name)  # the type itself, not its id - an id may be reused once a type is collected
+
+        try:
+            definition = cache.definition.get(key)
+        except TypeError:  # custom types with from_param are not necessarily hashable
+            return cls._from_data_type_uncached(cache, data_type, field_name)
+
+        if definition is None or definition.is_stale:
+            definition = cls._from_data_type_uncached(cache, data_type, field_name)
+            cache.definition[key] = definition
+            if len(cache.definition) > DEFINITION_CACHE_SIZE:
+                cache.definition.popitem(last = False)
+        else:
+            cache.definition.move_to_end(key)
+
+        return definition
+
+    @classmethod
+    def _from_data_type_uncached(
+        cls,
+        cache: CacheABC,
+        data_type: Any,
+        field_name: Union[str, int, None],
+    ) -> DefinitionABC:
+
         from .simple import DefinitionSimple
         from .struct import DefinitionStruct
         from .func import DefinitionFunc
@@ -36,6 +36,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..abc import CacheABC, DefinitionABC, DefinitionMemsyncABC
 from ..const import _FUNCFLAG_STDCALL, FUNC_GROUP
+from ..lib import get_hash_of_string
 from ..typeguard import typechecked
 
 from . import base
@@ -85,6 +86,14 @@ class DefinitionFunc(base.Definition):
 
         return self._func_flags
 
+    @property
+    def is_stale(self) -> bool:
+        """
+        Memsync definitions of function type have been replaced
+        """
+
+        return getattr(self._base_type, '_memsync_', None) is not self._memsyncs
+
     def as_packed(self) -> Dict:
         """
         Pack as dict so it can be sent to other side
@@ -195,9 +204,26 @@ class DefinitionFunc(base.Definition):
 
     @staticmethod
     def _make_type_name(restype: Any, argtypes: List[Any], func_flags: int) -> str:
+        """
+        Key for Unix side only, derived from ctypes data types
+        """
 
         return f'functype_{hash((restype, tuple(argtypes), func_flags)):x}'
 
+    @staticmethod
+    def _make_packed_type_name(restype: DefinitionABC, argtypes: List[DefinitionABC], func_flags: int) -> str:
+        """
+        Derived from definitions, identical across processes
+        """
+
+        signature = (
+            (restype.type_name, tuple(restype.flags)),
+            tuple((argtype.type_name, tuple(argtype.flags)) for argtype in argtypes),
+            func_flags,
+        )
+
+        return f'functype_{get_hash_of_string(repr(signature))[:16]:s}'
+
     @classmethod
     def _from_data_type(
         cls,
@@ -212,14 +238,17 @@ class DefinitionFunc(base.Definition):
         Func group-specific helper for from ctypes data type
         """
 
+        argtypes = cls.from_data_types(data_types = base_type._argtypes_, cache = cache)
+        restype = cls.from_data_type(data_type = base_type._restype_, cache = cache)
+
         return cls(
             flags = flags,
             field_name = field_name,
-            type_name = cls._make_type_name(base_type._restype_, base_type._argtypes_, base_type._flags_),
+            type_name = cls._make_packed_type_name(restype, argtypes, base_type._flags_),
             data_type = data_type,
             base_type = base_type,
-            argtypes = cls.from_data_types(data_types = base_type._argtypes_, cache = cache),
-            restype = cls.from_data_type(data_type = base_type._restype_, cache = cache),
+            argtypes = argtypes,
+            restype = restype,
             memsyncs = base_type.memsync,  # already parsed into definition via meta class
             func_flags = base_type._flags_,
         )
@@ -33,8 +33,8 @@ specific language governing rights and limitations under the License.
 import ctypes
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from ..abc import CacheABC, DefinitionMemsyncABC
-from ..const import FLAG_POINTER, SIMPLE_GROUP, STRUCT_GROUP
+from ..abc import CacheABC, DefinitionMemsyncABC, SharedArenaABC
+from ..const import FLAG_POINTER, MEMSYNC_DELTA_CHUNK, MEMSYNC_DIRECTIONS, SIMPLE_GROUP, STRUCT_GROUP
 from ..mempkg import Mempkg
 from ..memory import (
     is_null_pointer,
@@ -67,8 +67,13 @@ class DefinitionMemsync(DefinitionMemsyncABC):
         unic: bool = False,  # "w" - handle unicode
         custom: Optional[Any] = None,  # "_c" - custom data type classes
         func: Optional[str] = None,  # "f" - compile length function
+        direction: str = "inout",  # "in" (read by DLL), "out" (written by DLL) or "inout"
+        delta: bool = False,  # ship changed ranges back instead of entire memory
     ):
 
+        if direction not in MEMSYNC_DIRECTIONS:
+            raise ValueError("memsync direction must be one of in, out or inout", direction)
+
         self._pointer = pointer
         self._length = length
         self._type = type
@@ -76,6 +81,8 @@ class DefinitionMemsync(DefinitionMemsyncABC):
         self._unic = unic
         self._custom = custom
         self._func = func
+        self._direction = direction
+        self._delta = delta
 
         self._func_callable = None if self._func is None else eval(self._func)  # "_f" HACK?
 
@@ -87,7 +94,7 @@ class DefinitionMemsync(DefinitionMemsyncABC):
 
     def __repr__(self) -> str:
 
-        return f'<Memsync type={self._type} null={self._null} unic={self._unic} func={self._func is not None}>'
+        return f'<Memsync type={self._type} null={self._null} unic={self._unic} func={self._func is not None} direction={self._direction} delta={self._delta}>'
 
     @staticmethod
     def _get_str_len(ptr: Any, is_unicode: bool) -> int:
@@ -263,30 +270,42 @@ class DefinitionMemsync(DefinitionMemsyncABC):
             if idx == 0 or isinstance(segment, str)
         ]
 
+        # Definitions are shared, copy on write along the path
         if isinstance(short_path[0], int):  # function argument
-            if len(short_path) == 1:
-                argtypes[short_path[0]] = itemtype
-                return argtypes, restype
-            else:
-                subtype = argtypes[short_path[0]]
+            argtypes = list(argtypes)
+            argtypes[short_path[0]] = DefinitionMemsync._with_itemtype_by_path(
+                short_path[1:], argtypes[short_path[0]], itemtype,
+            )
         elif short_path[0] == "r":  # function return value
-            if len(short_path) == 1:
-                return argtypes, itemtype
-            else:
-                subtype = restype
+            restype = DefinitionMemsync._with_itemtype_by_path(
+                short_path[1:], restype, itemtype,
+            )
         else:
             raise DataMemsyncpathError(
                 f'short_path[0] is neither return value ("r") nor parameter (type int) "{short_path[0]}"'
             )
 
-        # Step through short path to argument type ...
-        for segment in short_path[1:-1]:
-            # Go deeper ...
-            subtype = subtype.get_field(name = segment)
+        return argtypes, restype
 
-        subtype.set_field(name = short_path[-1], definition = itemtype)
+    @staticmethod
+    def _with_itemtype_by_path(
+        short_path: List[str],
+        subtype: Optional[Definition],
+        itemtype: Definition,
+    ) -> Definition:
+        """
+        Copy of struct definition with nested field replaced by path, or item type for empty path
+        """
 
-        return argtypes, restype
+        if len(short_path) == 0:
+            return itemtype
+
+        return subtype.with_field(
+            name = short_path[0],
+            definition = DefinitionMemsync._with_itemtype_by_path(
+                short_path[1:], subtype.get_field(name = short_path[0]), itemtype,
+            ),
+        )
 
     def _unpack_memory(
         self, mempkg: Mempkg, args: List[Any], retval: Optional[Any] = None,
@@ -414,13 +433,14 @@ class DefinitionMemsync(DefinitionMemsyncABC):
 
         return argtypes, restype
 
-    def pkg_memory(self, args: List[Any], retval: Optional[Any] = None) -> Mempkg:
+    def pkg_memory(self, args: List[Any], retval: Optional[Any] = None, arena: Optional[SharedArenaABC] = None) -> Mempkg:
         """
         Client. Pkg memory prior to call.
 
         Args:
             args: Raw function arguments
             memsyncs: Memsync definitions
+            arena: Shared memory, not copied
         Returns:
             Memory package
         """
@@ -456,22 +476,38 @@ class DefinitionMemsync(DefinitionMemsyncABC):
                 * self._size
             )
 
-        return Mempkg.from_pointer(ptr = ptr, length = length, wchar = wchar)
+        return Mempkg.from_pointer(
+            ptr = ptr,
+            length = length,
+            wchar = wchar,
+            arena = arena,
+            copy = self._direction != "out",  # DLL does not read, contents are not shipped
+        )
 
-    def update_memory(self, mempkg: Mempkg, args: List[Any], retval: Optional[Any] = None):
+    def update_memory(self, mempkg: Mempkg, args: List[Any], retval: Optional[Any] = None, arena: Optional[SharedArenaABC] = None):
         """
         Server. Used instead of pkg before return shipment to client.
 
         Args:
             - mempkg: Memory package
+            - arena: Shared memory, not copied
         Returns:
             Nothing
         """
 
+        # DLL did not write, contents are not shipped back
+        if self._direction == "in":
+            mempkg.drop_data()
+
         # If memory for pointer was allocated here on server side
-        if mempkg.local_addr is None:
+        elif mempkg.local_addr is None:
             # Update memory package completely
-            mempkg.update(self.pkg_memory(args, retval))
+            mempkg.update(self.pkg_memory(args, retval, arena))
+
+        # If pointer pointed to data on client side and only changes are requested (not for Unicode, sizes differ)
+        elif self._delta and not self._unic:
+            # Keep changed ranges of new data only
+            mempkg.update_delta(MEMSYNC_DELTA_CHUNK)
 
         # If pointer pointed to data on client side
         else:
@@ -503,6 +539,10 @@ class DefinitionMemsync(DefinitionMemsyncABC):
 
         else:
 
+            # DLL did not write, nothing was shipped back
+            if self._direction == "in":
+                return
+
             # If memory for pointer has been allocated by remote side
             if mempkg.local_addr is None:
                 # Unpack one memory section / item
@@ -527,6 +567,8 @@ class DefinitionMemsync(DefinitionMemsyncABC):
             'null': self._null,
             'unic': self._unic,
             'func': self._func,
+            'direction': self._direction,
+            'delta': self._delta,
         }
 
     @classmethod
@@ -612,6 +654,7 @@ class DefinitionMemsync(DefinitionMemsyncABC):
     def pkg_memories(
         args: List[Any],
         memsyncs: List[DefinitionMemsyncABC],
+        arena: Optional[SharedArenaABC] = None,
     ) -> List[Mempkg]:
         """
         Client. Before initial shipment.
@@ -619,11 +662,12 @@ class DefinitionMemsync(DefinitionMemsyncABC):
         Args:
             args: Raw function arguments
             memsyncs: Memsync definitions
+            arena: Shared memory, not copied
         Returns:
             List of memory packages for shipping
         """
 
-        return [memsync.pkg_memory(args) for memsync in memsyncs]
+        return [memsync.pkg_memory(args, arena = arena) for memsync in memsyncs]
 
     @staticmethod
     def update_memories(
@@ -631,6 +675,7 @@ class DefinitionMemsync(DefinitionMemsyncABC):
         retval: Any,
         mempkgs: List[Mempkg],
         memsyncs: List[DefinitionMemsyncABC],
+        arena: Optional[SharedArenaABC] = None,
     ):
         """
         Server. After call, for return shipment.
@@ -640,13 +685,14 @@ class DefinitionMemsync(DefinitionMemsyncABC):
             retval: Raw function return value
             mempkgs: List of packed memory packages from shipping
             memsyncs: Memsync definitions
+            arena: Shared memory, not copied
         Returns:
             Nothing
         """
 
         # Iterate over memory package dicts
         for mempkg, memsync in zip(mempkgs, memsyncs):
-            memsync.update_memory(mempkg, args, retval)
+            memsync.update_memory(mempkg, args, retval, arena)
 
     @staticmethod
     def unpkg_memories(
@@ -35,6 +35,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..abc import CacheABC, DefinitionABC
 from ..const import FLAG_POINTER, STRUCT_GROUP
+from ..lib import get_hash_of_string
 from ..typeguard import typechecked
 
 from . import base
@@ -78,20 +79,26 @@ class DefinitionStruct(base.Definition):
         _, definition = self._fields[idx]
         return definition
 
-    def set_field(self, name: str, definition: DefinitionABC):
+    def with_field(self, name: str, definition: DefinitionABC) -> DefinitionABC:
         """
-        Allows to change the definition of a field based on name. Useful for memsync.
+        Returns a copy with the definition of a field replaced based on name. Useful for memsync.
+        Definitions are shared, i.e. they are not changed in place.
         """
 
-        idx = None
-        for idx, (field_name, _) in enumerate(self._fields):
-            if name == field_name:
-                break
-
-        if idx is None:
+        if name not in (field_name for field_name, _ in self._fields):
             raise KeyError(f'struct does not contain field named "{name:s}"')
 
-        self._fields[idx] = (name, definition)
+        return type(self)(
+            flags = self._flags,
+            field_name = self._field_name,
+            type_name = self._type_name,
+            data_type = self._data_type,
+            base_type = self._base_type,
+            fields = [
+                (field_name, definition if field_name == name else field)
+                for field_name, field in self._fields
+            ],
+        )
 
     def as_packed(self) -> Dict:
         """
@@ -156,6 +163,16 @@ class DefinitionStruct(base.Definition):
 
         return base_type, data_type
 
+    @staticmethod
+    def _make_type_name(fields: List[Tuple[str, DefinitionABC]], arrayflags: Tuple[int, ...]) -> str:
+        """
+        Derived from layout, identical across processes
+        """
+
+        layout = tuple((name, definition.type_name, tuple(definition.flags)) for name, definition in fields) + arrayflags
+
+        return f'structtype_{get_hash_of_string(repr(layout))[:16]:s}'
+
     @classmethod
     def _from_data_type(
         cls,
@@ -182,7 +199,7 @@ class DefinitionStruct(base.Definition):
         structtype = cls(
             flags = flags,
             field_name = field_name,
-            type_name = f'structtype_{hash(tuple((name, definition.data_type) for name, definition in fields) + arrayflags):x}',
+            type_name = cls._make_type_name(fields, arrayflags),
             data_type = data_type,
             base_type = base_type,
             fields = fields,
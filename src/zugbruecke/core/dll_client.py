@@ -31,9 +31,11 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from typing import Union
+from contextlib import ExitStack
+from threading import Lock
+from typing import Iterable, List, Optional, Union
 
-from .abc import DataABC, DllClientABC, LogABC, RoutineClientABC, RpcClientABC
+from .abc import DataABC, DllClientABC, LogABC, RoutineClientABC, RpcClientABC, SignatureCacheABC
 from .routine_client import RoutineClient
 from .typeguard import typechecked
 
@@ -57,6 +59,8 @@ class DllClient(DllClientABC):
         log: LogABC,
         rpc_client: RpcClientABC,
         data: DataABC,
+        routines: Optional[List[Union[str, int]]] = None,  # already registered on the Wine side
+        signatures: Optional[SignatureCacheABC] = None,
     ):
 
         self._name = name
@@ -66,12 +70,16 @@ class DllClient(DllClientABC):
         self._log = log
         self._rpc_client = rpc_client
         self._data = data
+        self._signatures = signatures
 
         self._routines = {}
+        self._lock = Lock()  # routines may be registered from multiple threads
 
         for name in (
+            "configure_routines",
             "get_repr",
             "register_routine",
+            "register_routines",
         ):
             setattr(
                 self,
@@ -82,6 +90,9 @@ class DllClient(DllClientABC):
                 ),
             )
 
+        for name in (routines or []):
+            self._add_routine(name)
+
     def __getattr__(self, name: str) -> RoutineClientABC:
 
         if name in ("__objclass__", "__name__"):
@@ -103,15 +114,73 @@ class DllClient(DllClientABC):
 
         return self._get_repr_on_server()
 
-    def _register_routine(self, name: Union[str, int]):
+    def zb_configure_all(self):
+        """
+        Configures all routines which have been accessed but not called yet, in one round trip to the Wine side.
+        Routines are otherwise configured one by one on their first call.
+        """
 
-        self._log.info(f'[dll-client] Trying to register routine "{str(name):s}" in DLL file "{self._name:s}" ...')
+        with self._lock:
+            routines = {name: routine for name, routine in self._routines.items() if not routine.configured}
 
-        try:
-            self._register_routine_on_server(name)
-        except AttributeError as e:
-            self._log.info("[dll-client] ... failed!")
-            raise e
+        if len(routines) == 0:
+            return
+
+        with ExitStack() as stack:
+
+            for routine in routines.values():  # first calls in other threads wait, always locked in the same order
+                stack.enter_context(routine.lock)
+            routines = {name: routine for name, routine in routines.items() if not routine.configured}
+
+            if len(routines) == 0:
+                return
+
+            self._log.info(f'[dll-client] Configuring {len(routines):d} routine(s) in DLL file "{self._name:s}" ...')
+
+            packed = {name: routine.prepare_configuration() for name, routine in routines.items()}
+            batch = [(name, *packed[name]) for name in routines.keys() if packed[name] is not None]
+
+            if len(batch) > 0:
+                self._configure_routines_on_server(batch)
+
+            for routine in routines.values():
+                routine.set_configured()
+
+        if self._signatures is not None:
+            try:
+                self._signatures.flush()
+            except OSError:
+                self._log.warning(f"[dll-client] Signature cache could not be written: {self._signatures!r}")
+
+        self._log.info(f"[dll-client] ... configured, {len(routines) - len(batch):d} from signature cache.")
+
+    def zb_register(self, names: Iterable[Union[str, int]]):
+        """
+        Registers routines by name or ordinal in one round trip to the Wine side.
+        Routines are otherwise registered one by one when they are accessed for the first time.
+        """
+
+        with self._lock:
+
+            names = [name for name in dict.fromkeys(names) if name not in self._routines.keys()]
+
+            if len(names) == 0:
+                return
+
+            self._log.info(f'[dll-client] Trying to register {len(names):d} routine(s) in DLL file "{self._name:s}" ...')
+
+            try:
+                self._register_routines_on_server(names)
+            except AttributeError as e:
+                self._log.info("[dll-client] ... failed!")
+                raise e
+
+            for name in names:
+                self._add_routine(name)
+
+            self._log.info("[dll-client] ... registered (unconfigured).")
+
+    def _add_routine(self, name: Union[str, int]):
 
         self._routines[name] = RoutineClient(
             name,
@@ -121,6 +190,25 @@ class DllClient(DllClientABC):
             self._log,
             self._rpc_client,
             self._data,
+            self._signatures,
         )
 
+    def _register_routine(self, name: Union[str, int]):
+
+        with self._lock:
+            if name not in self._routines.keys():
+                self._register_routine_locked(name)
+
+    def _register_routine_locked(self, name: Union[str, int]):
+
+        self._log.info(f'[dll-client] Trying to register routine "{str(name):s}" in DLL file "{self._name:s}" ...')
+
+        try:
+            self._register_routine_on_server(name)
+        except AttributeError as e:
+            self._log.info("[dll-client] ... failed!")
+            raise e
+
+        self._add_routine(name)
+
         self._log.info("[dll-client] ... registered (unconfigured).")
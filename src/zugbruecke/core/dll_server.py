@@ -33,7 +33,7 @@ specific language governing rights and limitations under the License.
 
 from ctypes import CDLL
 import traceback
-from typing import Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from .abc import DataABC, DllServerABC, LogABC, RpcServerABC
 from .routine_server import RoutineServer
@@ -74,14 +74,50 @@ class DllServer(DllServerABC):
         self._routines = {}
 
         for name in (
+            "configure_routines",
             "get_repr",
             "register_routine",
+            "register_routines",
         ):
             self._rpc_server.register_function(
                 getattr(self, name),
                 f"{self._hash_id:s}_{name:s}",
             )
 
+    def configure_routines(self, batch: List[Tuple[Union[str, int], List[Dict], Optional[Dict], List[Dict]]]):
+        """
+        Called by DLL client. Configures many routines in one pass.
+        """
+
+        self._log.info(f'[dll-server] Configuring {len(batch):d} routine(s) in DLL file "{self._name:s}" ...')
+
+        for name, packed_argtypes, packed_restype, packed_memsyncs in batch:
+            self._routines[name].configure(packed_argtypes, packed_restype, packed_memsyncs)
+
+        self._log.info("[dll-server] ... done.")
+
+    def configure_signatures(self, batch: List[Tuple[Union[str, int], List[Dict], Optional[Dict], List[Dict]]]) -> List[Union[str, int]]:
+        """
+        Called at load time with packed definitions from signature cache. Registers and configures routines.
+        Routines which can not be configured are skipped, they are configured by the DLL client later.
+
+        Returns:
+            Names of configured routines
+        """
+
+        configured = []
+
+        for name, packed_argtypes, packed_restype, packed_memsyncs in batch:
+            try:
+                self.register_routine(name)
+                self._routines[name].configure(packed_argtypes, packed_restype, packed_memsyncs)
+            except Exception:
+                self._log.warning(f'[dll-server] Routine "{str(name):s}" could not be configured from signature cache.')
+                continue
+            configured.append(name)
+
+        return configured
+
     def get_repr(self) -> str:
         """
         Called by DLL client
@@ -125,3 +161,11 @@ class DllServer(DllServerABC):
         )
 
         self._log.info("[dll-server] ... done.")
+
+    def register_routines(self, names: List[Union[str, int]]):
+        """
+        Called by DLL client. Registers many routines in one pass.
+        """
+
+        for name in names:
+            self.register_routine(name)
@@ -56,5 +56,9 @@ class DataGroupError(DataError):
     pass
 
 
+class DataMemsyncChecksumError(DataError):
+    pass
+
+
 class DataMemsyncpathError(DataError):
     pass
@@ -32,17 +32,18 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import os
-from queue import Queue, Empty
 import signal
 import subprocess
 import time
-from typing import BinaryIO, Callable, Dict, Tuple
+from typing import BinaryIO, Callable, Dict, Optional
 from threading import Thread
 
 from wenv import EnvConfig
 
-from .abc import ConfigABC, InterpreterABC, LogABC
+from .abc import ConfigABC, InterpreterABC, LogABC, StartupTimerABC
+from .const import INTERPRETER_STREAM_CHUNK
 from .lib import get_free_port
+from .startup import StartupTimer
 from .typeguard import typechecked
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -54,14 +55,26 @@ from .typeguard import typechecked
 class Interpreter(InterpreterABC):
     """
     Class for managing Python interpreter on Wine
+
+    If ``standby`` is set, the server is started without a session.
+    It waits for a daemon to hand it to a session, see ``Daemon``.
     """
 
-    def __init__(self, session_id: str, parameter: ConfigABC, session_log: LogABC):
+    def __init__(
+        self,
+        session_id: str,
+        parameter: ConfigABC,
+        session_log: LogABC,
+        standby: bool = False,
+        startup: Optional[StartupTimerABC] = None,
+    ):
 
         # Set ID, parameters and pointer to log
         self._id = session_id
         self._p = parameter
         self._log = session_log
+        self._standby = standby
+        self._startup = StartupTimer() if startup is None else startup
 
         # Log status
         self._log.info("[interpreter] STARTING ...")
@@ -75,6 +88,19 @@ class Interpreter(InterpreterABC):
         # Log status
         self._log.info("[interpreter] STARTED.")
 
+    @property
+    def pid(self) -> int:
+
+        return self._proc_winepython.pid
+
+    def join(self):
+        """
+        Blocks until process has terminated on its own, then cleans up
+        """
+
+        self._wait(None)
+        self.terminate()
+
     # session destructor
     def terminate(self):
 
@@ -96,76 +122,72 @@ class Interpreter(InterpreterABC):
         # Session is down
         self._up = False
 
-    @staticmethod
-    def _stream_worker(in_stream: BinaryIO, out_queue: Queue):
-        """reads lines from stream and puts them into queue"""
+    def _stream_worker(self, in_stream: BinaryIO, processing_function: Callable):
+        """
+        reads from stream as soon as data arrives and processes complete lines,
+        blocks while there is nothing to read, ends once stream is closed
+        """
 
-        for line in iter(in_stream.readline, b""):
-            out_queue.put(line)
-        in_stream.close()
+        rest = b""
 
-    @staticmethod
-    def _start_stream_worker(
-        in_stream: BinaryIO, worker_function: Callable
-    ) -> Tuple[Thread, Queue]:
-        """starts reader thread and returns a thread object and a queue object"""
+        while True:
+            chunk = in_stream.read1(INTERPRETER_STREAM_CHUNK)
+            if len(chunk) == 0:
+                break
+            lines = (rest + chunk).split(b"\n")
+            rest = lines.pop()  # incomplete line, if any
+            for line in lines:
+                processing_function(line.decode("utf-8", errors="replace"))
 
-        out_queue = Queue()
-        reader_thread = Thread(target=worker_function, args=(in_stream, out_queue))
-        reader_thread.daemon = True
-        reader_thread.start()
-        return reader_thread, out_queue
+        if len(rest) > 0:
+            processing_function(rest.decode("utf-8", errors="replace"))
 
-    @staticmethod
-    def _read_stream(in_queue: Queue, processing_function: Callable):
-        """reads lines from queue and processes them"""
+        in_stream.close()
 
-        try:
-            line = in_queue.get_nowait()
-        except Empty:
-            pass
-        else:
-            line = line.decode("utf-8")
-            processing_function(line.strip("\n"))
-            in_queue.task_done()
+    def _start_stream_worker(self, in_stream: BinaryIO, processing_function: Callable) -> Thread:
+        """starts reader thread and returns thread object"""
 
-    def _processing_worker(self):
-        """reads lines from queues and puts them into process methods"""
+        reader_thread = Thread(target=self._stream_worker, args=(in_stream, processing_function))
+        reader_thread.daemon = True
+        reader_thread.start()
+        return reader_thread
 
-        # Log status
-        self._log.info("[interpreter] Starting log processing thread ...")
-
-        while self._is_alive():
-            time.sleep(0.1)
-            while not self._stdout_queue.empty():
-                self._read_stream(
-                    self._stdout_queue, lambda line: self._log.debug(f"[P] {line:s}")
-                )
-            while not self._stderr_queue.empty():
-                self._read_stream(
-                    self._stderr_queue, lambda line: self._log.error(f"[P] {line:s}")
-                )
+    def _process_stdout(self, line: str):
 
-        # Log status
-        self._log.info("[interpreter] Joining worker threads and queues ...")
+        self._log.debug(f"[P] {line:s}")
 
-        self._stdout_queue.join()
-        self._stderr_queue.join()
-        self._stdout_thread.join()
-        self._stderr_thread.join()
+    def _process_stderr(self, line: str):
 
-        # Log status
-        self._log.info("[interpreter] ... worker threads and queues joined.")
+        self._log.error(f"[P] {line:s}")
 
     def _is_alive(self) -> bool:
 
         return self._proc_winepython.poll() is None
 
+    def _wait(self, timeout: Optional[float]):
+        """blocks until process has terminated or timeout is over"""
+
+        try:
+            self._proc_winepython.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+
     def _set_cli_params(self):
 
         # Get socket for ctypes bridge
         self._p["port_socket_wine"] = get_free_port()
 
+        if self._standby:
+            # All other info is passed once a session attaches
+            self._p["server_cli_params"] = [
+                "-m",
+                "zugbruecke._server_",
+                "--standby",
+                "--port_socket_wine",
+                str(self._p["port_socket_wine"]),
+            ]
+            return
+
         # Prepare command with minimal meta info. All other info can be passed via sockets.
         self._p["server_cli_params"] = [
             "-m",
@@ -180,8 +202,12 @@ class Interpreter(InterpreterABC):
             str(self._p["log_level"]),
             "--log_write",
             str(int(self._p["log_write"])),
+            "--log_rotate",
+            str(self._p["log_rotate"]),
             "--timeout_start",
             str(int(self._p["timeout_start"])),
+            "--compile_plans",
+            str(int(self._p["compile_plans"])),
         ]
 
     def _get_env(self) -> Dict[str, str]:
@@ -199,8 +225,9 @@ class Interpreter(InterpreterABC):
 
     def _python_start(self):
 
-        self._set_cli_params()
-        env = self._get_env()
+        with self._startup.phase("spawn_environ"):
+            self._set_cli_params()
+            env = self._get_env()
 
         # Log status
         self._log.info(f'[interpreter] Command: {" ".join(self._p["server_cli_params"]):s}')
@@ -209,15 +236,16 @@ class Interpreter(InterpreterABC):
         self._log.info(f"[interpreter] Environment: {str(env):s}")
 
         # Fire up Wine-Python process
-        self._proc_winepython = subprocess.Popen(
-            ["wenv", "python", "-u"] + self._p["server_cli_params"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=False,
-            start_new_session=True,
-            close_fds=True,
-            env=env,
-        )
+        with self._startup.phase("spawn_popen"):
+            self._proc_winepython = subprocess.Popen(
+                ["wenv", "python", "-u"] + self._p["server_cli_params"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                shell=False,
+                start_new_session=True,
+                close_fds=True,
+                env=env,
+            )
 
         # Status log
         self._log.info(f"[interpreter] Started with PID {self._proc_winepython.pid:d}.")
@@ -225,44 +253,25 @@ class Interpreter(InterpreterABC):
         # Log status
         self._log.info("[interpreter] Starting stream reader threads ...")
 
-        # Start worker threads and queues for reading from streams
-        (
-            self._stdout_thread,
-            self._stdout_queue,
-        ) = self._start_stream_worker(self._proc_winepython.stdout, self._stream_worker)
-        (
-            self._stderr_thread,
-            self._stderr_queue,
-        ) = self._start_stream_worker(self._proc_winepython.stderr, self._stream_worker)
+        # Start worker threads for reading from streams and pushing lines into log
+        with self._startup.phase("spawn_streams"):
+            self._stdout_thread = self._start_stream_worker(self._proc_winepython.stdout, self._process_stdout)
+            self._stderr_thread = self._start_stream_worker(self._proc_winepython.stderr, self._process_stderr)
 
         # Log status
         self._log.info("[interpreter] Stream reader threads started.")
 
-        # Start processing thread for pushing lines into log
-        self._processing_thread = Thread(target=self._processing_worker)
-        self._processing_thread.daemon = True
-        self._processing_thread.start()
-
-        # Log status
-        self._log.info("[interpreter] Log processing thread started.")
-
     def _python_stop(self):
 
         self._log.info("[interpreter] Ensure process has terminated, waiting ...")
 
-        # Time-step
-        wait_for_seconds = 0.01
         # Timeout
         timeout_after_seconds = self._p["timeout_stop"]
 
         # Start waiting at ...
         started_waiting_at = time.time()
         # Wait for process
-        while (
-            self._is_alive()
-            and started_waiting_at + timeout_after_seconds > time.time()
-        ):
-            time.sleep(wait_for_seconds)
+        self._wait(timeout_after_seconds)
         # Is process still alive?
         if self._is_alive():
             self._log.warning(f"[interpreter] ... did not terminate after {timeout_after_seconds:d} seconds, sending SIGINT ...")
@@ -274,11 +283,7 @@ class Interpreter(InterpreterABC):
         # Start waiting at ...
         started_waiting_at = time.time()
         # Wait for process
-        while (
-            self._is_alive()
-            and started_waiting_at + timeout_after_seconds > time.time()
-        ):
-            time.sleep(wait_for_seconds)
+        self._wait(timeout_after_seconds)
         # Is process still alive?
         if self._is_alive():
             self._log.warning(f"[interpreter] ... did not terminate after {timeout_after_seconds:d} seconds, sending SIGTERM ...")
@@ -299,13 +304,15 @@ class Interpreter(InterpreterABC):
 
         timeout_after_seconds = self._p["timeout_stop"]
 
-        self._log.info("[interpreter] Joining processing thread ...")
+        self._log.info("[interpreter] Joining stream reader threads ...")
 
-        # Joining thread ...
-        self._processing_thread.join(timeout=timeout_after_seconds)
-        if self._processing_thread.is_alive():
-            self._log.error("[interpreter] ... failed to join thread!")
-            raise TimeoutError("processing thread could not be terminated")
+        # Joining threads, they end once the streams are closed
+        started_waiting_at = time.time()
+        for thread in (self._stdout_thread, self._stderr_thread):
+            thread.join(timeout=max(0.0, started_waiting_at + timeout_after_seconds - time.time()))
+            if thread.is_alive():
+                self._log.error("[interpreter] ... failed to join thread!")
+                raise TimeoutError("stream reader thread could not be terminated")
 
         # Log status
         self._log.info("[interpreter] ... joined.")
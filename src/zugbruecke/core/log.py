@@ -31,15 +31,33 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from collections import deque
 import json
+import os
 from logging import NOTSET, DEBUG, INFO, WARNING, ERROR, CRITICAL
 from pprint import pformat
 import sys
+from threading import Condition, Thread
 import time
-from typing import Any, List, Union
-
-from .abc import ConfigABC, LogABC, MessageABC, RpcClientABC, RpcServerABC
-from .const import PLATFORMS
+from typing import Any, Callable, List, Tuple, Union
+
+from .abc import (
+    ConfigABC,
+    LogABC,
+    LogShipperABC,
+    LogWriterABC,
+    MessageABC,
+    RpcClientABC,
+    RpcServerABC,
+)
+from .const import (
+    LOG_BATCH_SIZE,
+    LOG_FLUSH_INTERVAL,
+    LOG_QUEUE_SIZE,
+    LOG_WRITE_BUFFER,
+    LOG_WRITE_INTERVAL,
+    PLATFORMS,
+)
 from .typeguard import typechecked
 
 
@@ -86,15 +104,46 @@ class Log(LogABC):
         self._p = parameter
 
         self._up = True
+        self._level = NOTSET
+        self.refresh()
 
-        self._f = f'zb_{self._id:s}_{self._p["platform"]:s}.txt'
+        self._writer = LogWriter(
+            f'zb_{self._id:s}_{self._c.platform:s}.txt',
+            rotate = self._c.log_rotate,
+        )
 
         if rpc_server is not None:
-            rpc_server.register_function(self._receive, "transfer_message")
-        self._transfer_message = (
-            rpc_client.transfer_message if rpc_client is not None else None
+            rpc_server.register_function(self._receive, "transfer_messages")
+        self._transfer_messages = (
+            rpc_client.transfer_messages if rpc_client is not None else None
+        )
+        self._shipper = (
+            LogShipper(self._transfer_messages) if rpc_client is not None else None
         )
 
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Cheap check whether messages of a given level are processed.
+        Allows to skip building messages on hot paths.
+        """
+
+        return self._level != NOTSET and level >= self._level
+
+    def set_level(self, level: int):
+        """
+        Must be called if ``log_level`` changes, the configured value is cached
+        """
+
+        self._level = level
+
+    def refresh(self):
+        """
+        Must be called if the configuration changes, resolved values are cached in a snapshot
+        """
+
+        self._c = self._p.snapshot()
+        self.set_level(self._c.log_level)
+
     def debug(self, *raw_messages: Any):
 
         self._process_raw(*raw_messages, pipe="out", level=DEBUG)
@@ -122,37 +171,256 @@ class Log(LogABC):
 
         self._up = False
 
+        if self._shipper is not None:
+            self._shipper.terminate()
+
+        self._writer.terminate()
+
     def _process_raw(self, *raw_messages: Any, pipe: str, level: int = NOTSET):
 
-        if self._p["log_level"] == NOTSET:
-            return
-        if level < self._p["log_level"]:
+        if self._level == NOTSET or level < self._level:
             return
 
         for raw_message in raw_messages:
             for message in Message.from_raw(
-                raw_message, pipe, level, self._id, self._p["platform"]
+                raw_message, pipe, level, self._id, self._c.platform
             ):
                 self._process(message)
 
     def _process(self, message: MessageABC):
 
-        if self._p["std" + message.pipe]:
+        if (self._c.stdout if message.pipe == "out" else self._c.stderr):
             message.print()
 
-        if self._transfer_message is not None:
+        if self._transfer_messages is not None:
             self._send(message)
 
-        if self._p["log_write"]:
-            message.store(self._f)
+        if self._c.log_write:
+            message.store(self._writer)
 
     def _send(self, message: MessageABC):
 
-        self._transfer_message(message.as_serialized())
+        serialized_message = message.as_serialized()
+
+        if not self._shipper.put(serialized_message):  # after termination, ship directly
+            self._transfer_messages([serialized_message], 0)
+
+    def _receive(self, serialized_messages: List[str], dropped: int):
+
+        if dropped > 0:
+            self.warning(f"[log] {dropped:d} message(s) from other side dropped due to overload.")
+
+        for serialized_message in serialized_messages:
+            self._process(Message.from_serialized(serialized_message))
+
+
+@typechecked
+class LogShipper(LogShipperABC):
+    """
+    Ships serialized log messages in batches from a background thread
+
+    Logging does not wait for round trips to the other side. Messages are queued and
+    shipped periodically or once enough of them are waiting, whichever comes first.
+    The background thread talks to the other side through its own connection.
+    The queue is bounded. If it is full, the oldest messages are dropped and counted.
+
+    Args:
+        send : ships a list of serialized messages and the number of dropped messages
+        size : maximum number of waiting messages
+        batch : number of waiting messages which triggers shipping
+        interval : seconds between shipping waiting messages
+    """
+
+    def __init__(
+        self,
+        send: Callable,
+        size: int = LOG_QUEUE_SIZE,
+        batch: int = LOG_BATCH_SIZE,
+        interval: float = LOG_FLUSH_INTERVAL,
+    ):
+
+        self._send = send
+        self._queue = deque(maxlen = size)
+        self._batch = batch
+        self._interval = interval
+        self._dropped = 0
+
+        self._up = True
+        self._condition = Condition()
+        self._thread = Thread(target = self._run, daemon = True)
+        self._thread.start()
+
+    def __repr__(self) -> str:
+
+        return f'<LogShipper waiting={len(self._queue):d} dropped={self._dropped:d} up={self._up}>'
+
+    def put(self, serialized_message: str) -> bool:
+        """
+        Queues a message for shipping
+
+        Returns:
+            ``False`` if the shipper has been terminated and the message was not queued
+        """
+
+        with self._condition:
+            if not self._up:
+                return False
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped += 1  # deque drops oldest message
+            self._queue.append(serialized_message)
+            if len(self._queue) >= self._batch:
+                self._condition.notify()
+
+        return True
+
+    def terminate(self):
+        """
+        Ships all waiting messages and stops the background thread
+        """
+
+        with self._condition:
+            if not self._up:
+                return
+            self._up = False
+            self._condition.notify()
+
+        self._thread.join()
+
+    def _run(self):
 
-    def _receive(self, serialized_message: str):
+        while True:
+
+            with self._condition:
+                if self._up and len(self._queue) < self._batch:
+                    self._condition.wait(self._interval)
+                up = self._up
+                messages, dropped = self._take()
+
+            if len(messages) > 0 or dropped > 0:
+                try:
+                    self._send(messages, dropped)
+                except Exception:
+                    pass  # other side is gone, messages can not be delivered
+
+            if not up:
+                return
+
+    def _take(self) -> Tuple[List[str], int]:
+
+        messages = list(self._queue)
+        self._queue.clear()
+        dropped, self._dropped = self._dropped, 0
+
+        return messages, dropped
+
+
+@typechecked
+class LogWriter(LogWriterABC):
+    """
+    Writes serialized log messages to a file, one per line
+
+    The file is opened on the first message and kept open. Messages are buffered
+    and written once the buffer is full or the flush interval is over, whichever comes first.
+    A background thread, started along with the file, writes the buffer periodically.
+    Termination flushes the buffer and closes the file. Messages arriving after termination
+    are written directly. If rotation is enabled and the file exceeds the given size,
+    it is renamed by appending ``.1`` to its name, replacing an older one, and a new file is started.
+
+    Args:
+        fn : name of log file
+        interval : maximum seconds messages are buffered
+        rotate : size of log file in bytes which triggers rotation, ``0`` for no rotation
+    """
+
+    def __init__(self, fn: str, interval: float = LOG_WRITE_INTERVAL, rotate: int = 0):
+
+        self._fn = fn
+        self._interval = interval
+        self._rotate = rotate
+
+        self._up = True
+        self._condition = Condition()
+        self._thread = None
+        self._f = None
+        self._size = 0
+
+    def __repr__(self) -> str:
+
+        return f'<LogWriter fn="{self._fn:s}" open={self._f is not None} up={self._up}>'
+
+    def write(self, serialized_message: str):
+        """
+        Writes a message, buffered
+        """
+
+        line = serialized_message + "\n"
+
+        with self._condition:
+
+            if not self._up:
+                with open(self._fn, mode = "a", encoding = "utf-8") as f:
+                    f.write(line)
+                return
+
+            if self._f is None:
+                self._open()
+
+            self._f.write(line)
+            self._size += len(line.encode("utf-8"))  # bytes, not characters
+
+            if self._rotate > 0 and self._size >= self._rotate:
+                self._close()
+                os.replace(self._fn, f"{self._fn:s}.1")
+
+    def flush(self):
+        """
+        Writes all buffered messages
+        """
+
+        with self._condition:
+            if self._f is not None:
+                self._f.flush()
+
+    def terminate(self):
+        """
+        Writes all buffered messages, closes the file and stops the background thread
+        """
+
+        with self._condition:
+            if not self._up:
+                return
+            self._up = False
+            self._close()
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def _open(self):
+
+        self._f = open(self._fn, mode = "a", encoding = "utf-8", buffering = LOG_WRITE_BUFFER)
+        self._size = os.fstat(self._f.fileno()).st_size
+
+        if self._thread is None:
+            self._thread = Thread(target = self._run, daemon = True)
+            self._thread.start()
+
+    def _run(self):
+
+        with self._condition:
+            while self._up:
+                self._condition.wait(self._interval)
+                if self._f is not None:
+                    self._f.flush()
+
+    def _close(self):
+
+        if self._f is None:
+            return
 
-        self._process(Message.from_serialized(serialized_message))
+        self._f.close()
+        self._f = None
+        self._size = 0
 
 
 @typechecked
@@ -228,10 +496,9 @@ class Message(MessageABC):
         pipe = sys.stdout if self._pipe == "out" else sys.stderr
         pipe.write(msg)
 
-    def store(self, fn):
+    def store(self, writer: LogWriterABC):
 
-        with open(fn, mode="a+", encoding="utf-8") as f:
-            f.write(self.as_serialized() + "\n")
+        writer.write(self.as_serialized())
 
     @property
     def pipe(self) -> str:
@@ -31,9 +31,11 @@ specific language governing rights and limitations under the License.
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import ctypes
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import zlib
 
-from .abc import MempkgABC
+from .abc import MempkgABC, SharedArenaABC
+from .errors import DataMemsyncChecksumError
 from .typeguard import typechecked
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -48,29 +50,39 @@ class Mempkg(MempkgABC):
 
     def __init__(
         self,
-        data: bytes,  # serialized data, '' if NULL pointer
+        data: Optional[bytes],  # serialized data, '' if NULL pointer, None if not shipped
         local_addr: Optional[int],  # local pointer address as integer
         remote_addr: Optional[int],  # remote pointer has not been initialized
         wchar: Optional[int],  # local length of Unicode wchar if required
         ptr: Optional[Any] = None,  # original ctypes pointer to avoid garbage collection on client
+        shared: Optional[Tuple[str, int]] = None,  # name of shared segment and offset, data is not copied
+        shared_addr: Optional[int] = None,  # local address of shared memory
+        length: Optional[int] = None,  # number of bytes, required if data is not shipped
+        delta: Optional[List[Tuple[int, bytes]]] = None,  # changed ranges instead of data
+        checksum: Optional[int] = None,  # CRC32 of data after applying delta
     ):
 
         self._data = data
+        self._length = len(data) if data is not None else length
         self._local_addr = local_addr
         self._remote_addr = remote_addr
         self._wchar = wchar
         self._ptr = ptr
+        self._shared = shared
+        self._shared_addr = shared_addr
+        self._delta = delta
+        self._checksum = checksum
 
     def __repr__(self) -> str:
 
-        return f'<Mempkg len={len(self):d} local_addr={self._local_addr:x} remote_addr={self._remote_addr:x}>'
+        return f'<Mempkg len={len(self):d} local_addr={self._local_addr} remote_addr={self._remote_addr} shared={self._shared}>'
 
     def __len__(self) -> int:
 
-        return len(self._data)
+        return self._length
 
     @property
-    def data(self) -> bytes:
+    def data(self) -> Optional[bytes]:
 
         return self._data
 
@@ -94,6 +106,11 @@ class Mempkg(MempkgABC):
 
         return self._wchar
 
+    @property
+    def shared(self) -> Optional[Tuple[str, int]]:
+
+        return self._shared
+
     @staticmethod
     def _adjust_wchar_length(mempkg: Dict):
         """
@@ -111,6 +128,11 @@ class Mempkg(MempkgABC):
         if old_len == new_len:
             return
 
+        if mempkg["data"] is None:
+            mempkg["length"] = mempkg["length"] * new_len // old_len
+            mempkg["wchar"] = new_len
+            return
+
         tmp = bytearray(len(mempkg["data"]) * new_len // old_len)
 
         for index in range(old_len if new_len > old_len else new_len):
@@ -124,6 +146,15 @@ class Mempkg(MempkgABC):
         Generate pointer around data
         """
 
+        if self._shared_addr is not None:
+            return ctypes.c_void_p(self._shared_addr)  # both sides see the same memory
+
+        if self._data is None:  # contents were not shipped, allocate empty memory
+            return ctypes.cast(
+                ctypes.pointer((ctypes.c_ubyte * len(self))()),
+                ctypes.c_void_p,
+            )
+
         return ctypes.cast(
             ctypes.pointer((ctypes.c_ubyte * len(self)).from_buffer_copy(self._data)),
             ctypes.c_void_p,
@@ -134,6 +165,13 @@ class Mempkg(MempkgABC):
         Write data to local address
         """
 
+        if self._delta is not None:
+            self._overwrite_delta()
+            return
+
+        if self._shared is not None or self._data is None:
+            return  # both sides see the same memory or contents were not shipped
+
         ctypes.memmove(
             ctypes.c_void_p(self._local_addr),
             ctypes.pointer((ctypes.c_ubyte * len(self)).from_buffer_copy(self._data)),
@@ -149,15 +187,81 @@ class Mempkg(MempkgABC):
         """
 
         self._data = other.data
+        self._length = len(other)
         self._local_addr = other.local_addr
         self._remote_addr = other.remote_addr
         self._wchar = other.wchar
+        self._shared = other.shared
+        self._shared_addr = other._shared_addr
+        self._delta = other._delta
+        self._checksum = other._checksum
+
+    def _overwrite_delta(self):
+        """
+        Write changed ranges to local address, verify result
+        """
+
+        for offset, data in self._delta:
+            ctypes.memmove(self._local_addr + offset, data, len(data))
+
+        checksum = zlib.crc32(
+            ctypes.cast(
+                ctypes.c_void_p(self._local_addr),
+                ctypes.POINTER(ctypes.c_ubyte * len(self)),
+            ).contents
+        )
+
+        if checksum != self._checksum:
+            raise DataMemsyncChecksumError("memory differs between sides after applying changes")
+
+    def update_delta(self, chunk_size: int):
+        """
+        Update data from local address, but only keep chunks which differ from previous data
+
+        Args:
+            - chunk_size: Granularity of comparison in bytes
+        """
+
+        old = self._data
+
+        self.update_data()
+
+        if old is None or self._data is None or len(old) != len(self._data):
+            return  # no previous data to compare against
+
+        new = self._data
+        delta = []
+        start = None  # start of current range of changed chunks
+
+        for offset in range(0, len(new), chunk_size):
+            if old[offset : offset + chunk_size] != new[offset : offset + chunk_size]:
+                if start is None:
+                    start = offset
+            elif start is not None:
+                delta.append((start, new[start : offset]))
+                start = None
+        if start is not None:
+            delta.append((start, new[start:]))
+
+        self._delta = delta
+        self._checksum = zlib.crc32(new)
+        self._data = None
+
+    def drop_data(self):
+        """
+        Do not ship data
+        """
+
+        self._data = None
 
     def update_data(self):
         """
         Update data from local address
         """
 
+        if self._shared is not None:
+            return  # both sides see the same memory
+
         self._data = bytes(
             ctypes.cast(
                 ctypes.c_void_p(self._local_addr),
@@ -175,12 +279,16 @@ class Mempkg(MempkgABC):
             'local_addr': self._local_addr,
             'remote_addr': self._remote_addr,
             'wchar': self._wchar,
+            'shared': self._shared,
+            'length': self._length if self._data is None else None,
+            'delta': self._delta,
+            'checksum': self._checksum,
         }
 
     @classmethod
-    def from_packed(cls, packed: Dict):
+    def from_packed(cls, packed: Dict, arena: Optional[SharedArenaABC] = None):
         """
-        Unpack from shipping, fix wchar size, swap addresses
+        Unpack from shipping, fix wchar size, swap addresses, locate shared memory
         """
 
         packed.update({
@@ -191,10 +299,20 @@ class Mempkg(MempkgABC):
         if packed.get('wchar', None) is not None:
             cls._adjust_wchar_length(packed)
 
+        if packed.get('shared', None) is not None:
+            packed['shared_addr'] = arena.resolve(*packed['shared'])
+
         return cls(**packed)
 
     @classmethod
-    def from_pointer(cls, ptr: Any, length: int, wchar: Optional[int]):
+    def from_pointer(
+        cls,
+        ptr: Any,
+        length: int,
+        wchar: Optional[int],
+        arena: Optional[SharedArenaABC] = None,
+        copy: bool = True,
+    ):
         """
         Generate package from ctypes pointer
 
@@ -202,15 +320,44 @@ class Mempkg(MempkgABC):
             - ptr: ctypes pointer
             - length: number of bytes
             - wchar: length of wchar on platform
+            - arena: shared memory, if memory is found in there it is not copied
+            - copy: ship contents of memory
         """
 
+        local_addr = ctypes.cast(ptr, ctypes.c_void_p).value
+
+        # Unicode strings are converted between platforms and can therefore not be shared
+        shared = None if arena is None or wchar is not None else arena.locate(local_addr, length)
+
+        if shared is not None:
+            return cls(
+                data = None,
+                local_addr = local_addr,
+                remote_addr = None,
+                wchar = wchar,
+                ptr = ptr,
+                shared = shared,
+                shared_addr = local_addr,
+                length = length,
+            )
+
+        if not copy:
+            return cls(
+                data = None,
+                local_addr = local_addr,
+                remote_addr = None,
+                wchar = wchar,
+                ptr = ptr,
+                length = length,
+            )
+
         return cls(
             data = bytes(
                 ctypes.cast(
                     ptr, ctypes.POINTER(ctypes.c_ubyte * length)
                 ).contents
             ),
-            local_addr = ctypes.cast(ptr, ctypes.c_void_p).value,
+            local_addr = local_addr,
             remote_addr = None,
             wchar = wchar,
             ptr = ptr,
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/plan.py: Per-routine marshalling plans
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from functools import partial
+import struct
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from .abc import DataABC, DefinitionMemsyncABC, PlanABC
+from .const import FUNC_GROUP, SIMPLE_GROUP
+from .definitions import Definition
+from .memory import strip_simplecdata
+from .typeguard import typechecked
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+# ctypes type codes of fundamental types and their struct format characters, standard sizes.
+# The size of long differs between Unix and Windows, it is always shipped as 64 bit integer.
+_FAST_FORMATS = {
+    "?": "?",
+    "c": "c",
+    "b": "b",
+    "B": "B",
+    "h": "h",
+    "H": "H",
+    "i": "i",
+    "I": "I",
+    "l": "q",
+    "L": "Q",
+    "q": "q",
+    "Q": "Q",
+    "f": "f",
+    "d": "d",
+}
+_FAST_RETVAL_DEFAULT = "q"  # no restype, i.e. ctypes' default c_int
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _void(item: Any) -> None:
+
+    return None
+
+
+def _is_plain(definition: Definition) -> bool:
+    """
+    Fundamental data type, passed by value
+    """
+
+    return (
+        definition.GROUP == SIMPLE_GROUP
+        and definition.is_scalar
+        and len(definition.flags) == 0
+        and not definition.is_void
+    )
+
+
+def _get_fast_format(definition: Definition) -> Optional[str]:
+    """
+    struct format character of a fundamental data type passed by value, if there is one
+    """
+
+    if not _is_plain(definition):
+        return None
+
+    return _FAST_FORMATS.get(getattr(definition.base_type, "_type_", None))
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS: Plan
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Plan(PlanABC):
+    """
+    Marshalling plan of one routine, built once its definitions are known
+
+    The generic code paths in ``Data`` inspect every definition on every call.
+    A compiled plan does this once: Every argument and the return value are mapped to
+    a specialized function up front. Fundamental data types passed by value are handled
+    directly, everything else is delegated to ``Data``. Arguments which can not change
+    during a call are not synced back. Variadic calls fall back to the generic code path.
+
+    If all arguments and the return value are fundamental data types passed by value
+    and there is nothing to memsync, the plan also offers a binary fast path: Arguments
+    and return value are encoded in fixed-layout byte strings via ``struct``.
+
+    A plan which is not compiled simply forwards to the generic code paths in ``Data``.
+
+    Args:
+        data : Packing and unpacking of arguments and return values
+        argtypes : zugbruecke argtype definitions, memsync already applied
+        restype : zugbruecke restype definition, memsync already applied
+        memsyncs : memsync definitions
+        convention : name of calling convention, ``None`` for callback routines
+        compile : specialize for argtypes, restype and memsyncs
+    """
+
+    def __init__(
+        self,
+        data: DataABC,
+        argtypes: List[Definition],
+        restype: Optional[Definition],
+        memsyncs: List[DefinitionMemsyncABC],
+        convention: Optional[str],
+        compile: bool = True,
+    ):
+
+        self._data = data
+        self._argtypes = argtypes
+        self._restype = restype
+        self._convention = convention
+        self._length = len(argtypes)
+
+        self._compiled = compile
+        self._memsyncs = memsyncs if len(memsyncs) > 0 or not compile else None
+
+        self._fast_args = self._fast_retval = None
+
+        if not compile:
+            self._packers = self._unpackers = self._syncers = None
+            self._pack_retval = partial(data.pack_retval, restype = restype)
+            self._unpack_retval = partial(data.unpack_retval, restype = restype)
+            return
+
+        self._packers = [self._compile_pack(argtype) for argtype in argtypes]
+        self._unpackers = [self._compile_unpack(argtype) for argtype in argtypes]
+        self._syncers = [
+            (index, unpacker, syncer)
+            for index, (unpacker, syncer) in enumerate(zip(
+                self._unpackers,
+                (self._compile_sync(argtype) for argtype in argtypes),
+            ))
+            if syncer is not None
+        ]
+        self._pack_retval = self._compile_pack_retval(restype)
+        self._unpack_retval = self._compile_unpack_retval(restype)
+
+        if self._memsyncs is None:
+            self._compile_fast(argtypes, restype)
+
+    def __repr__(self) -> str:
+
+        return f'<Plan compiled={self._compiled} args={self._length:d} memsyncs={self._memsyncs is not None} fast={self.fast}>'
+
+    @property
+    def compiled(self) -> bool:
+
+        return self._compiled
+
+    @property
+    def fast(self) -> bool:
+        """
+        Binary fast path is available
+        """
+
+        return self._fast_args is not None
+
+    @property
+    def memsyncs(self) -> Optional[List[DefinitionMemsyncABC]]:
+        """
+        memsync definitions or ``None`` if memory does not have to be synced
+        """
+
+        return self._memsyncs
+
+    def pack_args(self, args: List[Any]) -> List[Any]:
+        """
+        Args:
+            - args: raw arguments
+        Returns:
+            Packed list of arguments for shipping
+        """
+
+        if self._packers is None or len(args) != self._length:
+            return self._data.pack_args(args, self._argtypes, self._convention)
+
+        return [pack(arg) for pack, arg in zip(self._packers, args)]
+
+    def unpack_args(self, args: List[Any]) -> List[Any]:
+        """
+        Args:
+            - args: packed list of arguments from shipping
+        Returns:
+            Raw arguments
+        """
+
+        if self._unpackers is None or len(args) != self._length:
+            return self._data.unpack_args(args, self._argtypes, self._convention)
+
+        return [unpack(arg) for unpack, arg in zip(self._unpackers, args)]
+
+    def sync_args(self, old_args: List[Any], packed_args: List[Any]):
+        """
+        Args:
+            - old_args: raw arguments
+            - packed_args: packed list of arguments from shipping
+        Returns:
+            Nothing
+        """
+
+        if self._syncers is None or len(packed_args) != self._length:
+            self._data.sync_args(
+                old_args,
+                self._data.unpack_args(packed_args, self._argtypes, self._convention),
+                self._argtypes,
+            )
+            return
+
+        for index, unpack, sync in self._syncers:
+            sync(old_args[index], unpack(packed_args[index]))
+
+    def pack_retval(self, value: Any) -> Any:
+        """
+        Args:
+            - value: raw return value
+        Returns:
+            Packed return value for shipping
+        """
+
+        return self._pack_retval(value)
+
+    def unpack_retval(self, value: Any) -> Any:
+        """
+        Args:
+            - value: packed return value from shipping
+        Returns:
+            Raw return value
+        """
+
+        return self._unpack_retval(value)
+
+    def pack_fast_args(self, args: List[Any]) -> Optional[bytes]:
+        """
+        Args:
+            - args: raw arguments
+        Returns:
+            Arguments encoded for the fast path or ``None`` if they require the regular path
+        """
+
+        if len(args) != self._length:
+            return None  # variadic or wrong number of arguments
+
+        try:
+            return self._fast_args.pack(*(strip_simplecdata(arg) for arg in args))
+        except (struct.error, OverflowError):
+            return None  # out of range or wrong type, let ctypes handle it
+
+    def unpack_fast_args(self, args: bytes) -> List[Any]:
+        """
+        Args:
+            - args: arguments encoded for the fast path
+        Returns:
+            Raw arguments
+        """
+
+        return list(self._fast_args.unpack(args))
+
+    def unpack_fast_args_many(self, args: bytes) -> Iterator[Tuple[Any, ...]]:
+        """
+        Args:
+            - args: concatenated arguments of many calls encoded for the fast path
+        Returns:
+            Iterator over tuples of raw arguments
+        """
+
+        return self._fast_args.iter_unpack(args)
+
+    def pack_fast_retval(self, value: Any) -> bytes:
+        """
+        Args:
+            - value: raw return value
+        Returns:
+            Return value encoded for the fast path
+        """
+
+        return self._fast_retval.pack(value)
+
+    def unpack_fast_retval(self, value: bytes) -> Any:
+        """
+        Args:
+            - value: return value encoded for the fast path
+        Returns:
+            Raw return value
+        """
+
+        return self._fast_retval.unpack(value)[0]
+
+    def unpack_fast_retvals(self, values: bytes) -> List[Any]:
+        """
+        Args:
+            - values: concatenated return values of many calls encoded for the fast path
+        Returns:
+            Raw return values
+        """
+
+        return [value for value, in self._fast_retval.iter_unpack(values)]
+
+    def _compile_fast(self, argtypes: List[Definition], restype: Optional[Definition]):
+
+        formats = [_get_fast_format(argtype) for argtype in argtypes]
+        if any(fmt is None for fmt in formats):
+            return
+
+        if restype is None:
+            retval_format = _FAST_RETVAL_DEFAULT
+        else:
+            retval_format = _get_fast_format(restype)
+            if retval_format is None:
+                return
+
+        self._fast_args = struct.Struct("<" + "".join(formats))
+        self._fast_retval = struct.Struct("<" + retval_format)
+
+    def _compile_pack(self, argtype: Definition) -> Callable:
+
+        if _is_plain(argtype):
+            return strip_simplecdata
+        if argtype.is_void:
+            return _void
+
+        return partial(self._data._pack_item, itemtype = argtype)
+
+    def _compile_unpack(self, argtype: Definition) -> Callable:
+
+        if _is_plain(argtype):
+            return argtype.base_type
+        if argtype.is_void:
+            return _void
+
+        return partial(self._data._unpack_item, itemtype = argtype)
+
+    def _compile_sync(self, argtype: Definition) -> Optional[Callable]:
+
+        # Values passed by value, void pointers (handled by memsync) and functions do not change
+        if _is_plain(argtype) or argtype.is_void:
+            return None
+        if argtype.GROUP == FUNC_GROUP and argtype.is_scalar:
+            return None
+
+        return partial(self._data._sync_arg, argtype = argtype)
+
+    def _compile_pack_retval(self, restype: Optional[Definition]) -> Callable:
+
+        if restype is None or _is_plain(restype):
+            return strip_simplecdata  # also handles None
+
+        return partial(self._data.pack_retval, restype = restype)
+
+    def _compile_unpack_retval(self, restype: Optional[Definition]) -> Callable:
+
+        if restype is None:
+            return lambda value: value
+
+        if not _is_plain(restype):
+            return partial(self._data.unpack_retval, restype = restype)
+
+        base_type = restype.base_type
+
+        def unpack_retval(value: Any) -> Any:
+            if value is None:
+                return None
+            # ctypes returns plain Python data types for fundamental return values
+            return strip_simplecdata(base_type(value))
+
+        return unpack_retval
@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/pool.py: A pool of sessions, spreading calls across Wine Python processes
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from ctypes import DEFAULT_MODE, LibraryLoader
+from itertools import count, islice
+from threading import Lock
+from types import TracebackType
+from typing import Any, Dict, Generator, Hashable, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from .abc import CtypesSessionABC, SessionPoolABC
+from .config import Config
+from .const import MAP_CHUNK_SIZE, POOL_AFFINITY_SIZE, SCHEDULES
+from .session import CtypesSession
+from .typeguard import typechecked
+from .wenv import Env
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# DLL AND ROUTINE WRAPPERS, BOUND TO POOL
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class _PoolRoutine:
+    """
+    One routine, present in every session of a pool.
+    ``argtypes``, ``restype`` and ``memsync`` are applied to all sessions.
+    """
+
+    def __init__(self, pool: SessionPoolABC, name: Union[str, int], routines: List[Any]):
+
+        self._pool = pool
+        self._name = name
+        self._routines = routines
+
+    def __repr__(self) -> str:
+
+        return f'<SessionPool.routine name={str(self._name):s} sessions={len(self._routines):d}>'
+
+    def __call__(self, *args: Any, zb_affinity: Optional[Hashable] = None) -> Any:
+        """
+        Calls the routine in one of the pool's sessions
+
+        args:
+            args : Arguments of the routine
+            zb_affinity : Optional key. All calls with the same key go to the same session.
+        """
+
+        index = self._pool._acquire(zb_affinity)
+        try:
+            return self._routines[index](*args)
+        finally:
+            self._pool._release(index)
+
+    def zb_submit(self, *args: Any, zb_affinity: Optional[Hashable] = None) -> Future:
+        """
+        Calls the routine in one of the pool's sessions without waiting for it to return
+
+        args:
+            args : Arguments of the routine
+            zb_affinity : Optional key. All calls with the same key go to the same session.
+        returns:
+            ``concurrent.futures.Future``, resolving to the return value of the routine
+        """
+
+        index = self._pool._acquire(zb_affinity)
+        try:
+            future = self._routines[index].zb_submit(*args)
+        except Exception as e:
+            self._pool._release(index)
+            raise e
+        future.add_done_callback(lambda _: self._pool._release(index))
+
+        return future
+
+    async def zb_acall(self, *args: Any, zb_affinity: Optional[Hashable] = None) -> Any:
+        """
+        Calls the routine in one of the pool's sessions and awaits its return value
+
+        args:
+            args : Arguments of the routine
+            zb_affinity : Optional key. All calls with the same key go to the same session.
+        returns:
+            Return value of the routine
+        """
+
+        import asyncio  # deferred, only required by coroutines, expensive to import
+
+        return await asyncio.wrap_future(self.zb_submit(*args, zb_affinity = zb_affinity))
+
+    def zb_map(self, iterable: Iterable, chunk_size: int = MAP_CHUNK_SIZE) -> Iterator:
+        """
+        Calls the routine once per tuple of arguments, like ``itertools.starmap``.
+        Chunks of tuples are spread across the pool's sessions and run in parallel.
+        Results are yielded in order. If a call fails, its error is raised.
+        Calls from later chunks may already have been made at this point.
+
+        args:
+            iterable : Tuples of arguments, consumed lazily
+            chunk_size : Maximum number of calls per chunk
+        returns:
+            Iterator over return values
+        """
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        return self._map(iter(iterable), chunk_size)
+
+    def _map(self, iterator: Iterator, chunk_size: int) -> Generator:
+
+        def run(chunk: List[Tuple]) -> List[Any]:
+            index = self._pool._acquire(None)
+            try:
+                return list(self._routines[index].zb_map(chunk, chunk_size = len(chunk)))
+            finally:
+                self._pool._release(index)
+
+        pending = deque()  # at most two chunks per session in flight, bounds memory consumption
+
+        with ThreadPoolExecutor(max_workers = len(self._routines)) as executor:
+            while True:
+                while len(pending) < 2 * len(self._routines):
+                    chunk = list(islice(iterator, chunk_size))
+                    if len(chunk) == 0:
+                        break
+                    pending.append(executor.submit(run, chunk))
+                if len(pending) == 0:
+                    return
+                yield from pending.popleft().result()
+
+    @property
+    def argtypes(self) -> Union[List, Tuple]:
+
+        return self._routines[0].argtypes
+
+    @argtypes.setter
+    def argtypes(self, value: Union[List, Tuple]):
+
+        for routine in self._routines:
+            routine.argtypes = value
+
+    @property
+    def restype(self) -> Any:
+
+        return self._routines[0].restype
+
+    @restype.setter
+    def restype(self, value: Any):
+
+        for routine in self._routines:
+            routine.restype = value
+
+    @property
+    def memsync(self) -> List:
+
+        return self._routines[0].memsync
+
+    @memsync.setter
+    def memsync(self, value: List):
+
+        for routine in self._routines:
+            routine.memsync = value
+
+
+@typechecked
+class _PoolDll:
+    """
+    One DLL, loaded into every session of a pool
+    """
+
+    def __init__(self, pool: SessionPoolABC, name: str, dlls: List[Any]):
+
+        self._pool = pool
+        self._name = name
+        self._dlls = dlls
+
+        self._routines = {}
+        self._lock = Lock()  # routines may be registered from multiple threads
+
+    def __repr__(self) -> str:
+
+        return f'<SessionPool.dll name={self._name:s} sessions={len(self._dlls):d}>'
+
+    def zb_configure_all(self):
+        """
+        Configures all routines which have been accessed but not called yet, in every session
+        """
+
+        for dll in self._dlls:
+            dll.zb_configure_all()
+
+    def zb_register(self, names: Iterable[Union[str, int]]):
+        """
+        Registers routines by name or ordinal in every session, one round trip per session
+        """
+
+        names = list(names)
+
+        for dll in self._dlls:
+            dll.zb_register(names)
+
+    def __getattr__(self, name: str) -> _PoolRoutine:
+
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+
+        return self[name]
+
+    def __getitem__(self, name_or_ordinal: Union[str, int]) -> _PoolRoutine:
+
+        try:
+            return self._routines[name_or_ordinal]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if name_or_ordinal not in self._routines.keys():
+                self._routines[name_or_ordinal] = _PoolRoutine(
+                    self._pool,
+                    name_or_ordinal,
+                    [dll[name_or_ordinal] for dll in self._dlls],
+                )
+
+        return self._routines[name_or_ordinal]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# SESSION POOL CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class SessionPool(SessionPoolABC):
+    """
+    Represents a pool of "ctypes sessions", i.e. multiple Wine Python processes with identical configuration.
+    DLLs are loaded into every session. Calls of routines are spread across sessions,
+    so CPU-bound routines can run in parallel. Mutable.
+
+    All other attributes, e.g. data types like ``c_int`` and ``CFUNCTYPE``, are taken from the first session.
+    Sessions are started in parallel.
+
+    args:
+        n : Number of sessions
+        schedule : How calls are spread across sessions, ``least_loaded`` or ``round_robin``
+        affinity_size : Number of affinity keys remembered, least recently used ones are forgotten
+        kwargs : An arbitrary number of keyword arguments matching valid :ref:`configuration parameters <configparameter>`
+    """
+
+    def __init__(self, n: int = 2, schedule: str = "least_loaded", affinity_size: int = POOL_AFFINITY_SIZE, **kwargs: Any):
+
+        if n < 1:
+            raise ValueError("a pool requires at least one session")
+        if schedule not in SCHEDULES:
+            raise ValueError("unknown schedule", schedule)
+        if "id" in kwargs.keys():
+            raise ValueError("sessions in a pool can not share an id")
+        if affinity_size < 1:
+            raise ValueError("affinity_size must be positive")
+
+        self._schedule = schedule
+
+        self._lock = Lock()  # guards load and affinity
+        self._load = [0] * n  # calls in flight per session
+        self._next = count()  # round-robin counter, also breaks ties
+        self._affinity = OrderedDict()  # key: index of session, least recently used first
+        self._affinity_size = affinity_size
+
+        self._dlls = {}
+        self._dlls_lock = Lock()
+
+        # Ensure a working Wine-Python environment once, sessions starting in parallel find its stamp file
+        config = Config(**kwargs)
+        Env(**config.export_dict()).ensure_zugbruecke(validate=config["validate_env"])
+        kwargs["validate_env"] = False
+
+        with ThreadPoolExecutor(max_workers = n) as executor:
+            futures = [executor.submit(CtypesSession, **kwargs) for _ in range(n)]
+
+        self._sessions = []
+        errors = []
+        for future in futures:
+            try:
+                self._sessions.append(future.result())
+            except Exception as e:
+                errors.append(e)
+
+        if len(errors) > 0:
+            self.zb_terminate()
+            raise errors[0]
+
+        # Library loader objects
+        self._cdll = LibraryLoader(self.CDLL)
+        self._windll = LibraryLoader(self.WinDLL)
+        self._oledll = LibraryLoader(self.OleDLL)
+
+    def __repr__(self) -> str:
+
+        return f'<SessionPool sessions={len(self._sessions):d} schedule={self._schedule:s}>'
+
+    def __getattr__(self, name: str) -> Any:
+
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self._sessions[0], name)
+
+    def __enter__(self) -> SessionPoolABC:
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Union[Type, None],
+        exc_value: Union[Exception, None],
+        traceback: Union[TracebackType, None],
+    ):
+
+        self.zb_terminate()
+
+    def CDLL(self, name: str, mode: int = DEFAULT_MODE, **kwargs: Any) -> _PoolDll:
+        """
+        Pool equivalent of ``ctypes.CDLL``, loads DLL into every session
+        """
+
+        return self._load_library(name, "CDLL", mode = mode, **kwargs)
+
+    def WinDLL(self, name: str, mode: int = DEFAULT_MODE, **kwargs: Any) -> _PoolDll:
+        """
+        Pool equivalent of ``ctypes.WinDLL``, loads DLL into every session
+        """
+
+        return self._load_library(name, "WinDLL", mode = mode, **kwargs)
+
+    def OleDLL(self, name: str, mode: int = DEFAULT_MODE, **kwargs: Any) -> _PoolDll:
+        """
+        Pool equivalent of ``ctypes.OleDLL``, loads DLL into every session
+        """
+
+        return self._load_library(name, "OleDLL", mode = mode, **kwargs)
+
+    @property
+    def cdll(self) -> LibraryLoader:
+        """
+        Pool equivalent of ``ctypes.cdll``
+        """
+
+        return self._cdll
+
+    @property
+    def windll(self) -> LibraryLoader:
+        """
+        Pool equivalent of ``ctypes.windll``
+        """
+
+        return self._windll
+
+    @property
+    def oledll(self) -> LibraryLoader:
+        """
+        Pool equivalent of ``ctypes.oledll``
+        """
+
+        return self._oledll
+
+    @property
+    def zb_sessions(self) -> List[CtypesSessionABC]:
+        """
+        Sessions of this pool
+        """
+
+        return self._sessions.copy()
+
+    def zb_get_parameter(self, key: str) -> Any:
+        """
+        Reads configuration parameter of the first session of this pool
+
+        args:
+            key : Name of configuration parameter
+        returns:
+            Value for configuration parameter
+        """
+
+        return self._sessions[0].zb_get_parameter(key)
+
+    def zb_set_parameter(self, key: str, value: Any):
+        """
+        Changes configuration parameter of all sessions of this pool
+
+        args:
+            key : Name of configuration parameter
+            value : New value for configuration parameter
+        """
+
+        for session in self._sessions:
+            session.zb_set_parameter(key, value)
+
+    def zb_terminate(self):
+        """
+        Terminates all sessions of this pool
+        """
+
+        for session in self._sessions:
+            session.zb_terminate()
+
+    def _load_library(self, name: str, loader: str, **kwargs: Any) -> _PoolDll:
+
+        with self._dlls_lock:
+            if name not in self._dlls.keys():
+                self._dlls[name] = _PoolDll(
+                    self,
+                    name,
+                    [getattr(session, loader)(name, **kwargs) for session in self._sessions],
+                )
+
+        return self._dlls[name]
+
+    def _acquire(self, affinity: Optional[Hashable] = None) -> int:
+        """
+        Picks a session for a call and counts the call as in flight
+        """
+
+        with self._lock:
+
+            if affinity is not None and affinity in self._affinity.keys():
+                index = self._affinity[affinity]
+                self._affinity.move_to_end(affinity)
+
+            else:
+                offset = next(self._next)
+                indices = [
+                    (offset + shift) % len(self._load)
+                    for shift in range(len(self._load))
+                ]
+                if self._schedule == "least_loaded":
+                    index = min(indices, key = lambda index: self._load[index])  # ties: round-robin
+                else:
+                    index = indices[0]
+                if affinity is not None:
+                    self._affinity[affinity] = index
+                    if len(self._affinity) > self._affinity_size:
+                        self._affinity.popitem(last = False)
+
+            self._load[index] += 1
+
+        return index
+
+    def _release(self, index: int):
+
+        with self._lock:
+            self._load[index] -= 1
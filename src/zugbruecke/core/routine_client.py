@@ -31,13 +31,19 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from concurrent.futures import Future
 import ctypes
+from itertools import islice
+from logging import DEBUG, INFO
 from pprint import pformat as pf
-from typing import Any, List, Tuple, Union
+from threading import Lock
+from typing import Any, Callable, ContextManager, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, Union
 
-from .abc import DataABC, LogABC, RoutineClientABC, RpcClientABC
+from .abc import DataABC, LogABC, RoutineClientABC, RpcClientABC, SignatureCacheABC
+from .const import MAP_CHUNK_SIZE
 from .definitions import Definition, DefinitionMemsync
 from .mempkg import Mempkg
+from .plan import Plan
 from .typeguard import typechecked
 
 
@@ -61,6 +67,7 @@ class RoutineClient(RoutineClientABC):
         log: LogABC,
         rpc_client: RpcClientABC,
         data: DataABC,
+        signatures: Optional[SignatureCacheABC] = None,
     ):
 
         self._name = name
@@ -70,8 +77,12 @@ class RoutineClient(RoutineClientABC):
         self._log = log
         self._data = data
 
+        self._rpc_client = rpc_client
+        self._rpc_prefix = f"{hash_id:s}_{str(self._name):s}"
+
         # Set call status
         self._configured = False
+        self._lock = Lock()  # routine may be configured from multiple threads
 
         # By default, there is no memory to sync
         self._memsyncs_raw = []
@@ -85,8 +96,19 @@ class RoutineClient(RoutineClientABC):
         self._restype_raw = None
         self._restype = None
 
+        # Marshalling plans, available once configured
+        self._plan = None
+        self._plan_generic = None
+
+        # Packed definitions, kept across sessions if there is a signature cache
+        self._signatures = signatures
+        self._signature = None
+
         for attr in (
             "call",
+            "call_fast",
+            "call_fast_many",
+            "call_many",
             "configure",
             "get_repr",
         ):
@@ -100,85 +122,269 @@ class RoutineClient(RoutineClientABC):
             )
 
     def __call__(self, *args: Any) -> Any:
+
+        args = list(args)
+
+        verbose = self._log.is_enabled_for(INFO)  # skip building log messages if they are discarded anyway
+
+        if verbose:
+            self._log.info(f'[routine-client] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" ...')
+
+        plan = self._get_plan()
+
+        if plan.fast:
+            packed_args = plan.pack_fast_args(args)
+            if packed_args is not None:
+                return self._call_fast(plan, packed_args)
+
+        if verbose:
+            self._log.info('[routine-client] ... packing and pushing args to server ...')
+
+        # Pack stuff
+        mempkgs, packed_args, packed_mempkgs = self._pack(plan, args)  # keep mempkgs until after function call
+
+        # Actually call routine in DLL
+        return_package = self._call_on_server(packed_args, packed_mempkgs)
+
+        return self._unpack(plan, args, return_package)
+
+    def __repr__(self) -> str:
+
+        return self._get_repr_on_server()
+
+    def zb_map(self, iterable: Iterable, chunk_size: int = MAP_CHUNK_SIZE) -> Iterator:
+        """
+        Calls the routine once per tuple of arguments, like ``itertools.starmap``.
+        Tuples are shipped to the Wine side in chunks, each chunk in a single round trip.
+        Results are yielded in order. If a call fails, its error is raised
+        and no further calls are made.
+
+        Args:
+            - iterable: tuples of raw arguments, consumed lazily
+            - chunk_size: maximum number of calls per round trip
+        Returns:
+            Iterator over return values
+        """
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        self._get_plan()  # configure routine now, not on first iteration
+
+        return self._map(iter(iterable), chunk_size)
+
+    def zb_submit(self, *args: Any) -> Future:
         """
-        TODO Optimize for speed!
+        Calls the routine without waiting for it to return.
+        Arguments are packed immediately. Once the Wine side returns,
+        arguments and memory are synced and the future is resolved.
+        Arguments must therefore not be modified or released while the call is in flight.
+
+        Args:
+            - args: raw arguments
+        Returns:
+            ``concurrent.futures.Future``, resolving to the return value of the routine
         """
 
         args = list(args)
 
-        self._log.info(f'[routine-client] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" ...')
+        if self._log.is_enabled_for(INFO):
+            self._log.info(f'[routine-client] Trying to submit call of routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" ...')
+
+        plan = self._get_plan()
+
+        if plan.fast:
+            packed_args = plan.pack_fast_args(args)
+            if packed_args is not None:
+                return self._submit("call_fast", (packed_args,), plan.unpack_fast_retval)
+
+        mempkgs, packed_args, packed_mempkgs = self._pack(plan, args)
+
+        def unpack(return_package: Dict) -> Any:
+            _ = mempkgs  # keep until after function call to avoid pointers being garbage collected
+            return self._unpack(plan, args, return_package)
+
+        return self._submit("call", (packed_args, packed_mempkgs), unpack)
+
+    async def zb_acall(self, *args: Any) -> Any:
+        """
+        Calls the routine and awaits its return value without blocking the event loop.
+        See ``zb_submit`` for details.
+
+        Args:
+            - args: raw arguments
+        Returns:
+            Return value of the routine
+        """
+
+        import asyncio  # deferred, only required by coroutines, expensive to import
+
+        return await asyncio.wrap_future(self.zb_submit(*args))
+
+    def _submit(self, attr: str, args: Tuple, unpack: Callable) -> Future:
+
+        future = Future()
+        future.set_running_or_notify_cancel()  # already in flight, can not be cancelled
+
+        def done(rpc_future: Future):
+            try:
+                future.set_result(unpack(rpc_future.result()))
+            except Exception as e:
+                future.set_exception(e)
+
+        self._rpc_client.submit(f"{self._rpc_prefix:s}_{attr:s}", *args).add_done_callback(done)
+
+        if self._log.is_enabled_for(INFO):
+            self._log.info("[routine-client] ... submitted.")
+
+        return future
+
+    def _get_plan(self) -> Plan:
 
         if not self._configured:
-            self._configure()
+            with self._lock:
+                if not self._configured:
+                    self._configure()
 
-        self._log.info('[routine-client] ... packing and pushing args to server ...')
+        return self._plan if self._data.compile_plans else self._plan_generic
 
-        # Pack stuff
-        packed_args = self._data.pack_args(args, self._argtypes, self._convention)
-        mempkgs = DefinitionMemsync.pkg_memories(
-            args = args,
-            memsyncs = self._memsyncs,
-        )  # keep until after function call to avoid pointers being garbage collected
-        packed_mempkgs = [mempkg.as_packed() for mempkg in mempkgs]
+    def _pack(self, plan: Plan, args: List[Any]) -> Tuple[List[Mempkg], List[Any], List[Dict]]:
 
-        self._log.debug(dict(
-            args = args,
-            packed_args = packed_args,
-            packed_mempkgs = packed_mempkgs,
-        ))
+        packed_args = plan.pack_args(args)
+        if plan.memsyncs is None:
+            mempkgs = []
+            packed_mempkgs = []
+        else:
+            mempkgs = DefinitionMemsync.pkg_memories(
+                args = args,
+                memsyncs = plan.memsyncs,
+                arena = self._data.arena,
+            )  # keep until after function call to avoid pointers being garbage collected
+            packed_mempkgs = [mempkg.as_packed() for mempkg in mempkgs]
 
-        # Actually call routine in DLL
-        return_package = self._call_on_server(packed_args, packed_mempkgs)
+        if self._log.is_enabled_for(DEBUG):
+            self._log.debug(dict(
+                args = args,
+                packed_args = packed_args,
+                packed_mempkgs = packed_mempkgs,
+            ))
+
+        return mempkgs, packed_args, packed_mempkgs
 
-        self._log.info("[routine-client] ... received feedback from server, unpacking & syncing arguments ...")
+    def _unpack(self, plan: Plan, args: List[Any], return_package: Dict) -> Any:
+
+        verbose = self._log.is_enabled_for(INFO)
+
+        if verbose:
+            self._log.info("[routine-client] ... received feedback from server, unpacking & syncing arguments ...")
 
         # Unpack return dict (call may have failed partially only)
-        self._data.sync_args(
-            args,
-            self._data.unpack_args(
-                return_package["args"],
-                self._argtypes,
-                self._convention,
-            ),
-            self._argtypes,
-        )
+        plan.sync_args(args, return_package["args"])
 
-        self._log.info("[routine-client] ... unpacking return value ...")
+        if verbose:
+            self._log.info("[routine-client] ... unpacking return value ...")
 
         # Unpack return value of routine
-        retval = self._data.unpack_retval(
-            return_package["retval"], self._restype
-        )
+        retval = plan.unpack_retval(return_package["retval"])
 
-        self._log.info("[routine-client] ... overwriting memory ...")
+        if plan.memsyncs is not None:
 
-        # Unpack memory (call may have failed partially only)
-        DefinitionMemsync.unpkg_memories(
-            args = args,
-            retval = retval,
-            mempkgs = [Mempkg.from_packed(mempkg) for mempkg in return_package["mempkgs"]],
-            memsyncs = self._memsyncs,
-        )
+            if verbose:
+                self._log.info("[routine-client] ... overwriting memory ...")
 
-        self._log.info("[routine-client] ... everything unpacked and overwritten ...")
+            # Unpack memory (call may have failed partially only)
+            DefinitionMemsync.unpkg_memories(
+                args = args,
+                retval = retval,
+                mempkgs = [Mempkg.from_packed(mempkg, arena = self._data.arena) for mempkg in return_package["mempkgs"]],
+                memsyncs = plan.memsyncs,
+            )
+
+        if verbose:
+            self._log.info("[routine-client] ... everything unpacked and overwritten ...")
 
         # Raise the original error if call was not a success
         if not return_package["success"]:
             self._log.error("[routine-client] ... call raised an error.")
             raise return_package["exception"]
 
-        self._log.info("[routine-client] ... return.")
+        if verbose:
+            self._log.info("[routine-client] ... return.")
 
         # Return result. return_value will be None if there was not a result.
         return retval
 
-    def __repr__(self) -> str:
+    def _call_fast(self, plan: Plan, packed_args: bytes) -> Any:
+        """
+        Fundamental data types by value only, nothing to sync
+        """
 
-        return self._get_repr_on_server()
+        verbose = self._log.is_enabled_for(INFO)
 
-    def _configure(self):
+        if verbose:
+            self._log.info('[routine-client] ... pushing args to server (fast path) ...')
 
-        self._log.info("[routine-client] ... has not been called before. Configuring ...")
+        retval = plan.unpack_fast_retval(self._call_fast_on_server(packed_args))
+
+        if verbose:
+            self._log.info("[routine-client] ... return.")
+
+        return retval
+
+    def _map(self, iterator: Iterator, chunk_size: int) -> Generator:
+
+        while True:
+
+            chunk = [list(args) for args in islice(iterator, chunk_size)]
+            if len(chunk) == 0:
+                return
+
+            if self._log.is_enabled_for(INFO):
+                self._log.info(f'[routine-client] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" {len(chunk):d} times ...')
+
+            plan = self._get_plan()
+
+            if plan.fast:
+                packed_args = [plan.pack_fast_args(args) for args in chunk]
+                if all(item is not None for item in packed_args):
+                    packed_retvals, exception = self._call_fast_many_on_server(b"".join(packed_args))
+                    yield from plan.unpack_fast_retvals(packed_retvals)
+                    if exception is not None:
+                        self._log.error("[routine-client] ... call raised an error.")
+                        raise exception
+                    continue
+
+            packed = [self._pack(plan, args) for args in chunk]  # keep mempkgs until after function calls
+            return_packages = self._call_many_on_server([
+                (packed_args, packed_mempkgs) for _, packed_args, packed_mempkgs in packed
+            ])
+
+            for args, return_package in zip(chunk, return_packages):
+                yield self._unpack(plan, args, return_package)
+
+    @property
+    def configured(self) -> bool:
+
+        return self._configured
+
+    @property
+    def lock(self) -> ContextManager:
+        """
+        Held while the routine is configured, see ``prepare_configuration``
+        """
+
+        return self._lock
+
+    def prepare_configuration(self) -> Optional[Tuple[List[Dict], Optional[Dict], List[Dict]]]:
+        """
+        Parses types and compiles plans on the Unix side only. Used for configuring many routines at once.
+        The Wine side must be configured with the returned packed definitions, then ``set_configured`` must be called.
+        The caller must hold ``lock`` throughout.
+
+        Returns:
+            Packed argtypes, restype and memsync definitions or ``None`` if the Wine side
+            has already been configured with identical ones from the signature cache
+        """
 
         # Parse raw argtypes into definitions
         self._argtypes = Definition.from_data_types(
@@ -206,6 +412,10 @@ class RoutineClient(RoutineClientABC):
             restype = self._restype,
         )
 
+        # Compile marshalling plan, keep generic plan around as a fallback
+        self._plan = Plan(self._data, self._argtypes, self._restype, self._memsyncs, self._convention)
+        self._plan_generic = Plan(self._data, self._argtypes, self._restype, self._memsyncs, self._convention, compile = False)
+
         # Log status
         self._log.debug(dict(
             argtypes_raw = self._argtypes_raw,
@@ -214,18 +424,42 @@ class RoutineClient(RoutineClientABC):
             restype = self._restype,
             memsync_raw = self._memsyncs_raw,
             memsync = self._memsyncs,
+            plan = self._plan,
         ))
 
         # Pass argument and return value types as strings ...
-        _ = self._configure_on_server(
+        self._signature = (
             [argtype.as_packed() for argtype in self._argtypes],
             self._restype.as_packed() if self._restype is not None else None,
             [memsync.as_packed() for memsync in self._memsyncs],
         )
 
-        # Change status of routine - it has been called once and is therefore configured
+        if self._signatures is not None and self._signatures.get(self._name) == self._signature:
+            return None
+
+        return self._signature
+
+    def set_configured(self):
+        """
+        Marks routine as configured on both sides, see ``prepare_configuration``
+        """
+
+        if self._signatures is not None:
+            self._signatures.set(self._name, self._signature)
+
         self._configured = True
 
+    def _configure(self):
+
+        self._log.info("[routine-client] ... has not been called before. Configuring ...")
+
+        packed = self.prepare_configuration()
+        if packed is not None:
+            _ = self._configure_on_server(*packed)
+
+        # Change status of routine - it has been called once and is therefore configured
+        self.set_configured()
+
         # Log status
         self._log.info("[routine-client] ... configured. Proceeding ...")
 
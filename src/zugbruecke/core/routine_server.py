@@ -31,14 +31,16 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from ctypes import _CFuncPtr
+from ctypes import _CFuncPtr, c_int
+from logging import INFO
 from pprint import pformat as pf
 import traceback
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from .abc import DataABC, LogABC, RoutineServerABC, RpcServerABC
 from .definitions import Definition, DefinitionMemsync
 from .mempkg import Mempkg
+from .plan import Plan
 from .typeguard import typechecked
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -77,8 +79,15 @@ class RoutineServer(RoutineServerABC):
         self._restype = None
         self._memsyncs = None
 
+        # Marshalling plans for calls without configuration
+        self._plan = Plan(self._data, [], None, [], self._convention)
+        self._plan_generic = Plan(self._data, [], None, [], self._convention, compile = False)
+
         for attr in (
             "call",
+            "call_fast",
+            "call_fast_many",
+            "call_many",
             "configure",
             "get_repr",
         ):
@@ -92,21 +101,27 @@ class RoutineServer(RoutineServerABC):
         Called by routine client
         """
 
-        self._log.info(f'[routine-server] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" ...')
+        verbose = self._log.is_enabled_for(INFO)  # skip building log messages if they are discarded anyway
+
+        if verbose:
+            self._log.info(f'[routine-server] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" ...')
+
+        plan = self._plan if self._data.compile_plans else self._plan_generic
 
         try:
-            args = self._data.unpack_args(
-                packed_args, self._argtypes, self._convention
-            )
+            args = plan.unpack_args(packed_args)
             retval = None
-            mempkgs = [Mempkg.from_packed(packed_mempkg) for packed_mempkg in packed_mempkgs]
-            DefinitionMemsync.unpkg_memories(
-                args = args,
-                retval = retval,
-                mempkgs = mempkgs,
-                memsyncs = self._memsyncs,
-                is_server = True,
-            )
+            if plan.memsyncs is None:
+                mempkgs = []
+            else:
+                mempkgs = [Mempkg.from_packed(packed_mempkg, arena = self._data.arena) for packed_mempkg in packed_mempkgs]
+                DefinitionMemsync.unpkg_memories(
+                    args = args,
+                    retval = retval,
+                    mempkgs = mempkgs,
+                    memsyncs = plan.memsyncs,
+                    is_server = True,
+                )
         except Exception as e:
             self._log.error("[routine-server] ... call preparation failed!")
             self._log.error(traceback.format_exc())
@@ -126,16 +141,19 @@ class RoutineServer(RoutineServerABC):
             }
 
         try:
-            DefinitionMemsync.update_memories(
-                args = args,
-                retval = retval,
-                mempkgs = mempkgs,
-                memsyncs = self._memsyncs,
-            )
-            self._log.info("[routine-server] ... done.")
+            if plan.memsyncs is not None:
+                DefinitionMemsync.update_memories(
+                    args = args,
+                    retval = retval,
+                    mempkgs = mempkgs,
+                    memsyncs = plan.memsyncs,
+                    arena = self._data.arena,
+                )
+            if verbose:
+                self._log.info("[routine-server] ... done.")
             return {
-                "args": self._data.pack_args(args, self._argtypes, self._convention),
-                "retval": self._data.pack_retval(retval, self._restype),
+                "args": plan.pack_args(args),
+                "retval": plan.pack_retval(retval),
                 "mempkgs": [mempkg.as_packed() for mempkg in mempkgs],
                 "success": True,
                 "exception": None,
@@ -145,6 +163,71 @@ class RoutineServer(RoutineServerABC):
             self._log.error(traceback.format_exc())
             raise e
 
+    def call_fast(self, packed_args: bytes) -> bytes:
+        """
+        Called by routine client, fundamental data types by value only
+        """
+
+        verbose = self._log.is_enabled_for(INFO)
+
+        if verbose:
+            self._log.info(f'[routine-server] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" (fast path) ...')
+
+        try:
+            retval = self._handler(*self._plan.unpack_fast_args(packed_args))
+        except Exception as e:
+            self._log.error("[routine-server] ... call failed!")
+            self._log.error(traceback.format_exc())
+            raise e
+
+        if verbose:
+            self._log.info("[routine-server] ... done.")
+
+        return self._plan.pack_fast_retval(retval)
+
+    def call_many(self, batch: List[Tuple[List[Any], List[Dict]]]) -> List[Dict]:
+        """
+        Called by routine client, once per chunk of batched calls. Stops after the first failed call.
+        """
+
+        return_packages = []
+
+        for packed_args, packed_mempkgs in batch:
+            return_package = self.call(packed_args, packed_mempkgs)
+            return_packages.append(return_package)
+            if not return_package["success"]:
+                break
+
+        return return_packages
+
+    def call_fast_many(self, packed_args: bytes) -> Tuple[bytes, Optional[Exception]]:
+        """
+        Called by routine client, once per chunk of batched calls, fundamental data types by value only.
+        Stops after the first failed call.
+        """
+
+        verbose = self._log.is_enabled_for(INFO)
+
+        if verbose:
+            self._log.info(f'[routine-server] Trying to call routine "{str(self._name):s}" in DLL file "{self._dll_name:s}" many times (fast path) ...')
+
+        handler = self._handler
+        pack = self._plan.pack_fast_retval
+        packed_retvals = []
+
+        try:
+            for args in self._plan.unpack_fast_args_many(packed_args):
+                packed_retvals.append(pack(handler(*args)))
+        except Exception as e:
+            self._log.error("[routine-server] ... call failed!")
+            self._log.error(traceback.format_exc())
+            return b"".join(packed_retvals), e
+
+        if verbose:
+            self._log.info("[routine-server] ... done.")
+
+        return b"".join(packed_retvals), None
+
     def configure(self, packed_argtypes: List[Dict], packed_restype: Optional[Dict], packed_memsyncs: List[Dict]):
         """
         Called by routine client
@@ -176,15 +259,18 @@ class RoutineServer(RoutineServerABC):
                 for packed_memsync in packed_memsyncs
             ]
 
+            # Compile marshalling plan, keep generic plan around as a fallback
+            self._plan = Plan(self._data, self._argtypes, self._restype, self._memsyncs, self._convention)
+            self._plan_generic = Plan(self._data, self._argtypes, self._restype, self._memsyncs, self._convention, compile = False)
+
             # Parse and apply argtype definition dict to actual ctypes routine
             argtypes = [argtype.data_type for argtype in self._argtypes]
-            # Only configure if there are definitions, otherwise calls with int parameters without definition fail
-            if len(argtypes) > 0:
-                self._handler.argtypes = argtypes
+            # No definitions means no checks, otherwise calls with int parameters without definition fail.
+            # Always assigned, the routine may have been configured before, e.g. from the signature cache.
+            self._handler.argtypes = argtypes if len(argtypes) > 0 else None
 
-            # Parse and apply restype definition dict to actual ctypes routine
-            if self._restype is not None:
-                self._handler.restype = self._restype.data_type
+            # Parse and apply restype definition dict to actual ctypes routine, ctypes' default otherwise
+            self._handler.restype = self._restype.data_type if self._restype is not None else c_int
 
         except Exception as e:
 
@@ -200,6 +286,7 @@ class RoutineServer(RoutineServerABC):
             restype_raw = self._handler.restype,
             restype = self._restype,
             memsync = self._memsyncs,
+            plan = self._plan,
         ))
 
     def get_repr(self) -> str:
@@ -31,13 +31,29 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from concurrent.futures import Future
+from itertools import count
 from multiprocessing.connection import Client, Listener, _ConnectionBase
-from threading import Thread
+from multiprocessing.reduction import ForkingPickler
+from queue import SimpleQueue
+from threading import Event, Lock, Thread, local
 import time
 import traceback
-from typing import Any, Callable, Tuple, Union
-
-from .abc import LogABC, RpcClientABC, RpcServerABC
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from weakref import WeakSet
+
+from .abc import LogABC, RpcClientABC, RpcServerABC, ShmTransportABC
+from .const import (
+    RPC_ASYNC,
+    RPC_ASYNC_WORKERS,
+    RPC_BACKLOG,
+    RPC_CALLBACK,
+    RPC_CALLBACK_RAISE,
+    RPC_CALLBACK_RETURN,
+    SHM_ATTACH,
+)
+from .lib import set_nodelay
+from .shm import ShmConnection
 from .typeguard import typechecked
 
 
@@ -49,14 +65,42 @@ from .typeguard import typechecked
 @typechecked
 class RpcClient(RpcClientABC):
     """
-    RPC client
+    RPC client, thread-safe: Every thread talks to the server through its own connection.
+
+    Requests can also be submitted without waiting for their results. They share one
+    additional socket connection, tagged with request IDs. The server answers them
+    out of order, as soon as they are done, and a reader thread resolves the futures.
+
+    While waiting for the result of a call, the server may call back into functions of
+    ``callback_server`` on the same connection, see ``RpcServer.call_back``. They run on
+    the calling thread.
     """
 
-    def __init__(self, socket_path: Tuple[str, int], authkey: str):
+    def __init__(
+        self,
+        socket_path: Union[str, Tuple[str, int]],
+        authkey: str,
+        callback_server: Optional[RpcServerABC] = None,
+    ):
+
+        self._socket_path = socket_path
+        self._authkey = authkey.encode("utf-8")
+        self._callback_server = callback_server
+        self._transport = None
+
+        self._lock = Lock()
+        self._local = local()  # per-thread connections
+        self._clients = WeakSet()  # all connections, closed on transport change
+
+        self._async = None  # connection for out-of-order responses, opened on first submit
+        self._async_lock = Lock()  # serializes submits
+        self._futures = {}  # pending submits by request ID
+        self._request_ids = count()
 
-        self._client = Client(socket_path, authkey=authkey.encode("utf-8"))
         self._cache = {}
 
+        self._connect_thread()
+
     def __getattr__(self, name: str) -> Callable:
 
         try:
@@ -66,8 +110,13 @@ class RpcClient(RpcClientABC):
 
         def call_rpc_server(*args: Any, **kwargs: Any) -> Any:
 
-            self._client.send((name, args, kwargs))
-            result = self._client.recv()
+            try:
+                client = self._local.client
+            except AttributeError:
+                client = self._connect_thread()
+
+            client.send((name, args, kwargs))
+            result = self._receive(client)
 
             if isinstance(result, Exception):
                 # TODO print traceback to stderr?
@@ -78,10 +127,123 @@ class RpcClient(RpcClientABC):
         self._cache[name] = call_rpc_server
         return call_rpc_server
 
+    def submit(self, name: str, *args: Any, **kwargs: Any) -> Future:
+        """
+        Calls a function on the server without waiting for the result
+
+        Args:
+            - name: name of function
+            - args, kwargs: arguments of function
+        Returns:
+            Future, resolved once the server answers
+        """
+
+        future = Future()
+        future.set_running_or_notify_cancel()  # already in flight, can not be cancelled
+
+        with self._async_lock:
+
+            if self._async is None:
+                self._async = self._connect()
+                self._async.send((RPC_ASYNC, tuple(), dict()))
+                Thread(target=self._receive_async, args=(self._async,), daemon=True).start()
+
+            request_id = next(self._request_ids)
+            self._futures[request_id] = future
+
+            try:
+                self._async.send((request_id, name, args, kwargs))
+            except Exception:
+                self._futures.pop(request_id, None)
+                raise
+
+        return future
+
+    def _receive(self, connection: Any) -> Any:
+        """
+        Result of a call, serves nested calls of callback routines in the meantime
+        """
+
+        while True:
+            buf = connection.recv_bytes()
+            if buf[:1] != RPC_CALLBACK:  # pickles start with their protocol opcode
+                return ForkingPickler.loads(buf)
+            connection.send_bytes(self._callback_server.handle_callback(buf))
+
+    def _receive_async(self, connection: Any):
+
+        try:
+            while True:
+                request_id, result = connection.recv()
+                with self._async_lock:
+                    future = self._futures.pop(request_id)
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self._async_lock:
+                if self._async is connection:
+                    self._async = None
+                futures, self._futures = self._futures, {}
+            connection.close()
+            for future in futures.values():
+                future.set_exception(ConnectionError("rpc connection closed"))
+
+    @property
+    def transport(self) -> Optional[ShmTransportABC]:
+
+        return self._transport
+
+    def set_transport(self, transport: Optional[ShmTransportABC] = None):
+        """
+        Replaces all connections. ``None`` falls back to plain sockets.
+        Other threads reconnect on their next call.
+        """
+
+        client = self._connect(transport)
+
+        with self._lock:
+            self._transport = transport
+            self._local = local()
+            self._local.client = client
+            clients, self._clients = self._clients, WeakSet([client])
+
+        for client in clients:
+            client.close()
+
+    def _connect(self, transport: Optional[ShmTransportABC] = None) -> Any:
+
+        client = Client(self._socket_path, authkey=self._authkey)
+        if not isinstance(self._socket_path, str):
+            set_nodelay(client)
+
+        if transport is None:
+            return client
+
+        return transport.upgrade(client)
+
+    def _connect_thread(self) -> Any:
+
+        transport = self._transport
+        client = self._connect(transport)
+
+        with self._lock:
+            if transport is self._transport:
+                self._local.client = client
+                self._clients.add(client)
+                return client
+
+        client.close()  # transport changed in the meantime
+
+        return self._connect_thread()
+
     @classmethod
     def from_safe_connect(
         cls,
-        socket_path: Tuple[str, int],
+        socket_path: Union[str, Tuple[str, int]],
         authkey: str,
         timeout_after_seconds: Union[int, float] = 30,
         wait_for_seconds: Union[int, float] = 0.01,
@@ -114,7 +276,7 @@ class RpcServer(RpcServerABC):
 
     def __init__(
         self,
-        socket_path: Tuple[str, int],
+        socket_path: Union[str, Tuple[str, int]],
         authkey: str,
         log: Union[LogABC, None] = None,
         terminate_function: Union[Callable, None] = None,
@@ -133,10 +295,13 @@ class RpcServer(RpcServerABC):
 
         self._server = None
         self._t = None
+        self._terminated = Event()
 
         self._functions = {}
         self.register_function(self.get_rpc_status)
 
+        self._local = local()  # connection of the request a thread is serving, for nested calls
+
         if self._log is not None:
             self._log.info("[rpc-server] STARTED.")
 
@@ -147,6 +312,53 @@ class RpcServer(RpcServerABC):
 
         return self._up
 
+    def call_back(self, name: str, payload: bytes) -> Optional[bytes]:
+        """
+        Calls a function of the client's ``callback_server`` from within the request the current
+        thread is serving, on the connection of this request. Requests nested into this call, e.g.
+        by a callback routine calling another routine, are served in the meantime.
+
+        Args:
+            - name: name of function
+            - payload: argument of function
+        Returns:
+            Result of function or ``None`` if the current thread is not serving a request
+        """
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return None
+
+        connection.send_bytes(RPC_CALLBACK + name.encode("utf-8") + b"\x00" + payload)
+
+        while True:
+            buf = connection.recv_bytes()
+            tag = buf[:1]
+            if tag == RPC_CALLBACK_RETURN:
+                return buf[1:]
+            if tag == RPC_CALLBACK_RAISE:
+                raise ForkingPickler.loads(buf[1:])
+            self._call(connection, *ForkingPickler.loads(buf))
+
+    def handle_callback(self, frame: bytes) -> bytes:
+        """
+        Serves a call of a function nested into a request, see ``call_back``
+
+        Args:
+            - frame: tagged name and argument of function
+        Returns:
+            Tagged result of function or exception
+        """
+
+        try:
+            index = frame.index(b"\x00", 1)
+            return RPC_CALLBACK_RETURN + self._functions[frame[1:index].decode("utf-8")](frame[index + 1:])
+        except Exception as e:
+            try:
+                return RPC_CALLBACK_RAISE + ForkingPickler.dumps(e)
+            except Exception:
+                return RPC_CALLBACK_RAISE + ForkingPickler.dumps(RuntimeError(repr(e)))  # can not be pickled
+
     def register_function(
         self, function_pointer: Callable, public_name: Union[str, None] = None
     ):
@@ -155,6 +367,10 @@ class RpcServer(RpcServerABC):
             function_pointer.__name__ if public_name is None else public_name
         ] = function_pointer
 
+    def unregister_function(self, public_name: str):
+
+        self._functions.pop(public_name, None)
+
     def terminate(self):
 
         if not self._up:
@@ -162,25 +378,31 @@ class RpcServer(RpcServerABC):
 
         self._up = False
 
-        if self._log is not None:
-            self._log.info("[rpc-server] TERMINATING ...")
+        try:
+            if self._log is not None:
+                self._log.info("[rpc-server] TERMINATING ...")
 
-        if self._terminate_function is not None:
-            self._terminate_function()
+            if self._terminate_function is not None:
+                self._terminate_function()
 
-        if self._log is not None:
-            self._log.info("[rpc-server] TERMINATED.")
+            if self._log is not None:
+                self._log.info("[rpc-server] TERMINATED.")
 
-        self._server.close()
+            self._server.close()
+        finally:
+            self._terminated.set()
 
     def serve_forever(self):
 
-        self._server = Listener(self._socket_path, authkey=self._authkey)
+        if self._server is None:
+            self._server = Listener(self._socket_path, authkey=self._authkey, backlog=RPC_BACKLOG)
 
         while self._up:
 
             try:
                 connection = self._server.accept()
+                if not isinstance(self._socket_path, str):
+                    set_nodelay(connection)
                 t = Thread(target=self._handle_connection, args=(connection,))
                 t.daemon = True
                 t.start()
@@ -190,24 +412,97 @@ class RpcServer(RpcServerABC):
             except Exception as e:
                 traceback.print_exc()
 
+        # Termination may still be running in a (daemon) connection thread.
+        # If this is the last non-daemon thread, the process must not exit before it is done.
+        self._terminated.wait()
+
     def server_forever_in_thread(self, daemon: bool = True):
 
         if self._t is not None:
             return
 
+        # Listen before returning, clients can connect right away
+        self._server = Listener(self._socket_path, authkey=self._authkey, backlog=RPC_BACKLOG)
+
         self._t = Thread(target=self.serve_forever)
         self._t.daemon = daemon
         self._t.start()
 
     def _handle_connection(self, connection: _ConnectionBase):
 
+        self._local.connection = connection
+
         try:
             while True:
                 function_name, args, kwargs = connection.recv()
+                if function_name == SHM_ATTACH:
+                    connection = self._attach_shm(connection, *args)
+                    self._local.connection = connection
+                    continue
+                if function_name == RPC_ASYNC:
+                    self._local.connection = None  # out-of-order responses, no nested calls
+                    self._serve_async(connection)
+                    return
+                self._call(connection, function_name, args, kwargs)
+        except EOFError:
+            pass
+        finally:
+            self._local.connection = None
+            connection.close()
+
+    def _call(self, connection: Any, function_name: str, args: Tuple, kwargs: Dict):
+
+        try:
+            r = self._functions[function_name](*args, **kwargs)
+            connection.send(r)
+        except Exception as e:
+            connection.send(e)
+
+    def _serve_async(self, connection: _ConnectionBase):
+        """
+        Tagged requests, answered out of order by a pool of worker threads
+        """
+
+        lock = Lock()  # serializes responses
+        requests = SimpleQueue()
+
+        def work():
+            while True:
+                request = requests.get()
+                if request is None:
+                    return
+                request_id, function_name, args, kwargs = request
                 try:
                     r = self._functions[function_name](*args, **kwargs)
-                    connection.send(r)
                 except Exception as e:
-                    connection.send(e)
-        except EOFError:
-            pass
+                    r = e
+                with lock:
+                    try:
+                        connection.send((request_id, r))
+                    except OSError:
+                        pass  # client is gone
+
+        # Plain daemon threads: The server may run after the main thread has ended,
+        # which is when ``concurrent.futures`` stops accepting new work.
+        for _ in range(RPC_ASYNC_WORKERS):
+            Thread(target=work, daemon=True).start()
+
+        try:
+            while True:
+                requests.put(connection.recv())  # EOFError ends it
+        finally:
+            for _ in range(RPC_ASYNC_WORKERS):
+                requests.put(None)
+
+    def _attach_shm(self, connection: _ConnectionBase, fld: str, fn: str) -> Any:
+
+        try:
+            shm = ShmConnection.from_attach_request(connection, fld, fn)
+        except Exception as e:
+            connection.send(e)
+            return connection
+
+        if self._log is not None:
+            self._log.info(f'[rpc-server] Connection switched to shared memory: "{fn:s}"')
+
+        return shm
@@ -30,8 +30,9 @@ specific language governing rights and limitations under the License.
 # IMPORT: Standard library
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from threading import Lock
 from types import TracebackType
-from typing import Any, Callable, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -52,7 +53,7 @@ from ctypes import _FUNCFLAG_CDECL, DEFAULT_MODE, LibraryLoader
 # IMPORT: zugbruecke core and missing ctypes flags
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from .abc import CtypesSessionABC
+from .abc import CtypesSessionABC, SessionClientABC
 from .session_client import SessionClient
 from .config import Config
 from .const import _FUNCFLAG_STDCALL  # EXPORT
@@ -107,6 +108,8 @@ class CtypesSession(CtypesSessionABC):
     and its independent configuration. Mutliple sessions can run simultaneously. Mutable.
 
     args:
+        lazy : Start the *Windows* *Python* interpreter on first use, e.g. when loading a DLL, instead of right away.
+        startup_hook : Called with name and duration in seconds of every phase of the session's startup.
         kwargs : An arbitrary number of keyword arguments matching valid :ref:`configuration parameters <configparameter>`
     """
 
@@ -123,16 +126,23 @@ class CtypesSession(CtypesSessionABC):
     # constructor
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-    def __init__(self, **kwargs: Any):
+    def __init__(
+        self,
+        lazy: bool = False,
+        startup_hook: Optional[Callable[[str, float], None]] = None,
+        **kwargs: Any,
+    ):
 
-        # Start new zugbruecke session
-        self._current_session = SessionClient(config=Config(**kwargs))
+        self._config = Config(**kwargs)
+        self._startup_hook = startup_hook
+        self._session = None
+        self._session_lock = Lock()
 
         # Routines from ctypes.util
         self._util = _util(
-            session_id=self._current_session.id,
-            find_library=self._current_session.find_library,
-            find_msvcrt=self._current_session.find_msvcrt,
+            session_id=self._config["id"],
+            find_library=lambda *args, **kwargs: self._current_session.find_library(*args, **kwargs),
+            find_msvcrt=lambda *args, **kwargs: self._current_session.find_msvcrt(*args, **kwargs),
         )
 
         # Library loader objects
@@ -141,10 +151,39 @@ class CtypesSession(CtypesSessionABC):
         self._oledll = LibraryLoader(self.OleDLL)
         self._pydll = LibraryLoader(self.PyDLL)
 
-        # Used as cache by CFUNCTYPE and WINFUNCTYPE
-        self._c_functype_cache = self._current_session.data.cache.by_conv(_FUNCFLAG_CDECL)
-        self._win_functype_cache = self._current_session.data.cache.by_conv(_FUNCFLAG_STDCALL)
+        # Start new zugbruecke session
+        if not lazy:
+            _ = self._current_session
 
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # session, started on first access
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def _current_session(self) -> SessionClientABC:
+
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = SessionClient(config=self._config, startup_hook=self._startup_hook)
+
+        return self._session
+
+    @property
+    def _c_functype_cache(self) -> Dict:
+        """
+        Used as cache by CFUNCTYPE
+        """
+
+        return self._current_session.data.cache.by_conv(_FUNCFLAG_CDECL)
+
+    @property
+    def _win_functype_cache(self) -> Dict:
+        """
+        Used as cache by WINFUNCTYPE
+        """
+
+        return self._current_session.data.cache.by_conv(_FUNCFLAG_STDCALL)
 
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     # repr
@@ -156,11 +195,11 @@ class CtypesSession(CtypesSessionABC):
         """
 
         return '<CtypesSession id={ID:s} arch={ARCH:s} build={BUILD:s} client_up={CLIENT_UP:s} client_up={SERVER_UP:s}>'.format(
-            ID = self._current_session.id,
-            ARCH = self._current_session.config['arch'],
-            BUILD = str(self._current_session.config['pythonversion']),
-            CLIENT_UP = str(self._current_session.client_up),
-            SERVER_UP = str(self._current_session.server_up),
+            ID = self.zb_id,
+            ARCH = self._config['arch'],
+            BUILD = str(self._config['pythonversion']),
+            CLIENT_UP = str(self.zb_client_up),
+            SERVER_UP = str(self.zb_server_up),
         )
 
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -211,6 +250,16 @@ class CtypesSession(CtypesSessionABC):
     # Allow readonly access to session states
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+    def zb_callback_stats(self) -> Dict[str, int]:
+        """
+        Reports the size of the session's registry of callback routines. Callback routines are referenced weakly and released on both sides once they are garbage collected. The report has counts for callback routines referenced weakly (``weak``), anonymous callback routines which can not be referenced weakly and are cached instead (``anonymous``), garbage collected routines waiting to be released (``pending``) and the total numbers of ever registered (``registered``) and released (``unregistered``) routines. A lazy session is started if it has not been started yet.
+
+        returns:
+            Counts by name
+        """
+
+        return self._current_session.callback_stats()
+
     def zb_get_parameter(self, key: str) -> Any:
         """
         Reads configuration parameter of this session
@@ -221,24 +270,62 @@ class CtypesSession(CtypesSessionABC):
             Value for configuration parameter
         """
 
+        if self._session is None:
+            return self._config[key]
+
         return self._current_session.get_parameter(key = key)
 
     def zb_set_parameter(self, key: str, value: Any):
         """
-        Changes configuration parameter of this session (both on Unix/client and Wine/server side)
+        Changes configuration parameter of this session (both on Unix/client and Wine/server side).
+        A lazy session which has not been started yet is not started - it picks up the new value once it starts.
 
         args:
             key : Name of configuration parameter
             value : New value for configuration parameter
         """
 
-        self._current_session.set_parameter(key = key, value = value)
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    if key == "id":
+                        raise ValueError("session id can not be changed")
+                    self._config[key] = value
+                    return
+
+        self._session.set_parameter(key = key, value = value)
+
+    def zb_shared_buffer(self, data_type: Any, length: int) -> Any:
+        """
+        Allocates an array in memory shared between the Unix and the Wine side. If a ``memsync`` definition points into such an array, its contents are not copied between sides - only an offset is shipped and the DLL operates on the shared memory directly. The memory is released once the array is garbage collected.
+
+        args:
+            data_type : ctypes data type of array elements, fundamental type or struct
+            length : Number of elements
+        returns:
+            ctypes array of ``data_type``
+        """
+
+        return self._current_session.shared_buffer(data_type = data_type, length = length)
+
+    def zb_startup_report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Reports where the startup of the session spent its time. The report has two sections, ``unix`` and ``wine``, one per side, each holding the phases of the startup by name. Every phase has a ``start``, an ``end`` and a ``duration``, all in seconds. On the Unix side, times are relative to the creation of the session. On the Wine side, they are relative to the start of Python on Wine. A lazy session is started if it has not been started yet.
+
+        returns:
+            Startup phases per side
+        """
+
+        return self._current_session.startup_report()
 
     def zb_terminate(self):
         """
-        This method can be used to manually terminate a session. It will quit the *Windows* *Python* interpreter running in the background. Once terminated, a session can not be re-started. Any handles on DLLs and their routines derived from this session will become useless.
+        This method can be used to manually terminate a session. It will quit the *Windows* *Python* interpreter running in the background. Once terminated, a session can not be re-started. Any handles on DLLs and their routines derived from this session will become useless. A lazy session which has not been started yet has nothing to terminate.
         """
 
+        if self._session is None:
+            return
+
         self._current_session.terminate()
 
     @property
@@ -247,23 +334,23 @@ class CtypesSession(CtypesSessionABC):
         Session ID string
         """
 
-        return self._current_session.id
+        return self._config["id"]
 
     @property
     def zb_client_up(self) -> bool:
         """
-        Client status
+        Client status, ``False`` if a lazy session has not been started yet
         """
 
-        return self._current_session.client_up
+        return self._session is not None and self._session.client_up
 
     @property
     def zb_server_up(self) -> bool:
         """
-        Server status
+        Server status, ``False`` if a lazy session has not been started yet
         """
 
-        return self._current_session.server_up
+        return self._session is not None and self._session.server_up
 
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     # Windows vs. Unix paths
@@ -451,6 +538,7 @@ class CtypesSession(CtypesSessionABC):
         use_errno: bool = False,
         use_last_error: bool = False,
         winmode: Optional[int] = None,
+        zb_routines: Optional[List[Union[str, int]]] = None,
     ):
         """
         ``zugbruecke`` drop-in replacement for ``ctypes.CDLL``
@@ -462,6 +550,7 @@ class CtypesSession(CtypesSessionABC):
             use_errno : Enables a ``ctypes`` mechanism that allows accessing the system errno error number in a safe way.
             use_last_error : Enables the same mechanism for the Windows error code which is managed by the ``GetLastError()`` and ``SetLastError()`` Windows API functions.
             winmode : Ignored by ``zugbruecke``. Used on Windows to specify how the library is loaded (since mode is ignored)
+            zb_routines : Names or ordinals of routines which are registered right away, in the same round trip to the Wine side
         """
 
         return self._current_session.load_library(
@@ -470,6 +559,7 @@ class CtypesSession(CtypesSessionABC):
             mode=mode,
             use_errno=use_errno,
             use_last_error=use_last_error,
+            routines=zb_routines,
         )
 
     def WinDLL(
@@ -480,6 +570,7 @@ class CtypesSession(CtypesSessionABC):
         use_errno: bool = False,
         use_last_error: bool = False,
         winmode: Optional[int] = None,
+        zb_routines: Optional[List[Union[str, int]]] = None,
     ):
         """
         ``zugbruecke`` drop-in replacement for ``ctypes.WinDLL``
@@ -491,6 +582,7 @@ class CtypesSession(CtypesSessionABC):
             use_errno : Enables a ``ctypes`` mechanism that allows accessing the system errno error number in a safe way.
             use_last_error : Enables the same mechanism for the Windows error code which is managed by the ``GetLastError()`` and ``SetLastError()`` Windows API functions.
             winmode : Ignored by ``zugbruecke``. Used on Windows to specify how the library is loaded (since mode is ignored)
+            zb_routines : Names or ordinals of routines which are registered right away, in the same round trip to the Wine side
         """
 
         return self._current_session.load_library(
@@ -499,6 +591,7 @@ class CtypesSession(CtypesSessionABC):
             mode=mode,
             use_errno=use_errno,
             use_last_error=use_last_error,
+            routines=zb_routines,
         )
 
     def OleDLL(
@@ -509,6 +602,7 @@ class CtypesSession(CtypesSessionABC):
         use_errno: bool = False,
         use_last_error: bool = False,
         winmode: Optional[int] = None,
+        zb_routines: Optional[List[Union[str, int]]] = None,
     ):
         """
         ``zugbruecke`` drop-in replacement for ``ctypes.CDLL``
@@ -520,6 +614,7 @@ class CtypesSession(CtypesSessionABC):
             use_errno : Enables a ``ctypes`` mechanism that allows accessing the system errno error number in a safe way.
             use_last_error : Enables the same mechanism for the Windows error code which is managed by the ``GetLastError()`` and ``SetLastError()`` Windows API functions.
             winmode : Ignored by ``zugbruecke``. Used on Windows to specify how the library is loaded (since mode is ignored)
+            zb_routines : Names or ordinals of routines which are registered right away, in the same round trip to the Wine side
         """
 
         return self._current_session.load_library(
@@ -528,6 +623,7 @@ class CtypesSession(CtypesSessionABC):
             mode=mode,
             use_errno=use_errno,
             use_last_error=use_last_error,
+            routines=zb_routines,
         )
 
     def PyDLL(
@@ -538,6 +634,7 @@ class CtypesSession(CtypesSessionABC):
         use_errno: bool = False,
         use_last_error: bool = False,
         winmode: Optional[int] = None,
+        zb_routines: Optional[List[Union[str, int]]] = None,
     ):
         """
         Stub, not implemented. ``zugbruecke`` drop-in replacement for ``ctypes.PyDLL``
@@ -549,6 +646,7 @@ class CtypesSession(CtypesSessionABC):
             use_errno : Enables a ``ctypes`` mechanism that allows accessing the system errno error number in a safe way.
             use_last_error : Enables the same mechanism for the Windows error code which is managed by the ``GetLastError()`` and ``SetLastError()`` Windows API functions.
             winmode : Ignored by ``zugbruecke``. Used on Windows to specify how the library is loaded (since mode is ignored)
+            zb_routines : Names or ordinals of routines which are registered right away, in the same round trip to the Wine side
         """
 
         raise NotImplementedError()
@@ -37,22 +37,30 @@ from ctypes import (
     _FUNCFLAG_USE_ERRNO,
     _FUNCFLAG_USE_LASTERROR,
     DEFAULT_MODE,
+    sizeof,
 )
+import os
 import signal
+from threading import Condition, Lock, current_thread, main_thread
 import time
 from types import FrameType
-from typing import Any, Optional, Type
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
-from .abc import DataABC, SessionClientABC
-from .const import _FUNCFLAG_STDCALL, CONVENTIONS
+from .abc import DataABC, InterpreterABC, SessionClientABC
+from .const import _FUNCFLAG_STDCALL, CONFIG_FLD, CONVENTIONS, SIGNATURE_FLD, TRANSPORTS
 from .config import Config
+from .daemon import AttachedInterpreter
 from .data import Data
 from .definitions import DefinitionFunc
 from .dll_client import DllClient
 from .interpreter import Interpreter
-from .lib import get_free_port, get_hash_of_string
+from .lib import get_free_port, get_hash_of_string, get_randhashstr
 from .log import Log
 from .rpc import RpcClient, RpcServer
+from .shm import ShmTransport
+from .signature_cache import SignatureCache
+from .startup import StartupTimer
 from .typeguard import typechecked
 from .wenv import Env
 
@@ -68,17 +76,30 @@ class SessionClient(SessionClientABC):
     Managing a zugbruecke session
     """
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        startup_hook: Optional[Callable[[str, float], None]] = None,
+    ):
+
+        self._startup_hook = startup_hook
+        self._startup = StartupTimer(self._on_startup_phase)
+        self._startup.begin("startup")
 
         self._p = Config() if config is None else config
         self._id = self._p["id"]
         self._dlls = {}  # loaded dlls
+        self._dlls_lock = Lock()  # dlls may be loaded from multiple threads
+        self._signatures = []  # signature caches of loaded dlls
         self._client_up = True
         self._server_up = False
+        self._server_status = Condition()  # notified by session server, see set_server_status
 
         # Store current working directory
         # self.dir_cwd = os.getcwd()
 
+        self._startup.begin("log")
+
         # Start RPC server for callback routines
         self._p["port_socket_unix"] = get_free_port()
         self._rpc_server = RpcServer(
@@ -94,54 +115,55 @@ class SessionClient(SessionClientABC):
         self._log.info(f'[session-client] Configured Wine-Python version is {str(self._p["pythonversion"]):s} for {self._p["arch"]:s}.')
         self._log.info(f'[session-client] Log socket port: {self._p["port_socket_unix"]:d}.')
 
-        # Set data cache and parser
-        self._data = Data(
-            self._log, is_server=False, callback_server=self._rpc_server
-        )
+        self._startup.end("log")
 
-        # Register session destructur
-        atexit.register(self.terminate)
-        signal.signal(signal.SIGINT, self.terminate)
-        signal.signal(signal.SIGTERM, self.terminate)
+        # Initialize interpreter session as early as possible, a pre-booted one from a daemon if possible
+        self._interpreter = None
+        if self._p["daemon"]:
+            with self._startup.phase("attach"):
+                self._interpreter = self._attach_interpreter()
 
-        # Ensure a working Wine-Python environment
-        env = Env(**self._p.export_dict())
-        env.ensure()
-        env.setup_zugbruecke()
+        if self._interpreter is None:
 
-        # Initialize interpreter session
-        self._interpreter = Interpreter(self._id, self._p, self._log)
+            # Ensure a working Wine-Python environment - stays ahead of the spawn, the interpreter runs in it.
+            # Skipped if the environment's stamp file matches, i.e. it is only expensive once.
+            with self._startup.phase("env"):
+                Env(**self._p.export_dict()).ensure_zugbruecke(validate=self._p["validate_env"])
 
-        # Wait for server to appear
-        self._wait_for_server_status_change(target_status=True)
+            # Start interpreter session
+            with self._startup.phase("spawn"):
+                self._interpreter = Interpreter(self._id, self._p, self._log, startup=self._startup)
 
-        # Fire up RPC client
-        self._rpc_client = RpcClient.from_safe_connect(
-            socket_path=("localhost", self._p["port_socket_wine"]),
-            authkey="zugbruecke_wine",
-            timeout_after_seconds=self._p["timeout_start"],
-        )
+        # Wine Python boots while the remaining Unix side is set up
+        self._startup.begin("boot")
 
-        for name in (
-            "FormatError",
-            "get_last_error",
-            "GetLastError",
-            "set_last_error",
-            "WinError",
-            "find_msvcrt",
-            "find_library",
-            "path_unix_to_wine",
-            "path_wine_to_unix",
-        ):
-            setattr(self, name, getattr(self._rpc_client, name))
+        with self._startup.phase("data"):
 
-        for name in ("load_library", "set_parameter", "terminate"):
-            setattr(
-                self,
-                f"_{name:s}_on_server",
-                getattr(self._rpc_client, name),
+            # Set data cache and parser
+            self._data = Data(
+                self._log,
+                is_server=False,
+                callback_server=self._rpc_server,
+                callback_release=self._release_callbacks,
+                callback_cache=self._p["callback_cache"],
+                compile_plans=self._p["compile_plans"],
             )
 
+            # Register session destructur
+            atexit.register(self.terminate)
+            if current_thread() is main_thread():  # not for sessions started in other threads, e.g. by pools
+                signal.signal(signal.SIGINT, self.terminate)
+                signal.signal(signal.SIGTERM, self.terminate)
+
+        # Wait for server to report that it is listening
+        self._wait_for_server_status_change(target_status=True)
+        self._startup.end("boot")
+
+        with self._startup.phase("connect"):
+            self._connect()
+
+        self._startup.end("startup")
+
         self._log.info("[session-client] STARTED.")
 
     def CFUNCTYPE(self, restype: Any, *argtypes: Any, use_errno: bool = False, use_last_error: bool = False) -> Type:
@@ -182,31 +204,61 @@ class SessionClient(SessionClientABC):
         mode: int = DEFAULT_MODE,
         use_errno: bool = False,
         use_last_error: bool = False,
+        routines: Optional[List[Union[str, int]]] = None,
     ):
 
         if convention not in CONVENTIONS:
             raise ValueError("unknown convention")
 
-        if name in self._dlls.keys():
-            return self._dlls[name]
+        routines = list(routines or [])
+
+        with self._dlls_lock:
+            if name not in self._dlls.keys():
+                self._load_library(name, convention, mode, use_errno, use_last_error, routines)
+                return self._dlls[name]
+
+        self._dlls[name].zb_register(routines)
+
+        return self._dlls[name]
+
+    def _load_library(
+        self,
+        name: str,
+        convention: str,
+        mode: int,
+        use_errno: bool,
+        use_last_error: bool,
+        routines: List[Union[str, int]],
+    ):
 
         self._log.info(f'[session-client] Attaching to DLL file "{name:s}" with calling convention "{convention:s}" ...')
 
         hash_id = get_hash_of_string(name)
 
+        signatures = None
+        if self._p["signature_cache"] and os.path.isfile(name):  # DLL file must be found on Unix side for hashing
+            signatures = SignatureCache(os.path.join(os.path.expanduser("~"), CONFIG_FLD, SIGNATURE_FLD), name)
+
         try:
-            self._load_library_on_server(
+            configured = self._load_library_on_server(
                 name,
                 hash_id,
                 convention,
                 mode,
                 use_errno,
                 use_last_error,
+                routines,
+                signatures.load() if signatures is not None else [],
             )
         except OSError as e:
             self._log.error("[session-client] ... failed!")
             raise e
 
+        if signatures is not None:
+            signatures.retain(configured)
+            self._signatures.append(signatures)
+            self._log.info(f"[session-client] ... {len(configured):d} routine(s) configured from signature cache ...")
+
         self._dlls[name] = DllClient(
             name,
             hash_id,
@@ -214,11 +266,18 @@ class SessionClient(SessionClientABC):
             self._log,
             self._rpc_client,
             self._data,
+            routines + [routine for routine in configured if routine not in routines],
+            signatures,
         )
 
         self._log.info("[session-client] ... attached.")
 
-        return self._dlls[name]
+    def callback_stats(self) -> Dict[str, int]:
+        """
+        Size of the registry of callback routines
+        """
+
+        return self._data.callbacks.stats()
 
     def get_parameter(self, key: str) -> Any:
 
@@ -229,15 +288,68 @@ class SessionClient(SessionClientABC):
         if key == "id":
             raise ValueError("session id can not be changed")
 
+        if key == "transport":
+            self._set_transport(value)
+        if key == "compile_plans":
+            self._data.compile_plans = value
+
         self._p[key] = value
+        self._log.refresh()  # environment variables take precedence
+
         self._set_parameter_on_server(key, value)
 
+    def shared_buffer(self, data_type: Any, length: int) -> Any:
+        """
+        Allocates an array in memory shared with the server
+        """
+
+        self._detach_released_segments()
+
+        size = sizeof(data_type) * length
+        if size < 1:
+            raise ValueError("shared buffer must not be empty")
+
+        fld = ShmTransport.get_folder()
+        name = f"zugbruecke_{self._id:s}_{get_randhashstr(8):s}"
+
+        self._log.info(f'[session-client] Allocating shared memory segment "{name:s}" of {size:d} bytes ...')
+
+        buffer_mmap = self._data.arena.create(fld, name, size)
+        try:
+            self._attach_segment_on_server(self.path_unix_to_wine(fld), name)
+        except Exception as e:
+            self._data.arena.detach([name])
+            raise e
+        finally:
+            os.unlink(os.path.join(fld, name))  # both sides hold a mapping now, the file is not required anymore
+
+        buffer = (data_type * length).from_buffer(buffer_mmap)
+        weakref.finalize(buffer, self._data.arena.release, name)
+
+        self._log.info("[session-client] ... allocated.")
+
+        return buffer
+
+    def startup_report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Start, end and duration in seconds of startup phases on both sides.
+        Times are relative to the start of the respective side, i.e. the creation of
+        the session on the Unix side and the start of Python on the Wine side.
+        """
+
+        return {
+            "unix": self._startup.report(),
+            "wine": self._get_startup_report_on_server(),
+        }
+
     def set_server_status(self, status: bool):
         """
         Called by session server
         """
 
-        self._server_up = status
+        with self._server_status:
+            self._server_up = status
+            self._server_status.notify_all()
 
     def terminate(
         self,
@@ -251,6 +363,7 @@ class SessionClient(SessionClientABC):
         self._log.info("[session-client] TERMINATING ...")
 
         try:
+            self._detach_released_segments()
             self._terminate_on_server()
         except EOFError:  # EOFError is raised if server socket is closed - ignore it
             self._log.info("[session-client] Remote socket closed.")
@@ -261,6 +374,8 @@ class SessionClient(SessionClientABC):
 
         self._interpreter.terminate()
         self._rpc_server.terminate()
+        self._data.arena.close()
+        self._flush_signatures()
 
         self._log.info("[session-client] TERMINATED.")
         self._log.terminate()
@@ -292,6 +407,98 @@ class SessionClient(SessionClientABC):
 
         return self._data
 
+    def _attach_interpreter(self) -> Optional[InterpreterABC]:
+
+        try:
+            return AttachedInterpreter(self._id, self._p, self._log)
+        except Exception as e:
+            self._log.warning(f"[session-client] No pre-booted server available ({type(e).__name__:s}: {str(e):s}), starting one ...")
+            return None
+
+    def _connect(self):
+
+        # Server is listening, no need to retry
+        self._rpc_client = RpcClient(
+            socket_path=("localhost", self._p["port_socket_wine"]),
+            authkey="zugbruecke_wine",
+            callback_server=self._rpc_server,  # callback routines invoked by calls
+        )
+
+        for name in (
+            "FormatError",
+            "get_last_error",
+            "GetLastError",
+            "set_last_error",
+            "WinError",
+            "find_msvcrt",
+            "find_library",
+            "path_unix_to_wine",
+            "path_wine_to_unix",
+        ):
+            setattr(self, name, getattr(self._rpc_client, name))
+
+        for name in (
+            "load_library",
+            "set_parameter",
+            "attach_segment",
+            "detach_segments",
+            "release_callbacks",
+            "get_startup_report",
+            "terminate",
+        ):
+            setattr(
+                self,
+                f"_{name:s}_on_server",
+                getattr(self._rpc_client, name),
+            )
+
+        self._set_transport(self._p["transport"])
+
+    def _detach_released_segments(self):
+
+        names = self._data.arena.pop_released()
+        if len(names) == 0:
+            return
+
+        self._detach_segments_on_server(names)  # already unmapped on the Unix side
+
+    def _flush_signatures(self):
+
+        for signatures in self._signatures:
+            try:
+                signatures.flush()
+            except OSError:
+                self._log.warning(f"[session-client] Signature cache could not be written: {signatures!r}")
+
+    def _on_startup_phase(self, name: str, duration: float):
+
+        self._log.info(f'[session-client] Startup phase "{name:s}" took {duration:0.3f} seconds.')
+
+        if self._startup_hook is not None:
+            self._startup_hook(name, duration)
+
+    def _release_callbacks(self, names: List[str]):
+
+        self._log.info(f'[session-client] Releasing {len(names):d} callback routine(s).')
+
+        self._release_callbacks_on_server(names)
+
+    def _set_transport(self, transport: str):
+
+        if transport not in TRANSPORTS:
+            raise ValueError("unknown transport")
+
+        if transport == "shm" and not ShmTransport.is_supported():
+            self._log.warning('[session-client] Shared memory transport requires an x86 processor, using "socket" instead.')
+            transport = "socket"
+
+        if transport == "shm":
+            self._rpc_client.set_transport(ShmTransport(self._id, self.path_unix_to_wine))
+        elif self._rpc_client.transport is not None:
+            self._rpc_client.set_transport(None)
+
+        self._log.info(f'[session-client] Using "{transport:s}" transport for RPC.')
+
     def _wait_for_server_status_change(self, target_status: bool):
 
         # Does the status have to change?
@@ -309,15 +516,12 @@ class SessionClient(SessionClientABC):
         # Already waited for ...
         started_waiting_at = time.time()
 
-        # Run loop until socket appears
-        while target_status != self._server_up:
-
-            # Wait before trying again
-            time.sleep(0.01)
-
-            # Time out
-            if time.time() >= (started_waiting_at + timeout_after_seconds):
-                break
+        # Block until status is pushed by session server
+        with self._server_status:
+            self._server_status.wait_for(
+                lambda: target_status == self._server_up,
+                timeout=timeout_after_seconds,
+            )
 
         # Handle timeout
         if target_status != self._server_up:
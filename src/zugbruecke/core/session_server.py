@@ -34,14 +34,15 @@ specific language governing rights and limitations under the License.
 import ctypes
 import ctypes.util
 import traceback
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from .abc import ConfigABC, SessionServerABC
+from .abc import ConfigABC, SessionServerABC, StartupTimerABC
 from .data import Data
 from .dll_server import DllServer
 from .log import Log
 from .path import PathStyles
 from .rpc import RpcClient, RpcServer
+from .startup import StartupTimer
 from .typeguard import typechecked
 
 
@@ -67,36 +68,52 @@ class SessionServer(SessionServerABC):
     Managing a zugbruecke session
     """
 
-    def __init__(self, config: ConfigABC):
+    def __init__(self, config: ConfigABC, startup: Optional[StartupTimerABC] = None):
 
         self._p = config
         self._id = self._p["id"]
         self._up = True
         self._dlls = {}
+        if startup is None:
+            startup = StartupTimer()
+            startup.begin("startup")
+        self._startup = startup  # "startup" phase has begun
 
+        self._startup.begin("connect")
         self._rpc_client = RpcClient.from_safe_connect(
             socket_path=("localhost", self._p["port_socket_unix"]),
             authkey="zugbruecke_unix",
             timeout_after_seconds=self._p["timeout_start"],
         )
+        self._startup.end("connect")
 
+        self._startup.begin("log")
         self._log = Log(self._id, self._p, rpc_client=self._rpc_client)
         self._log.info("[session-server] STARTING ...")
+        self._startup.end("log")
 
+        self._rpc_server = RpcServer(
+            ("localhost", self._p["port_socket_wine"]),
+            "zugbruecke_wine",
+            log=self._log,
+            terminate_function=self._terminate,
+        )  # listens later
+
+        self._startup.begin("data")
         self._data = Data(
-            self._log, is_server=True, callback_client=self._rpc_client
+            self._log,
+            is_server=True,
+            callback_client=self._rpc_client,
+            callback_server=self._rpc_server,  # callback routines invoked by calls are pushed back on their connections
+            compile_plans=self._p["compile_plans"],
         )
 
         path = PathStyles()
         self.path_unix_to_wine = path.unix_to_wine
         self.path_wine_to_unix = path.wine_to_unix
+        self._startup.end("data")
 
-        self._rpc_server = RpcServer(
-            ("localhost", self._p["port_socket_wine"]),
-            "zugbruecke_wine",
-            log=self._log,
-            terminate_function=self._terminate,
-        )
+        self._startup.begin("listen")
 
         for source, name in [
             (ctypes, "FormatError"),
@@ -107,7 +124,11 @@ class SessionServer(SessionServerABC):
             (ctypes.util, "find_msvcrt"),
             (ctypes.util, "find_library"),
             (self, "load_library"),
+            (self, "get_startup_report"),
             (self, "set_parameter"),
+            (self, "attach_segment"),
+            (self, "detach_segments"),
+            (self, "release_callbacks"),
             (self._rpc_server, "terminate"),
             (self, "path_unix_to_wine"),
             (self, "path_wine_to_unix"),
@@ -119,8 +140,18 @@ class SessionServer(SessionServerABC):
         self._log.info("[session-server] Serve forever ...")
 
         self._rpc_server.server_forever_in_thread(daemon=False)
+        self._startup.end("listen")
+        self._startup.end("startup")
+
         self._rpc_client.set_server_status(True)
 
+    def get_startup_report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Called by session client
+        """
+
+        return self._startup.report()
+
     def load_library(
         self,
         name: str,
@@ -129,13 +160,19 @@ class SessionServer(SessionServerABC):
         mode: int,
         use_errno: bool,
         use_last_error: bool,
-    ):
+        routines: List[Union[str, int]],
+        signatures: List[Tuple[Union[str, int], List[Dict], Optional[Dict], List[Dict]]],
+    ) -> List[Union[str, int]]:
         """
         Called by session client
+
+        Returns:
+            Names of routines configured from signature cache
         """
 
         if name in self._dlls.keys():
-            return
+            self._dlls[name].register_routines(routines)
+            return []
 
         self._log.info(f'[session-server] Attaching to DLL file "{name:s}" with calling convention "{convention:s}" ...')
 
@@ -166,6 +203,37 @@ class SessionServer(SessionServerABC):
 
         self._log.info("[session-server] ... attached.")
 
+        self._dlls[name].register_routines(routines)
+
+        return self._dlls[name].configure_signatures(signatures)
+
+    def attach_segment(self, fld: str, name: str):
+        """
+        Called by session client
+        """
+
+        self._log.info(f'[session-server] Attaching to shared memory segment "{name:s}".')
+
+        self._data.arena.attach(fld, name)
+
+    def detach_segments(self, names: List[str]):
+        """
+        Called by session client
+        """
+
+        self._log.info(f'[session-server] Detaching from {len(names):d} shared memory segment(s).')
+
+        self._data.arena.detach(names)
+
+    def release_callbacks(self, names: List[str]):
+        """
+        Called by session client
+        """
+
+        self._log.info(f'[session-server] Releasing {len(names):d} callback routine(s).')
+
+        self._data.release_callbacks(names)
+
     def set_parameter(self, key: str, value: Any):
         """
         Called by session client
@@ -173,6 +241,11 @@ class SessionServer(SessionServerABC):
 
         self._p[key] = value
 
+        if key == "compile_plans":
+            self._data.compile_plans = value
+
+        self._log.refresh()
+
     def _terminate(self):
         """
         Called by session client via RPC server termination
@@ -182,6 +255,7 @@ class SessionServer(SessionServerABC):
             return
 
         self._log.info("[session-server] TERMINATING ...")
+        self._data.arena.close()
         self._log.terminate()
         self._up = False
         self._log.info("[session-server] TERMINATED.")
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/shm.py: Shared memory transport for RPC connections
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import mmap
+from multiprocessing.connection import _ConnectionBase
+from multiprocessing.reduction import ForkingPickler
+import os
+import platform
+import struct
+import tempfile
+import time
+from typing import Any, Callable
+
+from .abc import ShmConnectionABC, ShmTransportABC
+from .const import SHM_ATTACH, SHM_CAPACITY
+from .lib import get_randhashstr, set_nodelay
+from .typeguard import typechecked
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_MAGIC = int.from_bytes(b"ZBSM", "little")
+_LENGTH = struct.Struct("<Q")
+_MASK = 0xFFFFFFFF  # counters wrap at 32 bits, ring capacities must therefore be powers of two
+
+# Publishing a counter after copying data relies on stores becoming visible in program order (total store order)
+_MACHINES = ("x86_64", "amd64", "i386", "i486", "i586", "i686", "x86")
+
+# File layout: header with 32 bit counters, followed by two data sections.
+# Ring 0 carries requests (client to server), ring 1 carries responses (server to client).
+# Counters are accessed through a memoryview of unsigned ints, which reads and writes them in one piece.
+# (``struct.pack_into`` clears its target before writing and must therefore not be used here.)
+_COUNTER_MAGIC = 0
+_COUNTER_CAPACITY = 1
+_COUNTER_CLOSED = 2
+_COUNTER_RINGS = 16  # first ring, 64 bytes into the file
+_COUNTER_RING_SIZE = 48  # head, waiting flag and tail on separate cache lines
+_COUNTER_HEAD = 0
+_COUNTER_WAITING = 16
+_COUNTER_TAIL = 32
+_DATA = 4 * (_COUNTER_RINGS + 2 * _COUNTER_RING_SIZE)
+
+# Waiting for the peer: spin first (only if there is more than one CPU), then park on the doorbell socket
+_SPIN_SECONDS = 0.0002 if (os.cpu_count() or 1) > 1 else 0.0
+_PARK_SECONDS = 0.01
+_BACKOFF_MAX_SECONDS = 0.001
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASSES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class _Ring:
+    """
+    One direction of a connection, single producer and single consumer
+    """
+
+    def __init__(self, index: int, capacity: int):
+
+        base = _COUNTER_RINGS + index * _COUNTER_RING_SIZE
+        self.head = base + _COUNTER_HEAD
+        self.waiting = base + _COUNTER_WAITING
+        self.tail = base + _COUNTER_TAIL
+        self.capacity = capacity
+        self.data = _DATA + index * capacity
+
+
+@typechecked
+class ShmConnection(ShmConnectionABC):
+    """
+    Duplex connection through a memory-mapped file, mimics ``multiprocessing.connection.Connection``
+
+    Every direction is a byte ring with free-running head and tail counters.
+    Messages are length-prefixed pickles and may be larger than a ring - they are streamed through it.
+    The socket connection which was used for setting up the ring remains open as a "doorbell":
+    A reader which has been idle for a while parks on it and gets woken up by the writer.
+
+    Counters are plain stores into the mapping without memory barriers. A counter is published
+    after the data it covers has been copied, which is only sufficient on x86, see ``ShmTransport.is_supported``.
+    """
+
+    def __init__(self, path: str, doorbell: _ConnectionBase, is_client: bool, create: bool = False, capacity: int = SHM_CAPACITY):
+
+        if create and not self._is_valid_capacity(capacity):
+            raise ValueError("capacity must be a power of two between 64 bytes and 2 GiB")
+
+        if create:
+            with open(path, "w+b") as f:
+                f.truncate(_DATA + 2 * capacity)
+                mm = mmap.mmap(f.fileno(), _DATA + 2 * capacity)
+        else:
+            with open(path, "r+b") as f:
+                mm = mmap.mmap(f.fileno(), 0)
+
+        counters = memoryview(mm)[:_DATA].cast("I")
+
+        if create:
+            counters[_COUNTER_MAGIC] = _MAGIC
+            counters[_COUNTER_CAPACITY] = capacity
+        elif counters[_COUNTER_MAGIC] != _MAGIC or not self._is_valid_capacity(counters[_COUNTER_CAPACITY]):
+            counters.release()
+            mm.close()
+            raise ValueError("not a zugbruecke shared memory file")
+
+        self._mm = mm
+        self._counters = counters
+        self._doorbell = doorbell
+        self._closed = False
+
+        set_nodelay(doorbell)  # doorbells are tiny, Nagle's algorithm would hold them back
+
+        capacity = counters[_COUNTER_CAPACITY]
+        self._tx = _Ring(0 if is_client else 1, capacity)
+        self._rx = _Ring(1 if is_client else 0, capacity)
+
+        self._tx_head = counters[self._tx.head]  # only written by this side
+        self._rx_tail = counters[self._rx.tail]  # only written by this side
+
+    def close(self):
+
+        if self._closed:
+            return
+        self._closed = True
+
+        self._counters[_COUNTER_CLOSED] = 1
+        try:
+            self._doorbell.send_bytes(b"")
+        except (OSError, ValueError):
+            pass
+
+        self._doorbell.close()
+        self._counters.release()
+        self._mm.close()
+
+    @property
+    def closed(self) -> bool:
+
+        return self._closed
+
+    def send(self, obj: Any):
+
+        self.send_bytes(ForkingPickler.dumps(obj))
+
+    def send_bytes(self, buf: Any):
+
+        if self._closed:
+            raise OSError("handle is closed")
+
+        buf = memoryview(buf).cast("B")
+        self._write(_LENGTH.pack(len(buf)))
+        self._write(buf)
+
+        if self._counters[self._tx.waiting]:  # peer is parked, ring the bell
+            self._doorbell.send_bytes(b"")
+
+    def recv(self) -> Any:
+
+        return ForkingPickler.loads(self.recv_bytes())
+
+    def recv_bytes(self) -> bytes:
+
+        if self._closed:
+            raise OSError("handle is closed")
+
+        self._wait_for_message()
+        length = _LENGTH.unpack(self._read(_LENGTH.size))[0]
+
+        return self._read(length)
+
+    def _available(self) -> int:
+
+        return (self._counters[self._rx.head] - self._rx_tail) & _MASK
+
+    def _free(self) -> int:
+
+        return self._tx.capacity - ((self._tx_head - self._counters[self._tx.tail]) & _MASK)
+
+    def _peer_closed(self) -> bool:
+
+        return self._counters[_COUNTER_CLOSED] != 0
+
+    def _park(self, timeout: float):
+
+        try:
+            if not self._doorbell.poll(timeout):
+                return
+            while self._doorbell.poll(0):
+                self._doorbell.recv_bytes()  # raises EOFError if peer is gone
+        except OSError as e:
+            raise EOFError("peer reset shared memory connection") from e
+
+    def _spin(self, ready: Callable) -> bool:
+
+        if ready():
+            return True
+
+        deadline = time.perf_counter() + _SPIN_SECONDS
+        while time.perf_counter() < deadline:
+            time.sleep(0)  # releases the GIL
+            if ready():
+                return True
+
+        return False
+
+    def _wait_for_message(self):
+
+        if self._spin(self._available):
+            return
+
+        self._counters[self._rx.waiting] = 1
+        try:
+            while self._available() == 0:
+                if self._peer_closed():
+                    raise EOFError("peer closed shared memory connection")
+                self._park(_PARK_SECONDS)
+        finally:
+            self._counters[self._rx.waiting] = 0
+
+    def _wait_for(self, ready: Callable):
+
+        if self._spin(ready):
+            return
+
+        delay = _BACKOFF_MAX_SECONDS / 16
+        while not ready():
+            if self._peer_closed():
+                raise EOFError("peer closed shared memory connection")
+            self._park(0.0)
+            time.sleep(delay)
+            delay = min(delay * 2, _BACKOFF_MAX_SECONDS)
+
+    def _write(self, data: Any):
+
+        ring = self._tx
+        length = len(data)
+        offset = 0
+
+        while offset < length:
+            free = self._free()
+            if free == 0:
+                self._wait_for(self._free)
+                continue
+            position = self._tx_head % ring.capacity
+            chunk = min(free, length - offset, ring.capacity - position)
+            start = ring.data + position
+            self._mm[start : start + chunk] = data[offset : offset + chunk]
+            offset += chunk
+            self._tx_head = (self._tx_head + chunk) & _MASK
+            self._counters[ring.head] = self._tx_head  # publish, after data has been copied (x86 keeps store order)
+
+    def _read(self, length: int) -> bytes:
+
+        ring = self._rx
+        parts = []
+        remaining = length
+
+        while remaining > 0:
+            available = self._available()
+            if available == 0:
+                self._wait_for(self._available)
+                continue
+            position = self._rx_tail % ring.capacity
+            chunk = min(available, remaining, ring.capacity - position)
+            start = ring.data + position
+            parts.append(self._mm[start : start + chunk])
+            remaining -= chunk
+            self._rx_tail = (self._rx_tail + chunk) & _MASK
+            self._counters[ring.tail] = self._rx_tail  # release
+
+        if len(parts) == 1:
+            return parts[0]
+        return b"".join(parts)
+
+    @staticmethod
+    def _is_valid_capacity(capacity: int) -> bool:
+
+        return 64 <= capacity <= 2 ** 31 and capacity & (capacity - 1) == 0
+
+    @classmethod
+    def from_attach_request(cls, doorbell: _ConnectionBase, fld: str, fn: str) -> ShmConnectionABC:
+        """
+        Server side: Maps the file announced by the client and acknowledges via the socket
+        """
+
+        connection = cls(os.path.join(fld, fn), doorbell, is_client=False)
+        doorbell.send(True)
+
+        return connection
+
+
+@typechecked
+class ShmTransport(ShmTransportABC):
+    """
+    Upgrades freshly opened RPC client connections to shared memory connections
+
+    Args:
+        session_id : Used for naming the memory-mapped files
+        path_unix_to_wine : Translates the Unix path of a folder to a path that the server side can open
+        capacity : Size of one ring in bytes
+    """
+
+    def __init__(self, session_id: str, path_unix_to_wine: Callable, capacity: int = SHM_CAPACITY):
+
+        self._session_id = session_id
+        self._capacity = capacity
+
+        self._fld_unix = self.get_folder()
+        self._fld_wine = path_unix_to_wine(self._fld_unix)
+
+    def upgrade(self, connection: _ConnectionBase) -> ShmConnectionABC:
+
+        fn = f"zugbruecke_{self._session_id:s}_{get_randhashstr(8):s}"
+        path = os.path.join(self._fld_unix, fn)
+
+        shm = ShmConnection(path, connection, is_client=True, create=True, capacity=self._capacity)
+        try:
+            connection.send((SHM_ATTACH, (self._fld_wine, fn), {}))
+            result = connection.recv()
+        finally:
+            os.unlink(path)  # both sides hold a mapping now, the file is not required anymore
+
+        if isinstance(result, Exception):
+            shm.close()
+            raise result
+
+        return shm
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Shared memory connections rely on the memory ordering of x86 processors
+        """
+
+        return platform.machine().lower() in _MACHINES
+
+    @staticmethod
+    def get_folder() -> str:
+        """
+        Prefers tmpfs if available
+        """
+
+        if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+            return "/dev/shm"
+
+        return tempfile.gettempdir()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/signature_cache.py: Packed definitions of routines kept on disk
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import hashlib
+import os
+import pickle
+import tempfile
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import zugbruecke
+
+from .abc import SignatureCacheABC
+from .lib import get_hash_of_string
+from .typeguard import typechecked
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class SignatureCache(SignatureCacheABC):
+    """
+    Unix side. Packed definitions of the routines of one DLL file, kept on disk across sessions.
+
+    There is one file per DLL file, named after the hash of its absolute path. Its entries are
+    valid for one version of *zugbruecke* and one state of the DLL file, i.e. the hash of its
+    contents. The DLL file is only hashed again if its size or modification time change.
+    Files are replaced atomically. Concurrent sessions merge their entries, the last one wins.
+
+    Args:
+        fld : Folder of cache files
+        path : Path of DLL file
+    """
+
+    def __init__(self, fld: str, path: str):
+
+        self._fld = fld
+        self._path = os.path.abspath(path)
+        self._fn = os.path.join(fld, f"{get_hash_of_string(self._path)[:32]:s}.pickle")
+
+        self._stat = None  # size and modification time of DLL file, belonging to hash
+        self._hash = None  # of DLL file
+
+        self._signatures = {}  # by routine name: packed definitions the Wine side is configured with
+        self._changed = False
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+
+        return f'<SignatureCache path="{self._path:s}" routines={len(self._signatures):d}>'
+
+    def __len__(self) -> int:
+
+        return len(self._signatures)
+
+    def load(self) -> List[Tuple[Union[str, int], List[Dict], Optional[Dict], List[Dict]]]:
+        """
+        Reads cache file if it is valid for DLL file
+
+        Returns:
+            Routine names and their packed definitions
+        """
+
+        signatures = self._read()
+
+        with self._lock:
+            self._signatures = {} if signatures is None else signatures
+            return [(name, *packed) for name, packed in self._signatures.items()]
+
+    def retain(self, names: List[Union[str, int]]):
+        """
+        Drops all signatures except for the named ones, i.e. the ones the Wine side has been configured with
+        """
+
+        with self._lock:
+            self._signatures = {name: self._signatures[name] for name in names if name in self._signatures}
+
+    def get(self, name: Union[str, int]) -> Optional[Tuple[List[Dict], Optional[Dict], List[Dict]]]:
+        """
+        Packed definitions of routine the Wine side is configured with, if any
+        """
+
+        return self._signatures.get(name)
+
+    def set(self, name: Union[str, int], packed: Tuple[List[Dict], Optional[Dict], List[Dict]]):
+        """
+        Records packed definitions of a routine the Wine side has been configured with
+        """
+
+        with self._lock:
+            if self._signatures.get(name) == packed:
+                return
+            self._signatures[name] = packed
+            self._changed = True
+
+    def flush(self):
+        """
+        Writes cache file if signatures have been added or changed since it was read
+        """
+
+        if not self._changed:
+            return
+
+        signatures = self._read() or {}  # entries of concurrent sessions
+
+        with self._lock:
+            signatures.update(self._signatures)
+            self._changed = False
+
+        self._write(signatures)
+
+    def _get_hash(self) -> str:
+
+        stat = self._get_stat()
+
+        if self._stat == stat:
+            return self._hash
+
+        sha256 = hashlib.sha256()
+        with open(self._path, "rb") as f:
+            for chunk in iter(lambda: f.read(2 ** 20), b""):
+                sha256.update(chunk)
+
+        self._stat, self._hash = stat, sha256.hexdigest()
+
+        return self._hash
+
+    def _get_stat(self) -> Tuple[int, int]:
+
+        stat = os.stat(self._path)
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def _read(self) -> Optional[Dict[Union[str, int], Any]]:
+
+        try:
+            with open(self._fn, "rb") as f:
+                content = pickle.load(f)
+        except Exception:
+            return None  # missing or damaged, will be replaced
+
+        if not isinstance(content, dict):
+            return None
+        if content.get("version") != zugbruecke.__version__ or content.get("path") != self._path:
+            return None
+
+        try:
+            if content.get("stat") == self._get_stat() and self._hash is None:
+                self._stat, self._hash = content["stat"], content["hash"]  # trust hash of unchanged file
+            if content.get("hash") != self._get_hash():
+                return None
+        except OSError:
+            return None  # DLL file is gone
+
+        return content["routines"]
+
+    def _write(self, signatures: Dict[Union[str, int], Any]):
+
+        content = {
+            "version": zugbruecke.__version__,
+            "path": self._path,
+            "stat": self._get_stat(),
+            "hash": self._get_hash(),
+            "routines": signatures,
+        }
+
+        os.makedirs(self._fld, exist_ok = True)
+
+        fd, tmp = tempfile.mkstemp(dir = self._fld, prefix = os.path.basename(self._fn))
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(content, f)
+        os.replace(tmp, self._fn)  # atomic, concurrent sessions never read a partial file
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/core/startup.py: Timing of session startup phases
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from contextlib import contextmanager
+import time
+from typing import Callable, ContextManager, Dict, Optional, Tuple
+
+from .abc import StartupTimerABC
+from .typeguard import typechecked
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class StartupTimer(StartupTimerABC):
+    """
+    Records start and end of phases of a session's startup, relative to the creation of the timer.
+    Phases may overlap, e.g. booting Wine Python and setting up the Unix side.
+
+    Args:
+        hook : Called with name and duration in seconds once a phase has ended
+    """
+
+    def __init__(self, hook: Optional[Callable[[str, float], None]] = None):
+
+        self._hook = hook
+        self._started = time.monotonic()
+        self._phases = {}  # name: [start, end]
+
+    def __repr__(self) -> str:
+
+        return f'<StartupTimer phases={len(self._phases):d}>'
+
+    @property
+    def phases(self) -> Dict[str, Tuple[float, Optional[float]]]:
+        """
+        Start and end of phases in seconds, end is ``None`` if a phase has not ended yet
+        """
+
+        return {name: (start, end) for name, (start, end) in self._phases.items()}
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Start, end and duration in seconds of phases which have ended, can be shipped via RPC
+        """
+
+        return {
+            name: dict(start = start, end = end, duration = end - start)
+            for name, (start, end) in self._phases.items()
+            if end is not None
+        }
+
+    def begin(self, name: str):
+        """
+        Args:
+            - name: name of phase
+        """
+
+        self._phases[name] = [time.monotonic() - self._started, None]
+
+    def end(self, name: str):
+        """
+        Args:
+            - name: name of phase, must have begun
+        """
+
+        phase = self._phases[name]
+        phase[1] = time.monotonic() - self._started
+
+        if self._hook is not None:
+            self._hook(name, phase[1] - phase[0])
+
+    @contextmanager
+    def phase(self, name: str) -> ContextManager:
+        """
+        Context manager, begins and ends a phase
+
+        Args:
+            - name: name of phase
+        """
+
+        self.begin(name)
+        yield
+        self.end(name)
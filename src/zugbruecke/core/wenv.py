@@ -32,14 +32,19 @@ specific language governing rights and limitations under the License.
 
 
 import importlib
+import json
 import os
 import shutil
 import site
+import tempfile
+from typing import Any, Dict
 import warnings
 
 import zugbruecke
 from wenv import Env as _Env, __version__ as wenv_version
 
+from .const import ENV_STAMP_FN
+from .lib import get_hash_of_string
 from .typeguard import typechecked
 
 
@@ -80,6 +85,34 @@ class Env(_Env):
         kwargs : An arbitrary number of keyword arguments matching valid ``wenv`` configuration options.
     """
 
+    def ensure_zugbruecke(self, validate: bool = False):
+        """
+        Calls ``ensure`` and ``setup_zugbruecke`` unless a previous call has already done so
+        for identical versions of ``zugbruecke`` and ``wenv``, architecture, *Python* version and prefix.
+        A successful call leaves a stamp file in the *Windows Python* environment recording these values.
+
+        args:
+            validate : Ignore the stamp file, always run ``ensure`` and ``setup_zugbruecke``.
+        """
+
+        stamp = self._get_stamp()
+
+        if not validate and self._read_stamp() == stamp:
+            return
+
+        self.ensure()
+        self.setup_zugbruecke()
+
+        self._write_stamp(stamp)
+
+    def get_fingerprint(self) -> str:
+        """
+        Identifies the environment by hashing the values recorded in its stamp file.
+        Environments with identical fingerprints are interchangeable.
+        """
+
+        return get_hash_of_string(json.dumps(self._get_stamp(), sort_keys = True))
+
     def setup_zugbruecke(self):
         """
         Creates symlinks from ``site-packages`` folder in the *Unix Python* environment
@@ -139,3 +172,32 @@ class Env(_Env):
             if not os.path.exists(wine_dist_path):
                 # Copy zugbruecke dist into wine-python site-packages
                 shutil.copytree(unix_dist_path, wine_dist_path)
+
+    def _get_stamp(self) -> Dict[str, Any]:
+
+        return {
+            "zugbruecke": zugbruecke.__version__,
+            "zugbruecke_path": os.path.abspath(os.path.dirname(zugbruecke.__file__)),
+            "wenv": wenv_version,
+            "arch": self._p["arch"],
+            "pythonversion": str(self._p["pythonversion"]),
+            "prefix": self._p["prefix"],
+            "copy_modules": bool(self._p["copy_modules"]),
+        }
+
+    def _read_stamp(self) -> Any:
+
+        try:
+            with open(os.path.join(self._path_dict["pythonprefix"], ENV_STAMP_FN), "r", encoding="utf-8") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None  # missing or damaged, environment will be validated
+
+    def _write_stamp(self, stamp: Dict[str, Any]):
+
+        fld = self._path_dict["pythonprefix"]
+
+        fd, tmp = tempfile.mkstemp(dir = fld, prefix = ENV_STAMP_FN)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(stamp))
+        os.replace(tmp, os.path.join(fld, ENV_STAMP_FN))  # atomic, concurrent sessions never read a partial stamp
@@ -31,6 +31,8 @@ specific language governing rights and limitations under the License.
 # IMPORT: zugbruecke core
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from typing import Any as _Any
+
 from ..core.session import (
     CtypesSession as _CtypesSession,
     _ctypes_veryprivate,
@@ -41,10 +43,30 @@ from ..core.session import (
 # Setup module
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-_session = _CtypesSession()
+# Wine is started on first use, e.g. when a DLL is loaded
+_session = _CtypesSession(lazy = True)
+
+# Static members and methods - properties may require the session to be started
 _globals = globals()
-for _ctypes_item in dir(_session):
+for _ctypes_item in dir(_CtypesSession):
     if _ctypes_item.startswith("__") and not _ctypes_item in _ctypes_veryprivate:
         continue
+    if isinstance(getattr(_CtypesSession, _ctypes_item), property):
+        continue
     _globals[_ctypes_item] = getattr(_session, _ctypes_item)
-del _globals, _session, _CtypesSession, _ctypes_item, _ctypes_veryprivate
+
+# Star imports do not use __getattr__ - public properties, e.g. cdll, must be listed
+__all__ = [_ctypes_item for _ctypes_item in dir(_CtypesSession) if not _ctypes_item.startswith("_")]
+
+del _globals, _CtypesSession, _ctypes_item, _ctypes_veryprivate
+
+
+def __getattr__(name: str) -> _Any:
+    """
+    Properties of the session, e.g. ``cdll``, evaluated on access
+    """
+
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(_session, name)
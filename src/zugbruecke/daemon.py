@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    src/zugbruecke/daemon.py: Keeps pre-booted Wine Python servers for sessions of other processes
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+from pprint import pprint
+
+from .core.config import Config
+from .core.const import DAEMON_SIZE
+from .core.daemon import Daemon, get_daemon_path
+from .core.rpc import RpcClient
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def run():
+
+    parser = argparse.ArgumentParser(
+        description = "Keeps pre-booted Wine Python servers for zugbruecke sessions of other processes",
+    )
+    parser.add_argument("--size", type=int, nargs=1, default=[DAEMON_SIZE], help="number of idle servers")
+    parser.add_argument("--status", action="store_true", help="show status of running daemon")
+    parser.add_argument("--stop", action="store_true", help="terminate running daemon")
+    args = parser.parse_args()
+
+    config = Config()
+
+    if args.status or args.stop:
+        client = RpcClient(get_daemon_path(config), "zugbruecke_daemon")
+        if args.status:
+            pprint(client.status())
+        if args.stop:
+            client.terminate()
+        return
+
+    daemon = Daemon(config, size=args.size[0])
+    daemon.serve_forever()
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+if __name__ == "__main__":
+
+    run()
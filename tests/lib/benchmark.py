@@ -45,7 +45,7 @@ from typeguard import typechecked
 from wenv import EnvConfig, PythonVersion
 
 from .cmd import run_cmd
-from .const import ARCHITECTURE, ARCHS, CONVENTIONS, PLATFORM, PYTHONBUILDS_FN
+from .const import ARCHITECTURE, ARCHS, CONVENTIONS, PLATFORM, PYTHONBUILDS_FN, TRANSPORTS
 from .names import get_benchmark_fld
 from .pythonversion import read_python_builds
 
@@ -89,12 +89,17 @@ def _permutations(fn: str):
 
 
 @typechecked
-def benchmark(fn: str, initializer: Callable) -> Any:
+def benchmark(fn: str, initializer: Callable, compile_plans: bool = True, log_level: int = 0, log_output: bool = True) -> Any:
     """
-    Decorator for benchmark functions
+    Decorator for benchmark functions. If a benchmark function returns something other than ``None``,
+    the return value of the fastest run is added to the report as ``details``.
 
     Args:
         - fn: File name of Python source file
+        - initializer: Prepares DLL routine(s) for benchmark function
+        - compile_plans: Use compiled marshalling plans (only relevant on Unix side)
+        - log_level: Log level, ``0`` disables logging (only relevant on Unix side)
+        - log_output: Print log messages, ``False`` discards them (only relevant on Unix side)
     Yields:
         DLL handles per calling convention, architecture and wenv Python version
     """
@@ -107,47 +112,60 @@ def benchmark(fn: str, initializer: Callable) -> Any:
             reports = []
 
             for arch, convention, ctypes, dll_handle in _permutations(fn):
+                for transport in (TRANSPORTS if PLATFORM == 'unix' else (None,)):
 
-                print(f'Benchmark ...')
+                    print(f'Benchmark ...')
 
-                func_handle = initializer(
-                    ctypes = ctypes,
-                    dll_handle = dll_handle,
-                    conv = convention,
-                )
-                min_runtime = None
-                benchmark_start = time_ns()
-                counter = 0
+                    if transport is not None:
+                        ctypes.zb_set_parameter('transport', transport)
+                        ctypes.zb_set_parameter('compile_plans', compile_plans)
+                        ctypes.zb_set_parameter('log_level', log_level)
+                        ctypes.zb_set_parameter('stdout', log_output)
+                        ctypes.zb_set_parameter('stderr', log_output)
 
-                while 1_000_000_000 > time_ns() - benchmark_start:  # at least one sec
-
-                    iteration_start = time_ns()
-
-                    func(ctypes, func_handle)
-
-                    runtime = time_ns() - iteration_start
-                    if min_runtime is None or min_runtime > runtime:
-                        min_runtime = runtime
-
-                    counter += 1
-
-                server = None
-                if PLATFORM == 'unix':
-                    server = '.'.join(str(ctypes.zb_get_parameter('pythonversion')).split('.')[:3])
-
-                report = dict(
-                    platform = PLATFORM,
-                    arch = arch,
-                    convention = convention,
-                    name = func.__name__,
-                    runtime = min_runtime,
-                    runs = counter,
-                    server = server,
-                    client = sys.version.split(' ')[0],
-                )
-                reports.append(report)
+                    func_handle = initializer(
+                        ctypes = ctypes,
+                        dll_handle = dll_handle,
+                        conv = convention,
+                    )
+                    min_runtime = None
+                    min_details = None
+                    benchmark_start = time_ns()
+                    counter = 0
+
+                    while 1_000_000_000 > time_ns() - benchmark_start:  # at least one sec
+
+                        iteration_start = time_ns()
+
+                        details = func(ctypes, func_handle)
+
+                        runtime = time_ns() - iteration_start
+                        if min_runtime is None or min_runtime > runtime:
+                            min_runtime = runtime
+                            min_details = details
+
+                        counter += 1
+
+                    server = None
+                    if PLATFORM == 'unix':
+                        server = '.'.join(str(ctypes.zb_get_parameter('pythonversion')).split('.')[:3])
+
+                    report = dict(
+                        platform = PLATFORM,
+                        arch = arch,
+                        convention = convention,
+                        name = func.__name__,
+                        runtime = min_runtime,
+                        runs = counter,
+                        server = server,
+                        client = sys.version.split(' ')[0],
+                        transport = transport,
+                    )
+                    if min_details is not None:
+                        report['details'] = min_details  # of fastest run
+                    reports.append(report)
 
-                print(pf(report))
+                    print(pf(report))
 
             return reports
 
@@ -232,16 +250,27 @@ def _make_table(name: str, group: Dict, doc: str):
     with open(os.path.join('docs', 'source', f'benchmark_{name}.rst'), mode = 'w', encoding="utf-8") as f:
 
         f.write(f'.. csv-table:: "{name:s}" benchmark, CPython {sys.version.split(" ")[0]:s} on {sys.platform:s}, versions of CPython on Wine\n')
-        f.write('    :header: "version", "arch", "convention", "ctypes [µs]", "zugbruecke [µs]", "overhead [µs]"\n')
+        f.write('    :header: "version", "arch", "convention", "ctypes [µs]", ')
+        f.write(''.join(f'"zugbruecke {transport:s} [µs]", "overhead {transport:s} [µs]", ' for transport in TRANSPORTS)[:-2])
+        f.write('\n')
         f.write('    :delim: 0x0003B\n')
         f.write('\n')
 
         for version, arch, conv in keys:
-            unix, wine = group[(version, arch, conv)]
-            if unix['server'] is None:
-                unix, wine = wine, unix
-            unix, wine = round(unix['runtime'] / 1e3, 1), round(wine['runtime'] / 1e3, 1)
-            f.write(f'    "{version:s}"; "{arch:s}"; "{conv:s}"; {wine:,.01f}; {unix:,.01f}; {unix-wine:,.01f}\n')
+            wine, unix = None, {}
+            for entry in group[(version, arch, conv)]:
+                runtime = round(entry['runtime'] / 1e3, 1)
+                if entry['server'] is None:
+                    wine = runtime
+                else:
+                    unix[entry.get('transport', 'socket')] = runtime  # older reports lack transport
+            f.write(f'    "{version:s}"; "{arch:s}"; "{conv:s}"; {wine:,.01f}')
+            for transport in TRANSPORTS:
+                if transport in unix.keys():
+                    f.write(f'; {unix[transport]:,.01f}; {unix[transport]-wine:,.01f}')
+                else:
+                    f.write('; ; ')
+            f.write('\n')
 
         f.write('\n')
         for line in doc.split('\n'):
@@ -46,6 +46,8 @@ elif platform.startswith("win"):
 else:
     raise SystemError("unsopported platform")
 
+TRANSPORTS = ("socket", "shm")
+
 HEADER_FN = "tmp_header.h"
 SOURCE_FN = "tmp_source.c"
 
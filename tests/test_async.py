@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_async.py: Tests asynchronous calls
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int32_t {{ SUFFIX }} add_ints(
+    int32_t a,
+    int32_t b
+    );
+
+{{ PREFIX }} int32_t {{ SUFFIX }} divmod_ints(
+    int32_t a,
+    int32_t b,
+    int32_t *rest
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int32_t {{ SUFFIX }} add_ints(
+    int32_t a,
+    int32_t b
+    )
+{
+    return a + b;
+}
+
+{{ PREFIX }} int32_t {{ SUFFIX }} divmod_ints(
+    int32_t a,
+    int32_t b,
+    int32_t *rest
+    )
+{
+    *rest = a % b;
+    return a / b;
+}
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] *= factor;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import asyncio
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_submit(arch, conv, ctypes, dll_handle):
+    """
+    Test many calls in flight, scalars and pointers
+    """
+
+    add_ints = dll_handle.add_ints
+    add_ints.argtypes = (ctypes.c_int32, ctypes.c_int32)
+    add_ints.restype = ctypes.c_int32
+
+    futures = [add_ints.zb_submit(x, 3) for x in range(500)]
+    assert [future.result() for future in futures] == [x + 3 for x in range(500)]
+
+    with pytest.raises(TypeError):
+        add_ints.zb_submit(1)
+
+    divmod_ints = dll_handle.divmod_ints
+    divmod_ints.argtypes = (ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32))
+    divmod_ints.restype = ctypes.c_int32
+
+    rests = [ctypes.c_int32() for _ in range(100)]
+    futures = [divmod_ints.zb_submit(x, 7, rest) for x, rest in enumerate(rests)]
+    assert [future.result() for future in futures] == [x // 7 for x in range(100)]
+    assert [rest.value for rest in rests] == [x % 7 for x in range(100)]
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_acall(arch, conv, ctypes, dll_handle):
+    """
+    Test awaiting calls with memsync from asyncio
+    """
+
+    scale_ints = dll_handle.scale_ints
+    scale_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32, ctypes.c_int32)
+    scale_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+        )
+    ]
+
+    arrays = [(ctypes.c_int32 * 10)(*range(10)) for _ in range(20)]
+
+    async def main():
+        await asyncio.gather(*(
+            scale_ints.zb_acall(array, 10, factor)
+            for factor, array in enumerate(arrays)
+        ))
+
+    asyncio.run(main())
+
+    assert [array[:] for array in arrays] == [[factor * x for x in range(10)] for factor in range(20)]
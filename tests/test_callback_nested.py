@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_callback_nested.py: Tests callback routines invoked many times, from nested and submitted calls
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+typedef int16_t {{ SUFFIX }} (*compare_func_type)(int16_t a, int16_t b);
+
+{{ PREFIX }} void {{ SUFFIX }} sort_by_callback(
+    int16_t *a,
+    int16_t n,
+    compare_func_type compare
+    );
+
+{{ PREFIX }} int16_t {{ SUFFIX }} apply_callback(
+    int16_t a,
+    int16_t b,
+    compare_func_type compare
+    );
+
+{{ PREFIX }} int16_t {{ SUFFIX }} sub_ints(
+    int16_t a,
+    int16_t b
+    );
+
+typedef float {{ SUFFIX }} (*scale_func_type)(float a);
+
+{{ PREFIX }} float {{ SUFFIX }} apply_scale_callback(
+    float a,
+    scale_func_type scale
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} void {{ SUFFIX }} sort_by_callback(
+    int16_t *a,
+    int16_t n,
+    compare_func_type compare
+    )
+{
+    int16_t i, j, tmp;
+    for (i = 1; i < n; ++i)
+    {
+        tmp = a[i];
+        for (j = i; j > 0 && compare(a[j - 1], tmp) > 0; --j)
+        {
+            a[j] = a[j - 1];
+        }
+        a[j] = tmp;
+    }
+}
+
+{{ PREFIX }} int16_t {{ SUFFIX }} apply_callback(
+    int16_t a,
+    int16_t b,
+    compare_func_type compare
+    )
+{
+    return compare(a, b);
+}
+
+{{ PREFIX }} int16_t {{ SUFFIX }} sub_ints(
+    int16_t a,
+    int16_t b
+    )
+{
+    return a - b;
+}
+
+{{ PREFIX }} float {{ SUFFIX }} apply_scale_callback(
+    float a,
+    scale_func_type scale
+    )
+{
+    return scale(a);
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _get_func_type(ctypes, conv):
+
+    if conv == "cdll":
+        func_type = ctypes.CFUNCTYPE
+    elif conv == "windll":
+        func_type = ctypes.WINFUNCTYPE
+    else:
+        raise ValueError("unknown calling convention", conv)
+
+    return func_type(ctypes.c_int16, ctypes.c_int16, ctypes.c_int16)
+
+
+def _get_scale_func_type(ctypes, conv):
+
+    if conv == "cdll":
+        func_type = ctypes.CFUNCTYPE
+    elif conv == "windll":
+        func_type = ctypes.WINFUNCTYPE
+    else:
+        raise ValueError("unknown calling convention", conv)
+
+    return func_type(ctypes.c_float, ctypes.c_float)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_callback_many(arch, conv, ctypes, dll_handle):
+    """
+    Test sorting with a comparison callback, one call of the callback per comparison
+    """
+
+    CompareFunc = _get_func_type(ctypes, conv)
+
+    sort_by_callback = dll_handle.sort_by_callback
+    sort_by_callback.argtypes = (ctypes.POINTER(ctypes.c_int16), ctypes.c_int16, CompareFunc)
+    sort_by_callback.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int16,
+        )
+    ]
+
+    calls = []
+
+    @CompareFunc
+    def compare(a, b):
+        calls.append((a, b))
+        return (a > b) - (a < b)
+
+    values = (ctypes.c_int16 * 50)(*range(50, 0, -1))
+    sort_by_callback(ctypes.cast(ctypes.pointer(values), ctypes.POINTER(ctypes.c_int16)), 50, compare)
+
+    assert values[:] == list(range(1, 51))
+    assert len(calls) == 50 * 49 // 2
+    assert calls[0] == (50, 49)
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_callback_nested(arch, conv, ctypes, dll_handle):
+    """
+    Test callback routines calling routines, which again call callback routines
+    """
+
+    CompareFunc = _get_func_type(ctypes, conv)
+
+    apply_callback = dll_handle.apply_callback
+    apply_callback.argtypes = (ctypes.c_int16, ctypes.c_int16, CompareFunc)
+    apply_callback.restype = ctypes.c_int16
+
+    sub_ints = dll_handle.sub_ints
+    sub_ints.argtypes = (ctypes.c_int16, ctypes.c_int16)
+    sub_ints.restype = ctypes.c_int16
+
+    @CompareFunc
+    def inner(a, b):
+        return sub_ints(a, b)
+
+    @CompareFunc
+    def outer(a, b):
+        return apply_callback(a, b, inner) * 10 + sub_ints(b, a)
+
+    assert apply_callback(7, 3, inner) == 4
+    assert apply_callback(7, 3, outer) == 36
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_callback_float_overflow(arch, conv, ctypes, dll_handle):
+    """
+    Test callback routines returning floats out of range, which ctypes turns into infinity
+    """
+
+    ScaleFunc = _get_scale_func_type(ctypes, conv)
+
+    apply_scale_callback = dll_handle.apply_scale_callback
+    apply_scale_callback.argtypes = (ctypes.c_float, ScaleFunc)
+    apply_scale_callback.restype = ctypes.c_float
+
+    @ScaleFunc
+    def scale(a):
+        return a * 1e300
+
+    assert apply_scale_callback(0.5, scale) == float("inf")
+    assert apply_scale_callback(0.0, scale) == 0.0
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_callback_submit(arch, conv, ctypes, dll_handle):
+    """
+    Test callback routines invoked by submitted calls, served in parallel on the Wine side
+    """
+
+    CompareFunc = _get_func_type(ctypes, conv)
+
+    apply_callback = dll_handle.apply_callback
+    apply_callback.argtypes = (ctypes.c_int16, ctypes.c_int16, CompareFunc)
+    apply_callback.restype = ctypes.c_int16
+
+    @CompareFunc
+    def multiply(a, b):
+        return a * b
+
+    futures = [apply_callback.zb_submit(x, 3, multiply) for x in range(50)]
+    assert [future.result() for future in futures] == [x * 3 for x in range(50)]
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_callback_registry.py: Tests releasing of callback routines
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+typedef int16_t {{ SUFFIX }} (*conveyor_belt)(int16_t index);
+
+{{ PREFIX }} int16_t {{ SUFFIX }} apply_callback(
+    int16_t in_data,
+    conveyor_belt process_data
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int16_t {{ SUFFIX }} apply_callback(
+    int16_t in_data,
+    conveyor_belt process_data
+    )
+{
+    return process_data(in_data);
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import gc
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_callback_registry():
+    """
+    Test naming, weak references and eviction of anonymous callables
+    """
+
+    from zugbruecke.core.callback_registry import CallbackRegistry
+    from zugbruecke.core.rpc import RpcServer
+
+    released = []
+    server = RpcServer(("localhost", 0), "zugbruecke_test")  # does not listen unless served
+    registry = CallbackRegistry(rpc_server = server, maxsize = 2, release = released.extend)
+
+    def factory(name, handler):
+        server.register_function(handler, public_name = name)
+
+    class Handler:
+        def method(self, number):
+            return number
+
+    class Anonymous:
+        __slots__ = ()  # can not be referenced weakly
+        def __call__(self, number):
+            return number
+
+    def func(number):
+        return number
+
+    handler = Handler()
+    anonymous_a, anonymous_b, anonymous_c = Anonymous(), Anonymous(), Anonymous()
+
+    name_func = registry.add(func, factory)
+    name_method = registry.add(handler.method, factory)
+    assert name_func != name_method
+    assert registry.add(func, factory) == name_func
+    assert registry.get(handler.method) == name_method  # new bound method object, same name
+    assert registry.stats()["weak"] == 2
+
+    del func, handler
+    gc.collect()
+    assert registry.stats()["pending"] == 2
+
+    name_a = registry.add(anonymous_a, factory)
+    assert sorted(released) == sorted([name_func, name_method])
+    assert registry.stats()["weak"] == 0
+
+    registry.add(anonymous_b, factory)
+    registry.add(anonymous_a, factory)  # most recently used
+    registry.add(anonymous_c, factory)  # evicts anonymous_b
+    assert registry.get(anonymous_b) is None
+    assert registry.get(anonymous_a) == name_a
+
+    registry.flush()
+    stats = registry.stats()
+    assert stats["anonymous"] == 2
+    assert stats["registered"] == 5
+    assert stats["unregistered"] == 3
+    assert len(released) == 3
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_callback_release(arch, conv, ctypes, dll_handle):
+    """
+    Test that garbage collected callback routines are released on both sides
+    """
+
+    if conv == "cdll":
+        func_type = ctypes.CFUNCTYPE
+    elif conv == "windll":
+        func_type = ctypes.WINFUNCTYPE
+    else:
+        raise ValueError("unknown calling convention", conv)
+
+    ConveyorBelt = func_type(ctypes.c_int16, ctypes.c_int16)
+
+    apply_callback = dll_handle.apply_callback
+    apply_callback.argtypes = (ctypes.c_int16, ConveyorBelt)
+    apply_callback.restype = ctypes.c_int16
+
+    before = ctypes.zb_callback_stats()
+
+    for factor in range(1, 11):
+        process_data = ConveyorBelt(lambda number: number * factor)
+        assert apply_callback(3, process_data) == 3 * factor
+        del process_data
+        gc.collect()
+
+    after = ctypes.zb_callback_stats()
+
+    assert after["registered"] - before["registered"] == 10
+    assert after["unregistered"] - before["unregistered"] >= 9  # the last one is still pending
+    assert after["weak"] <= before["weak"] + 1
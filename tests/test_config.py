@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_config.py: Tests snapshots of resolved configuration values
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from logging import DEBUG, INFO
+
+from .lib.ctypes import PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_config_snapshot(monkeypatch):
+    """
+    Test that snapshots are read-only, cached and invalidated on change
+    """
+
+    from zugbruecke import Config
+
+    monkeypatch.delenv("ZUGBRUECKE_LOG_LEVEL", raising = False)
+    monkeypatch.delenv("ZUGBRUECKE_STDOUT", raising = False)
+
+    config = Config(log_level = DEBUG)
+    snapshot = config.snapshot()
+
+    assert snapshot.log_level == DEBUG
+    assert snapshot.platform == config["platform"]
+    assert snapshot.id == config["id"]
+    assert config.snapshot() is snapshot
+
+    with pytest.raises(AttributeError):
+        snapshot.log_level = INFO
+    with pytest.raises(AttributeError):
+        snapshot.unknown = None
+
+    monkeypatch.setenv("ZUGBRUECKE_LOG_LEVEL", str(INFO))
+    assert config.snapshot().log_level == DEBUG  # environment is read once per snapshot
+
+    config["stdout"] = False
+    assert config.snapshot() is not snapshot
+    assert config.snapshot().stdout is False
+    assert config.snapshot().log_level == INFO  # environment variables take precedence
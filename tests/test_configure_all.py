@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_configure_all.py: Tests registering and configuring many routines at once
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int16_t {{ SUFFIX }} add_shorts(
+    int16_t a,
+    int16_t b
+    );
+
+{{ PREFIX }} double {{ SUFFIX }} scale_double(
+    double a,
+    double factor
+    );
+
+{{ PREFIX }} int32_t {{ SUFFIX }} sum_ints(
+    int32_t *data,
+    int32_t n
+    );
+
+{{ PREFIX }} int16_t {{ SUFFIX }} mul_shorts(
+    int16_t a,
+    int16_t b
+    );
+
+{{ PREFIX }} double {{ SUFFIX }} add_doubles(
+    double a,
+    double b
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int16_t {{ SUFFIX }} add_shorts(
+    int16_t a,
+    int16_t b
+    )
+{
+    return a + b;
+}
+
+{{ PREFIX }} double {{ SUFFIX }} scale_double(
+    double a,
+    double factor
+    )
+{
+    return a * factor;
+}
+
+{{ PREFIX }} int32_t {{ SUFFIX }} sum_ints(
+    int32_t *data,
+    int32_t n
+    )
+{
+    int32_t i, sum = 0;
+    for (i = 0; i < n; i++)
+    {
+        sum += data[i];
+    }
+    return sum;
+}
+
+{{ PREFIX }} int16_t {{ SUFFIX }} mul_shorts(
+    int16_t a,
+    int16_t b
+    )
+{
+    return a * b;
+}
+
+{{ PREFIX }} double {{ SUFFIX }} add_doubles(
+    double a,
+    double b
+    )
+{
+    return a + b;
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from threading import Thread
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_configure_all(arch, conv, ctypes, dll_path):
+    """
+    Test registering routines at load time and configuring them in one round trip
+    """
+
+    loader = ctypes.CDLL if conv == "cdll" else ctypes.WinDLL
+    dll_handle = loader(dll_path, zb_routines = ["add_shorts", "scale_double"])
+
+    add_shorts = dll_handle.add_shorts
+    add_shorts.argtypes = (ctypes.c_int16, ctypes.c_int16)
+    add_shorts.restype = ctypes.c_int16
+
+    scale_double = dll_handle.scale_double
+    scale_double.argtypes = (ctypes.c_double, ctypes.c_double)
+    scale_double.restype = ctypes.c_double
+
+    dll_handle.zb_register(["sum_ints"])
+    sum_ints = dll_handle.sum_ints
+    sum_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32)
+    sum_ints.restype = ctypes.c_int32
+    sum_ints.memsync = [dict(pointer = [0], length = [1], type = ctypes.c_int32)]
+
+    dll_handle.zb_configure_all()
+
+    assert add_shorts.configured and scale_double.configured and sum_ints.configured
+    assert add_shorts(3, 4) == 7
+    assert scale_double(1.5, 3.0) == 4.5
+    data = (ctypes.c_int32 * 4)(1, 2, 3, 4)
+    assert sum_ints(ctypes.cast(ctypes.pointer(data), ctypes.POINTER(ctypes.c_int32)), 4) == 10
+
+    with pytest.raises(AttributeError):
+        dll_handle.zb_register(["missing_routine"])
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_configure_all_threads(arch, conv, ctypes, dll_path):
+    """
+    Test that routines are configured once if first calls and configuring all of them race
+    """
+
+    loader = ctypes.CDLL if conv == "cdll" else ctypes.WinDLL
+    dll_handle = loader(dll_path, zb_routines = ["mul_shorts", "add_doubles"])
+
+    mul_shorts = dll_handle.mul_shorts
+    mul_shorts.argtypes = (ctypes.c_int16, ctypes.c_int16)
+    mul_shorts.restype = ctypes.c_int16
+
+    add_doubles = dll_handle.add_doubles
+    add_doubles.argtypes = (ctypes.c_double, ctypes.c_double)
+    add_doubles.restype = ctypes.c_double
+
+    prepared = []
+    for routine in (mul_shorts, add_doubles):
+        def prepare_configuration(routine = routine, prepare = routine.prepare_configuration):
+            prepared.append(routine)
+            return prepare()
+        routine.prepare_configuration = prepare_configuration
+
+    results = []
+    threads = [
+        Thread(target = lambda: results.append(mul_shorts(3, 4))),
+        Thread(target = dll_handle.zb_configure_all),
+        Thread(target = lambda: results.append(add_doubles(1.5, 3.0))),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [4.5, 12]
+    assert len(prepared) == 2 and prepared.count(mul_shorts) == 1
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_daemon.py: Tests sessions attaching to pre-booted servers of a daemon
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int16_t {{ SUFFIX }} add_ints(
+    int16_t a,
+    int16_t b
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int16_t {{ SUFFIX }} add_ints(
+    int16_t a,
+    int16_t b
+    )
+{
+    return a + b;
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+if PLATFORM == "unix":
+    from zugbruecke import CtypesSession
+    from zugbruecke.core.config import Config
+    from zugbruecke.core.daemon import Daemon, get_daemon_path
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_daemon_path():
+    """
+    Test that daemons are told apart by the Wine Python environment they serve
+    """
+
+    assert get_daemon_path(Config()) == get_daemon_path(Config())
+    assert get_daemon_path(Config()) != get_daemon_path(Config(copy_modules = True))
+    assert get_daemon_path(Config(arch = "win32")) != get_daemon_path(Config(arch = "win64"))
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_daemon(arch, conv, ctypes, dll_path):
+    """
+    Test sessions attaching to pre-booted servers, one after another
+    """
+
+    config = Config(arch = arch, pythonversion = ctypes.zb_get_parameter("pythonversion"))
+    if os.path.exists(get_daemon_path(config)):
+        pytest.skip("daemon already running")
+
+    daemon = Daemon(config, size = 1)
+
+    try:
+        for _ in range(2):
+
+            session = CtypesSession(daemon = True, arch = arch, pythonversion = config["pythonversion"])
+
+            try:
+                assert daemon.status()["attached"] >= 1
+
+                add_ints = getattr(session, conv).LoadLibrary(dll_path).add_ints
+                add_ints.argtypes = (session.c_int16, session.c_int16)
+                add_ints.restype = session.c_int16
+
+                assert [add_ints(x, 3) for x in range(100)] == [x + 3 for x in range(100)]
+            finally:
+                session.zb_terminate()
+    finally:
+        daemon.terminate()
+
+    assert not os.path.exists(daemon.path)
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_daemon_missing(arch, conv, ctypes, dll_path):
+    """
+    Test that sessions start their own server if there is no daemon
+    """
+
+    config = Config(arch = arch, pythonversion = ctypes.zb_get_parameter("pythonversion"))
+    if os.path.exists(get_daemon_path(config)):
+        pytest.skip("daemon running")
+
+    session = CtypesSession(daemon = True, arch = arch, pythonversion = config["pythonversion"])
+
+    try:
+        add_ints = getattr(session, conv).LoadLibrary(dll_path).add_ints
+        add_ints.argtypes = (session.c_int16, session.c_int16)
+        add_ints.restype = session.c_int16
+
+        assert add_ints(3, 4) == 7
+    finally:
+        session.zb_terminate()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_definitions.py: Tests sharing of cached definitions
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes
+
+from .lib.ctypes import PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_definitions_shared():
+    """
+    Test that definitions are cached per data type and field name and copied on write by memsync
+    """
+
+    from zugbruecke.core.cache import Cache
+    from zugbruecke.core.definitions import Definition, DefinitionMemsync
+
+    class Point(ctypes.Structure):
+        _fields_ = [("x", ctypes.c_double), ("y", ctypes.c_double)]
+
+    class Image(ctypes.Structure):
+        _fields_ = [("data", ctypes.POINTER(ctypes.c_int16)), ("length", ctypes.c_int), ("origin", Point)]
+
+    cache = Cache()
+
+    argtypes = Definition.from_data_types(cache = cache, data_types = [ctypes.POINTER(Image), Point])
+    again = Definition.from_data_types(cache = cache, data_types = [ctypes.POINTER(Image), Point])
+    assert all(a is b for a, b in zip(argtypes, again))
+    assert argtypes[0].get_field("origin") is not argtypes[1]  # field name is part of key
+    assert argtypes[0].get_field("origin").field_name == "origin"
+
+    memsyncs = DefinitionMemsync.from_raws([dict(
+        pointer = [0, "data"],
+        length = [0, "length"],
+        type = ctypes.c_int16,
+    )], cache = cache)
+    synced, _ = DefinitionMemsync.apply_many(cache = cache, memsyncs = memsyncs, argtypes = argtypes)
+
+    assert synced[0].get_field("data").is_void
+    assert not argtypes[0].get_field("data").is_void  # shared definition is unchanged
+    assert synced[0].get_field("origin") is argtypes[0].get_field("origin")
+    assert synced[1] is argtypes[1]
+    assert Definition.from_data_type(cache = cache, data_type = ctypes.POINTER(Image)) is argtypes[0]
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_definitions_bounded(monkeypatch):
+    """
+    Test that cached definitions are keyed by their data types and that the least recently used ones are dropped
+    """
+
+    from zugbruecke.core.cache import Cache
+    from zugbruecke.core.definitions import Definition
+    from zugbruecke.core.definitions import base
+
+    monkeypatch.setattr(base, "DEFINITION_CACHE_SIZE", 2)
+
+    types = [type(f"Int{idx:d}", (ctypes.c_int,), {}) for idx in range(3)]
+
+    cache = Cache()
+
+    first = Definition.from_data_type(cache = cache, data_type = types[0])
+    Definition.from_data_type(cache = cache, data_type = types[1])
+    assert Definition.from_data_type(cache = cache, data_type = types[0]) is first
+    Definition.from_data_type(cache = cache, data_type = types[2])
+
+    assert [data_type for data_type, _ in cache.definition.keys()] == [types[0], types[2]]
+    assert all(definition.data_type is data_type for (data_type, _), definition in cache.definition.items())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_env.py: Tests validation of the Wine Python environment
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_env_stamp(tmp_path):
+    """
+    Test that a validated environment is not validated again unless requested or changed
+    """
+
+    import os
+
+    from zugbruecke import Env
+
+    calls = []
+
+    class CountingEnv(Env):
+        def ensure(self):
+            os.makedirs(self._path_dict["pythonprefix"], exist_ok = True)
+            calls.append("ensure")
+        def setup_zugbruecke(self):
+            calls.append("setup_zugbruecke")
+
+    def get_env(copy_modules = False):
+        return CountingEnv(prefix = str(tmp_path), arch = "win32", copy_modules = copy_modules)
+
+    get_env().ensure_zugbruecke()
+    assert calls == ["ensure", "setup_zugbruecke"]
+
+    get_env().ensure_zugbruecke()
+    assert len(calls) == 2
+
+    get_env().ensure_zugbruecke(validate = True)
+    assert len(calls) == 4
+
+    get_env(copy_modules = True).ensure_zugbruecke()
+    assert len(calls) == 6
+    get_env(copy_modules = True).ensure_zugbruecke()
+    assert len(calls) == 6
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_lazy.py: Tests lazy start of the default session
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import subprocess
+import sys
+
+from .lib.ctypes import PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+SCRIPT = """
+import subprocess
+
+spawned = []
+
+class _Popen(subprocess.Popen):
+    def __init__(self, *args, **kwargs):
+        spawned.append(args)
+        super().__init__(*args, **kwargs)
+
+subprocess.Popen = _Popen
+
+import zugbruecke.ctypes as ctypes
+from zugbruecke.ctypes import cdll, windll, c_int, CFUNCTYPE
+from zugbruecke.ctypes.util import find_library
+
+ctypes.zb_set_parameter("log_level", 10)
+assert ctypes.zb_get_parameter("log_level") == 10
+
+assert len(spawned) == 0, spawned
+assert not ctypes.zb_client_up
+assert not ctypes.zb_server_up
+
+ctypes.zb_terminate()
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_lazy_import():
+    """
+    Test that importing zugbruecke.ctypes and configuring it does not spawn a process
+    """
+
+    proc = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        capture_output = True,
+        timeout = 60,
+    )
+
+    assert proc.returncode == 0, proc.stderr.decode("utf-8")
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_star_import():
+    """
+    Test that star imports of zugbruecke.ctypes include properties of the session
+    """
+
+    namespace = {}
+    exec("from zugbruecke.ctypes import *", namespace)
+
+    for name in ("cdll", "windll", "oledll", "pydll", "util", "zb_id", "zb_client_up", "zb_server_up", "c_int", "CFUNCTYPE"):
+        assert name in namespace, name
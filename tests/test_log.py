@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_log.py: Tests shipping and writing log messages
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import os
+from threading import Event
+import time
+
+from .lib.ctypes import PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_shipper_batches():
+    """
+    Test that messages are shipped in batches, in order and completely on termination
+    """
+
+    from zugbruecke.core.log import LogShipper
+
+    batches = []
+    shipper = LogShipper(lambda messages, dropped: batches.append((messages, dropped)), batch = 10, interval = 60.0)
+
+    for index in range(25):
+        assert shipper.put(str(index))
+
+    shipper.terminate()
+
+    assert all(dropped == 0 for _, dropped in batches)
+    assert all(len(messages) > 0 for messages, _ in batches)
+    assert [message for messages, _ in batches for message in messages] == [str(index) for index in range(25)]
+    assert len(batches) < 25
+
+    assert not shipper.put("late")
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_shipper_interval():
+    """
+    Test that waiting messages are shipped periodically
+    """
+
+    from zugbruecke.core.log import LogShipper
+
+    shipped = Event()
+    shipper = LogShipper(lambda messages, dropped: shipped.set(), batch = 1000, interval = 0.01)
+
+    shipper.put("message")
+    assert shipped.wait(timeout = 10.0)
+
+    shipper.terminate()
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_shipper_overload():
+    """
+    Test that the oldest messages are dropped and counted if shipping stalls
+    """
+
+    from zugbruecke.core.log import LogShipper
+
+    release = Event()
+    batches = []
+
+    def send(messages, dropped):
+        release.wait()
+        batches.append((messages, dropped))
+
+    shipper = LogShipper(send, size = 10, batch = 1, interval = 60.0)
+
+    shipper.put("first")
+    time.sleep(0.1)  # first message is taken, shipping stalls
+    for index in range(100):
+        shipper.put(str(index))
+
+    release.set()
+    shipper.terminate()
+
+    assert batches[0] == (["first"], 0)
+    assert [message for messages, _ in batches[1:] for message in messages] == [str(index) for index in range(90, 100)]
+    assert sum(dropped for _, dropped in batches) == 90
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_writer(tmp_path):
+    """
+    Test that buffered messages end up in the log file on termination and later ones are appended
+    """
+
+    from zugbruecke.core.log import LogWriter
+
+    fn = str(tmp_path / "log.txt")
+    writer = LogWriter(fn, interval = 60.0)
+
+    assert not os.path.exists(fn)  # opened on first message
+
+    for index in range(100):
+        writer.write(json.dumps(dict(index = index)))
+
+    writer.terminate()
+    writer.write(json.dumps(dict(index = 100)))
+
+    with open(fn, mode = "r", encoding = "utf-8") as f:
+        lines = f.read().splitlines()
+
+    assert [json.loads(line)["index"] for line in lines] == list(range(101))
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_writer_interval(tmp_path):
+    """
+    Test that buffered messages are written once the interval is over without further messages
+    """
+
+    from zugbruecke.core.log import LogWriter
+
+    fn = str(tmp_path / "log.txt")
+    writer = LogWriter(fn, interval = 0.1)
+
+    writer.write(json.dumps(dict(index = 0)))
+    time.sleep(0.5)
+
+    with open(fn, mode = "r", encoding = "utf-8") as f:
+        lines = f.read().splitlines()
+
+    writer.terminate()
+
+    assert [json.loads(line)["index"] for line in lines] == [0]
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_writer_rotate(tmp_path):
+    """
+    Test that the log file is rotated once it exceeds the given size
+    """
+
+    from zugbruecke.core.log import LogWriter
+
+    fn = str(tmp_path / "log.txt")
+    writer = LogWriter(fn, rotate = 1000)
+
+    for index in range(300):
+        writer.write(json.dumps(dict(index = index)))
+
+    writer.terminate()
+
+    assert os.path.getsize(f"{fn:s}.1") >= 1000
+    assert os.path.getsize(fn) < 1000
+
+    with open(fn, mode = "r", encoding = "utf-8") as f:
+        lines = f.read().splitlines()
+
+    assert json.loads(lines[-1])["index"] == 299
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_log_writer_rotate_bytes(tmp_path):
+    """
+    Test that rotation counts encoded bytes, not characters
+    """
+
+    from zugbruecke.core.log import LogWriter
+
+    fn = str(tmp_path / "log.txt")
+    writer = LogWriter(fn, rotate = 1000)
+
+    for _ in range(3):
+        writer.write("\u00fc" * 200)  # 401 bytes, 201 characters per line
+
+    writer.terminate()
+
+    assert os.path.getsize(f"{fn:s}.1") == 1203
+    assert not os.path.exists(fn)
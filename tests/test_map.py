@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_map.py: Tests batched calls
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int32_t {{ SUFFIX }} add_ints(
+    int32_t a,
+    int32_t b
+    );
+
+{{ PREFIX }} int32_t {{ SUFFIX }} divmod_ints(
+    int32_t a,
+    int32_t b,
+    int32_t *rest
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int32_t {{ SUFFIX }} add_ints(
+    int32_t a,
+    int32_t b
+    )
+{
+    return a + b;
+}
+
+{{ PREFIX }} int32_t {{ SUFFIX }} divmod_ints(
+    int32_t a,
+    int32_t b,
+    int32_t *rest
+    )
+{
+    *rest = a % b;
+    return a / b;
+}
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] *= factor;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from itertools import count
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("compile_plans", (True, False))
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_map_scalars(compile_plans, arch, conv, ctypes, dll_handle):
+    """
+    Test batched calls with scalars, lazily consumed and in chunks
+    """
+
+    ctypes.zb_set_parameter("compile_plans", compile_plans)
+
+    try:
+        add_ints = dll_handle.add_ints
+        add_ints.argtypes = (ctypes.c_int32, ctypes.c_int32)
+        add_ints.restype = ctypes.c_int32
+
+        assert list(add_ints.zb_map((x, 3) for x in range(5000))) == [x + 3 for x in range(5000)]
+        assert list(add_ints.zb_map([(1, 2), (2 ** 32 + 1, 2)], chunk_size = 1)) == [3, 3]
+        assert list(add_ints.zb_map([])) == []
+
+        results = add_ints.zb_map(((x, x) for x in count()), chunk_size = 7)  # infinite
+        assert [next(results) for _ in range(20)] == [2 * x for x in range(20)]
+
+        with pytest.raises(ValueError):
+            add_ints.zb_map([(1, 2)], chunk_size = 0)
+    finally:
+        ctypes.zb_set_parameter("compile_plans", True)
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_map_pointers(arch, conv, ctypes, dll_handle):
+    """
+    Test batched calls with pointers and memsync, synced per call
+    """
+
+    divmod_ints = dll_handle.divmod_ints
+    divmod_ints.argtypes = (ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32))
+    divmod_ints.restype = ctypes.c_int32
+
+    rests = [ctypes.c_int32() for _ in range(100)]
+    assert list(divmod_ints.zb_map(
+        ((x, 7, rest) for x, rest in enumerate(rests)),
+        chunk_size = 30,
+    )) == [x // 7 for x in range(100)]
+    assert [rest.value for rest in rests] == [x % 7 for x in range(100)]
+
+    scale_ints = dll_handle.scale_ints
+    scale_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32, ctypes.c_int32)
+    scale_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+        )
+    ]
+
+    arrays = [(ctypes.c_int32 * 10)(*range(10)) for _ in range(20)]
+    assert len(list(scale_ints.zb_map(
+        ((array, 10, factor) for factor, array in enumerate(arrays)),
+        chunk_size = 6,
+    ))) == 20
+    assert [array[:] for array in arrays] == [[factor * x for x in range(10)] for factor in range(20)]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_memsync_delta.py: Tests memsync shipping changed ranges only
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} void {{ SUFFIX }} increment_every(
+    uint8_t *data,
+    int32_t n,
+    int32_t step
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} void {{ SUFFIX }} increment_every(
+    uint8_t *data,
+    int32_t n,
+    int32_t step
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i += step)
+    {
+        data[i]++;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import get_context
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+@pytest.mark.parametrize("step", [1, 5000, 100000, 2 ** 20])
+def test_memsync_delta(step, arch, conv, ctypes, dll_handle):
+    """
+    Test sparse, dense and no modifications of a large block of memory
+    """
+
+    increment_every = dll_handle.increment_every
+    increment_every.argtypes = (ctypes.POINTER(ctypes.c_uint8), ctypes.c_int32, ctypes.c_int32)
+    increment_every.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_uint8,
+            delta = True,
+        )
+    ]
+
+    n = 2 ** 20 - 3  # not a multiple of chunk size
+    data = (ctypes.c_uint8 * n)(*(x % 7 for x in range(n)))
+
+    increment_every(data, n, step)
+    assert data[:] == [x % 7 + (1 if x % step == 0 else 0) for x in range(n)]
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_memsync_direction.py: Tests memsync directions, in, out and inout
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int32_t {{ SUFFIX }} sum_ints(
+    int32_t *data,
+    int32_t n
+    );
+
+{{ PREFIX }} int32_t {{ SUFFIX }} sum_and_clear_ints(
+    int32_t *data,
+    int32_t n
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} fill_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t value
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int32_t {{ SUFFIX }} sum_ints(
+    int32_t *data,
+    int32_t n
+    )
+{
+    int32_t i, sum = 0;
+    for (i = 0; i < n; i++)
+    {
+        sum += data[i];
+    }
+    return sum;
+}
+
+{{ PREFIX }} int32_t {{ SUFFIX }} sum_and_clear_ints(
+    int32_t *data,
+    int32_t n
+    )
+{
+    int32_t i, sum = 0;
+    for (i = 0; i < n; i++)
+    {
+        sum += data[i];
+        data[i] = 0;
+    }
+    return sum;
+}
+
+{{ PREFIX }} void {{ SUFFIX }} fill_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t value
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] = value;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_memsync_direction(arch, conv, ctypes, dll_handle):
+    """
+    Test input-only and output-only memory
+    """
+
+    sum_ints = dll_handle.sum_ints
+    sum_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32)
+    sum_ints.restype = ctypes.c_int32
+    sum_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+            direction = "in",
+        )
+    ]
+
+    fill_ints = dll_handle.fill_ints
+    fill_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32, ctypes.c_int32)
+    fill_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+            direction = "out",
+        )
+    ]
+
+    data = (ctypes.c_int32 * 100)(*range(100))
+    assert sum_ints(data, 100) == sum(range(100))
+    assert data[:] == list(range(100))
+
+    fill_ints(data, 100, 7)
+    assert data[:] == [7] * 100
+    assert sum_ints(data, 100) == 700
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_memsync_direction_in_not_returned(arch, conv, ctypes, dll_handle):
+    """
+    Test that changes to input-only memory are not shipped back
+    """
+
+    sum_and_clear_ints = dll_handle.sum_and_clear_ints
+    sum_and_clear_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32)
+    sum_and_clear_ints.restype = ctypes.c_int32
+    sum_and_clear_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+            direction = "in",
+        )
+    ]
+
+    data = (ctypes.c_int32 * 10)(*range(10))
+    assert sum_and_clear_ints(data, 10) == sum(range(10))
+    assert data[:] == list(range(10))
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_memsync_direction_invalid(arch, conv, ctypes, dll_handle):
+    """
+    Test unknown direction
+    """
+
+    fill_ints = dll_handle.fill_ints
+    fill_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32, ctypes.c_int32)
+    fill_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+            direction = "both",
+        )
+    ]
+
+    data = (ctypes.c_int32 * 10)()
+    with pytest.raises(ValueError):
+        fill_ints(data, 10, 1)
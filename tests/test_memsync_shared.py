@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_memsync_shared.py: Tests memsync through memory shared between Unix and Wine side
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] *= factor;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import ctypes as _ctypes
+import gc
+import weakref
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_memsync_shared(arch, conv, ctypes, dll_handle):
+    """
+    Test memsync'ed arrays in shared memory, entirely and partially
+    """
+
+    scale_ints = dll_handle.scale_ints
+    scale_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32, ctypes.c_int32)
+    scale_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+        )
+    ]
+
+    n = 2 ** 20
+    data = ctypes.zb_shared_buffer(ctypes.c_int32, n)
+    data[:] = range(n)
+
+    scale_ints(data, n, 3)
+    assert data[:] == [x * 3 for x in range(n)]
+
+    offset = ctypes.cast(ctypes.byref(data, 4 * 10), ctypes.POINTER(ctypes.c_int32))
+    scale_ints(offset, 10, -1)
+    assert data[:30] == [x * 3 for x in range(10)] + [-x * 3 for x in range(10, 20)] + [x * 3 for x in range(20, 30)]
+
+    del data, offset
+    gc.collect()
+
+    data = ctypes.zb_shared_buffer(ctypes.c_int32, 4)  # detaches released buffers
+    data[:] = [1, 2, 3, 4]
+    scale_ints(data, 4, 2)
+    assert data[:] == [2, 4, 6, 8]
+
+    with pytest.raises(ValueError):
+        ctypes.zb_shared_buffer(ctypes.c_int32, 0)
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_memsync_shared_release(tmp_path):
+    """
+    Test that segments are unmapped on the Unix side as soon as their buffers are released
+    """
+
+    from zugbruecke.core.arena import SharedArena
+
+    arena = SharedArena()
+
+    buffer = (_ctypes.c_int32 * 16).from_buffer(arena.create(str(tmp_path), "segment", 64))
+    weakref.finalize(buffer, arena.release, "segment")
+    assert len(arena) == 1
+
+    del buffer
+    gc.collect()
+
+    assert len(arena) == 0
+    assert arena.locate(0, 1) is None
+    assert arena.pop_released() == ["segment"]
+    assert arena.pop_released() == []
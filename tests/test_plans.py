@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_plans.py: Tests compiled and generic marshalling plans
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int16_t {{ SUFFIX }} divmod_plan(
+    int16_t a,
+    int16_t b,
+    int16_t *rest,
+    float *data,
+    int16_t n
+    );
+
+{{ PREFIX }} double {{ SUFFIX }} mix_scalars(
+    int8_t a,
+    uint16_t b,
+    int64_t c,
+    float d,
+    double e,
+    char f
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int16_t {{ SUFFIX }} divmod_plan(
+    int16_t a,
+    int16_t b,
+    int16_t *rest,
+    float *data,
+    int16_t n
+    )
+{
+    int16_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] = data[i] / b;
+    }
+    *rest = a % b;
+    return a / b;
+}
+
+{{ PREFIX }} double {{ SUFFIX }} mix_scalars(
+    int8_t a,
+    uint16_t b,
+    int64_t c,
+    float d,
+    double e,
+    char f
+    )
+{
+    return (double)a + b + c + d + e + f;
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("compile_plans", (True, False))
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_plans(compile_plans, arch, conv, ctypes, dll_handle):
+    """
+    Test scalars, pointers and memsync with compiled and generic marshalling plans
+    """
+
+    ctypes.zb_set_parameter("compile_plans", compile_plans)
+
+    try:
+        divmod_plan = dll_handle.divmod_plan
+        divmod_plan.argtypes = (
+            ctypes.c_int16,
+            ctypes.c_int16,
+            ctypes.POINTER(ctypes.c_int16),
+            ctypes.POINTER(ctypes.c_float),
+            ctypes.c_int16,
+        )
+        divmod_plan.restype = ctypes.c_int16
+        divmod_plan.memsync = [
+            dict(
+                pointer = [3],
+                length = [4],
+                type = ctypes.c_float,
+            )
+        ]
+
+        for a in range(1, 20):
+            rest = ctypes.c_int16()
+            data = (ctypes.c_float * 4)(2.0, 4.0, 6.0, 8.0)
+            assert divmod_plan(a, 2, rest, data, 4) == a // 2
+            assert rest.value == a % 2
+            assert data[:] == [1.0, 2.0, 3.0, 4.0]
+    finally:
+        ctypes.zb_set_parameter("compile_plans", True)
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("compile_plans", (True, False))
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_plans_fast(compile_plans, arch, conv, ctypes, dll_handle):
+    """
+    Test fundamental data types by value, eligible for the binary fast path
+    """
+
+    ctypes.zb_set_parameter("compile_plans", compile_plans)
+
+    try:
+        mix_scalars = dll_handle.mix_scalars
+        mix_scalars.argtypes = (
+            ctypes.c_int8,
+            ctypes.c_uint16,
+            ctypes.c_int64,
+            ctypes.c_float,
+            ctypes.c_double,
+            ctypes.c_char,
+        )
+        mix_scalars.restype = ctypes.c_double
+
+        assert mix_scalars(-3, 60000, 2 ** 40, 0.5, 0.25, b"a") == -3 + 60000 + 2 ** 40 + 0.5 + 0.25 + 97
+        assert mix_scalars(ctypes.c_int8(1), 2, 3, 4.0, ctypes.c_double(5.0), ctypes.c_char(b"b")) == 1 + 2 + 3 + 4 + 5 + 98
+        assert mix_scalars(1, 2 ** 16 + 2, 3, 4, 5, b"\x00") == 1 + 2 + 3 + 4 + 5  # out of range, ctypes truncates
+        assert mix_scalars(0, 0, 0, 1e300, 0.0, b"\x00") == float("inf")  # out of range, ctypes overflows to infinity
+
+        with pytest.raises(TypeError):
+            mix_scalars(1, 2, 3)
+    finally:
+        ctypes.zb_set_parameter("compile_plans", True)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_pool.py: Tests spreading calls across a pool of sessions
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int32_t {{ SUFFIX }} add_ints(
+    int32_t a,
+    int32_t b
+    );
+
+{{ PREFIX }} int32_t {{ SUFFIX }} next_counter(
+    void
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    );
+"""
+
+SOURCE = """
+static int32_t counter = 0;
+
+{{ PREFIX }} int32_t {{ SUFFIX }} add_ints(
+    int32_t a,
+    int32_t b
+    )
+{
+    return a + b;
+}
+
+{{ PREFIX }} int32_t {{ SUFFIX }} next_counter(
+    void
+    )
+{
+    return counter++;
+}
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] *= factor;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+if PLATFORM == "unix":
+    from zugbruecke import SessionPool
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_pool(arch, conv, ctypes, dll_path):
+    """
+    Test calls, batched calls and memsync across a pool of sessions
+    """
+
+    with SessionPool(
+        n = 2,
+        arch = arch,
+        pythonversion = ctypes.zb_get_parameter("pythonversion"),
+    ) as pool:
+
+        dll_handle = getattr(pool, conv).LoadLibrary(dll_path)
+
+        add_ints = dll_handle.add_ints
+        add_ints.argtypes = (pool.c_int32, pool.c_int32)
+        add_ints.restype = pool.c_int32
+
+        assert [add_ints(x, 3) for x in range(100)] == [x + 3 for x in range(100)]
+        assert list(add_ints.zb_map(((x, 4) for x in range(5000)), chunk_size = 100)) == [x + 4 for x in range(5000)]
+
+        futures = [add_ints.zb_submit(x, 5) for x in range(100)]
+        assert [future.result() for future in futures] == [x + 5 for x in range(100)]
+
+        scale_ints = dll_handle.scale_ints
+        scale_ints.argtypes = (pool.POINTER(pool.c_int32), pool.c_int32, pool.c_int32)
+        scale_ints.memsync = [
+            dict(
+                pointer = [0],
+                length = [1],
+                type = pool.c_int32,
+            )
+        ]
+
+        for factor in range(4):
+            data = (pool.c_int32 * 10)(*range(10))
+            scale_ints(data, 10, factor)
+            assert data[:] == [x * factor for x in range(10)]
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_pool_affinity(arch, conv, ctypes, dll_path):
+    """
+    Test that calls with affinity keys are bound to one session each
+    """
+
+    with SessionPool(
+        n = 2,
+        schedule = "round_robin",
+        affinity_size = 2,
+        arch = arch,
+        pythonversion = ctypes.zb_get_parameter("pythonversion"),
+    ) as pool:
+
+        next_counter = getattr(pool, conv).LoadLibrary(dll_path).next_counter
+        next_counter.restype = pool.c_int32
+
+        assert [next_counter(zb_affinity = "a") for _ in range(5)] == list(range(5))
+        assert [next_counter(zb_affinity = "b") for _ in range(5)] == list(range(5))
+        assert next_counter(zb_affinity = "a") == 5
+
+        for key in range(10):
+            next_counter(zb_affinity = key)
+        assert list(pool._affinity.keys()) == [8, 9]  # least recently used keys are forgotten
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_pool_parameters():
+    """
+    Test invalid pool parameters
+    """
+
+    with pytest.raises(ValueError):
+        SessionPool(n = 0)
+    with pytest.raises(ValueError):
+        SessionPool(schedule = "random")
+    with pytest.raises(ValueError):
+        SessionPool(id = "shared")
+    with pytest.raises(ValueError):
+        SessionPool(affinity_size = 0)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_signature_cache.py: Tests packed definitions of routines kept on disk
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import PLATFORM
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_signature_cache(tmp_path):
+    """
+    Test reading, merging and invalidation of packed definitions kept on disk
+    """
+
+    from zugbruecke.core.signature_cache import SignatureCache
+
+    fld = str(tmp_path / "signatures")
+    dll = tmp_path / "demo.dll"
+    dll.write_bytes(b"MZ" + bytes(64))
+
+    packed_a = ([{"g": 1, "t": "c_int", "f": []}], {"g": 1, "t": "c_int", "f": []}, [])
+    packed_b = ([], None, [])
+
+    cache = SignatureCache(fld, str(dll))
+    assert cache.load() == []
+    cache.set("routine_a", packed_a)
+    cache.set(3, packed_b)
+    cache.flush()
+
+    other = SignatureCache(fld, str(dll))
+    assert sorted(other.load(), key = repr) == sorted([("routine_a", *packed_a), (3, *packed_b)], key = repr)
+    other.retain(["routine_a"])
+    assert other.get(3) is None
+    assert other.get("routine_a") == packed_a
+
+    other.set("routine_c", packed_b)
+    other.flush()  # merges with entries on disk
+    assert len(SignatureCache(fld, str(dll)).load()) == 3
+
+    dll.write_bytes(b"MZ" + bytes(128))  # new contents invalidate all entries
+    assert SignatureCache(fld, str(dll)).load() == []
+
+    with open(cache._fn, "wb") as f:
+        f.write(b"damaged")
+    assert SignatureCache(fld, str(dll)).load() == []
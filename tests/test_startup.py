@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_startup.py: Tests timing of session startup phases
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import time
+
+from .lib.ctypes import get_context, PLATFORM
+
+import pytest
+
+if PLATFORM == "unix":
+    from zugbruecke import CtypesSession
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_startup_timer():
+    """
+    Test recording of overlapping phases
+    """
+
+    from zugbruecke.core.startup import StartupTimer
+
+    durations = []
+    timer = StartupTimer(lambda name, duration: durations.append((name, duration)))
+
+    timer.begin("outer")
+    with timer.phase("inner"):
+        time.sleep(0.01)
+    timer.end("outer")
+
+    assert [name for name, _ in durations] == ["inner", "outer"]
+    assert all(duration >= 0.01 for _, duration in durations)
+
+    phases = timer.phases
+    assert phases["outer"][0] <= phases["inner"][0] <= phases["inner"][1] <= phases["outer"][1]
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_startup_hook(arch, conv, ctypes, dll_path):
+    """
+    Test that every phase of the session startup is reported
+    """
+
+    durations = {}
+
+    session = CtypesSession(
+        startup_hook = lambda name, duration: durations.update({name: duration}),
+        arch = arch,
+        pythonversion = ctypes.zb_get_parameter("pythonversion"),
+    )
+
+    try:
+        assert session.zb_server_up
+        assert {"log", "env", "spawn", "data", "boot", "connect"} <= set(durations.keys())
+        assert all(duration >= 0.0 for duration in durations.values())
+    finally:
+        session.zb_terminate()
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("arch,conv,ctypes,dll_path", get_context(__file__, handle = False))
+def test_startup_report(arch, conv, ctypes, dll_path):
+    """
+    Test the startup report of both sides
+    """
+
+    session = CtypesSession(arch = arch, pythonversion = ctypes.zb_get_parameter("pythonversion"))
+
+    try:
+        report = session.zb_startup_report()
+    finally:
+        session.zb_terminate()
+
+    assert set(report.keys()) == {"unix", "wine"}
+    assert {"startup", "spawn_popen", "boot", "connect"} <= set(report["unix"].keys())
+    assert {"startup", "import", "connect", "log", "data", "listen"} <= set(report["wine"].keys())
+
+    for phases in report.values():
+        for phase in phases.values():
+            assert phase["start"] <= phase["end"]
+            assert phase["duration"] == pytest.approx(phase["end"] - phase["start"])
+        assert all(phase["end"] <= phases["startup"]["end"] for phase in phases.values())
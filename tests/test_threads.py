@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_threads.py: Tests calls from multiple threads into one session
+
+    Required to run on platform / side: [UNIX, WINE]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int32_t {{ SUFFIX }} divmod_ints(
+    int32_t a,
+    int32_t b,
+    int32_t *remainder
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int32_t {{ SUFFIX }} divmod_ints(
+    int32_t a,
+    int32_t b,
+    int32_t *remainder
+    )
+{
+    *remainder = a % b;
+    return a / b;
+}
+
+{{ PREFIX }} void {{ SUFFIX }} scale_ints(
+    int32_t *data,
+    int32_t n,
+    int32_t factor
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] *= factor;
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .lib.ctypes import get_context
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+THREADS = 8
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_threads_pointer(arch, conv, ctypes, dll_handle):
+    """
+    Test concurrent calls with by reference arguments
+    """
+
+    divmod_ints = dll_handle.divmod_ints
+    divmod_ints.argtypes = (ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32))
+    divmod_ints.restype = ctypes.c_int32
+
+    def worker(divisor):
+        results = []
+        for number in range(200):
+            remainder = ctypes.c_int32()
+            quotient = divmod_ints(number, divisor, remainder)
+            results.append((quotient, remainder.value))
+        return results
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(worker, range(1, THREADS + 1)))
+
+    for divisor, result in zip(range(1, THREADS + 1), results):
+        assert result == [divmod(number, divisor) for number in range(200)]
+
+
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_threads_memsync(arch, conv, ctypes, dll_handle):
+    """
+    Test concurrent calls with memsync'ed arrays
+    """
+
+    scale_ints = dll_handle.scale_ints
+    scale_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32, ctypes.c_int32)
+    scale_ints.memsync = [
+        dict(
+            pointer = [0],
+            length = [1],
+            type = ctypes.c_int32,
+        )
+    ]
+
+    def worker(factor):
+        data = (ctypes.c_int32 * 1000)(*range(1000))
+        scale_ints(data, 1000, factor)
+        for _ in range(20):
+            scale_ints(data, 1000, -1)
+        return data[:]
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(worker, range(1, THREADS + 1)))
+
+    for factor, result in zip(range(1, THREADS + 1), results):
+        assert result == [number * factor for number in range(1000)]
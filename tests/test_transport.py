@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+ZUGBRUECKE
+Calling routines in Windows DLLs from Python scripts running on unixlike systems
+https://github.com/pleiszenburg/zugbruecke
+
+    tests/test_transport.py: Tests switching between RPC transports
+
+    Required to run on platform / side: [UNIX]
+
+    Copyright (C) 2017-2023 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU Lesser General Public License
+Version 2.1 ("LGPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/lgpl-2.1.txt
+https://github.com/pleiszenburg/zugbruecke/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# C
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+HEADER = """
+{{ PREFIX }} int16_t {{ SUFFIX }} add_ints(
+    int16_t a,
+    int16_t b
+    );
+
+{{ PREFIX }} void {{ SUFFIX }} negate_ints(
+    int32_t *data,
+    int32_t n
+    );
+"""
+
+SOURCE = """
+{{ PREFIX }} int16_t {{ SUFFIX }} add_ints(
+    int16_t a,
+    int16_t b
+    )
+{
+    return a + b;
+}
+
+{{ PREFIX }} void {{ SUFFIX }} negate_ints(
+    int32_t *data,
+    int32_t n
+    )
+{
+    int32_t i;
+    for (i = 0; i < n; i++)
+    {
+        data[i] = -data[i];
+    }
+}
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib.ctypes import get_context, PLATFORM
+from .lib.const import TRANSPORTS
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("transport", TRANSPORTS)
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_transport_scalars(transport, arch, conv, ctypes, dll_handle):
+    """
+    Test simple calls after switching transports
+    """
+
+    ctypes.zb_set_parameter("transport", transport)
+
+    try:
+        add_ints = dll_handle.add_ints
+        add_ints.argtypes = (ctypes.c_int16, ctypes.c_int16)
+        add_ints.restype = ctypes.c_int16
+
+        assert [add_ints(x, 3) for x in range(100)] == [x + 3 for x in range(100)]
+    finally:
+        ctypes.zb_set_parameter("transport", "socket")
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+@pytest.mark.parametrize("transport", TRANSPORTS)
+@pytest.mark.parametrize("arch,conv,ctypes,dll_handle", get_context(__file__))
+def test_transport_large_message(transport, arch, conv, ctypes, dll_handle):
+    """
+    Test a memsync'ed array which does not fit into one shared memory ring buffer
+    """
+
+    ctypes.zb_set_parameter("transport", transport)
+
+    try:
+        negate_ints = dll_handle.negate_ints
+        negate_ints.argtypes = (ctypes.POINTER(ctypes.c_int32), ctypes.c_int32)
+        negate_ints.memsync = [
+            dict(
+                pointer = [0],
+                length = [1],
+                type = ctypes.c_int32,
+            )
+        ]
+
+        n = 2 ** 20
+        data = (ctypes.c_int32 * n)(*range(n))
+        negate_ints(data, n)
+
+        assert data[:] == [-x for x in range(n)]
+    finally:
+        ctypes.zb_set_parameter("transport", "socket")
+
+
+@pytest.mark.skipif(PLATFORM != "unix", reason="only relevant for unix side")
+def test_transport_capacity(tmp_path):
+    """
+    Test that ring buffers are refused unless their capacity is a power of two
+    """
+
+    from multiprocessing import Pipe
+    from zugbruecke.core.shm import ShmConnection
+
+    doorbell, _ = Pipe()
+
+    for capacity in (1000, 3 * 2 ** 10, 32, 2 ** 32):
+        with pytest.raises(ValueError):
+            ShmConnection(str(tmp_path / "ring"), doorbell, is_client = True, create = True, capacity = capacity)
+
+    ShmConnection(str(tmp_path / "ring"), doorbell, is_client = True, create = True, capacity = 2 ** 10).close()